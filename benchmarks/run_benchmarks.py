@@ -0,0 +1,224 @@
+"""
+入库与 README 流水线基准测试
+用法：
+    python benchmarks/run_benchmarks.py                          # 默认规模 1000 10000
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 100000
+    python benchmarks/run_benchmarks.py --save-baseline          # 将本次结果保存为基线
+    python benchmarks/run_benchmarks.py --fail-on-regression     # 相对基线退化时返回非零退出码
+对每个规模，在临时目录中用合成论文（见 benchmarks/synthetic_data.py）构建核心数据库，依次计时：
+    save_database / load_database(冷/热) / excel_to_paper(冷/热验证缓存) / add_papers /
+    generate_readme_tables / process_updates
+并记录每个阶段的 Python 内存分配峰值（tracemalloc，会使耗时整体变慢，可用 --no-memory 关闭）
+结果与基线文件（默认 benchmarks/baselines.json，按规模与阶段保存）比较，超出容差的阶段标记为退化
+不会修改项目中的数据库、缓存与更新文件
+"""
+import os
+import sys
+import io
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic_data import SyntheticPaperGenerator
+from src.convert import ReadmeGenerator
+from src.core.validation_cache import ValidationCache
+from src.update import UpdateProcessor
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+# 耗时差异小于该秒数时不判定为退化（避免小规模阶段的计时噪声）
+NOISE_FLOOR_SECONDS = 0.05
+
+
+class StageRecorder:
+    """逐阶段记录耗时与内存分配峰值"""
+
+    def __init__(self, track_memory: bool = True, verbose: bool = False):
+        self.track_memory = track_memory
+        self.verbose = verbose
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """计时一个阶段；非 verbose 模式下屏蔽阶段内的 print 输出"""
+        if self.track_memory:
+            tracemalloc.start()
+        output = contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        try:
+            with output:
+                yield
+        finally:
+            seconds = time.perf_counter() - start
+            record = {'seconds': round(seconds, 4)}
+            if self.track_memory:
+                record['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+                tracemalloc.stop()
+            self.stages[name] = record
+            memory = f"，内存峰值 {record['peak_mb']:.1f} MB" if 'peak_mb' in record else ""
+            print(f"  {name:<28} {seconds:9.3f} s{memory}")
+
+
+def run_size(size: int, work_dir: str, recorder: StageRecorder, seed: int = 0) -> Dict[str, Any]:
+    """在 work_dir 中以 size 行合成数据运行全部阶段"""
+    generator = SyntheticPaperGenerator(seed=seed)
+    submission_count = max(10, size // 100)
+
+    processor = UpdateProcessor()
+    db = processor.db_manager
+    update_utils = processor.update_utils
+    db.core_excel_path = os.path.join(work_dir, 'paper_database.xlsx')
+    db.cache_dir = os.path.join(work_dir, '.cache')
+    db.backup_dir = os.path.join(work_dir, 'backups')
+
+    # 验证缓存与更新文件备份目录是单例状态，结束后还原
+    original_validation_cache = update_utils._validation_cache
+    original_backup_dir = update_utils.backup_dir
+    update_utils._validation_cache = ValidationCache(os.path.join(work_dir, '.cache', 'validation_cache.json'), db.config)
+    update_utils.backup_dir = db.backup_dir
+    try:
+        with recorder.stage('generate'):
+            papers = generator.generate_database(size)
+            submissions, mix = generator.generate_submissions(size, submission_count)
+
+        with recorder.stage('save_database'):
+            assert db.save_database(update_utils.paper_to_excel(papers, only_non_system=False, skip_invalid=False))
+        updates_db_path = os.path.join(work_dir, 'paper_database_for_updates.xlsx')
+        shutil.copy2(db.core_excel_path, updates_db_path)
+
+        with recorder.stage('load_database_cold'):
+            df = db.load_database()
+        with recorder.stage('load_database_warm'):
+            df = db.load_database()
+
+        with recorder.stage('excel_to_paper_cold'):
+            update_utils.excel_to_paper(df, only_non_system=False, skip_invalid=False)
+        update_utils.get_validation_cache().save()
+        with recorder.stage('excel_to_paper_warm'):
+            update_utils.excel_to_paper(df, only_non_system=False, skip_invalid=False)
+
+        with recorder.stage('add_papers'):
+            added, conflicts, _ = db.add_papers(list(submissions), 'mark')
+
+        readme = ReadmeGenerator()
+        readme.db_manager = db
+        readme.row_cache_path = os.path.join(work_dir, '.cache', 'readme_rows.json')
+        with recorder.stage('generate_readme_tables'):
+            readme.generate_readme_tables()
+
+        # process_updates 在 add_papers 之前的数据库副本上处理同一批提交
+        update_json = os.path.join(work_dir, 'submit.json')
+        update_utils.write_json_file(update_json, {'papers': update_utils.paper_to_json(submissions)})
+        db.core_excel_path = updates_db_path
+        processor.update_excel_path = processor.update_json_path = None
+        processor.my_update_excel_path = processor.my_update_json_path = None
+        processor.extra_update_files = [update_json]
+        processor.is_remove_added_paper = False
+        processor.ai_generator.is_available = lambda: False
+        with recorder.stage('process_updates'):
+            result = processor.process_updates()
+    finally:
+        update_utils._validation_cache = original_validation_cache
+        update_utils.backup_dir = original_backup_dir
+
+    return {
+        'rows': len(papers),
+        'submissions': mix,
+        'added': len(added),
+        'conflicts': len(conflicts),
+        'process_updates_added': result.get('new_papers', 0),
+        'stages': recorder.stages,
+    }
+
+
+def compare_with_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """比较本次结果与基线，返回退化描述列表（耗时或内存超过基线的 tolerance 倍）"""
+    regressions = []
+    for size, report in results.items():
+        base_stages = baseline.get('results', {}).get(size, {}).get('stages', {})
+        for name, record in report['stages'].items():
+            base = base_stages.get(name)
+            if not base:
+                continue
+            if (record['seconds'] > base['seconds'] * tolerance
+                    and record['seconds'] - base['seconds'] > NOISE_FLOOR_SECONDS):
+                regressions.append(f"[{size}] {name}: {record['seconds']:.3f}s (基线 {base['seconds']:.3f}s)")
+            if 'peak_mb' in record and base.get('peak_mb') and record['peak_mb'] > base['peak_mb'] * tolerance:
+                regressions.append(f"[{size}] {name}: 内存峰值 {record['peak_mb']:.1f} MB (基线 {base['peak_mb']:.1f} MB)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="入库与 README 流水线基准测试")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help="合成数据库行数（可多个）")
+    parser.add_argument('--seed', type=int, default=0, help="合成数据随机种子")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help="基线文件路径")
+    parser.add_argument('--save-baseline', action='store_true', help="将本次结果写入基线文件（按规模覆盖）")
+    parser.add_argument('--tolerance', type=float, default=1.5, help="退化判定倍数，默认 1.5")
+    parser.add_argument('--fail-on-regression', action='store_true', help="存在退化时返回退出码 1")
+    parser.add_argument('--no-memory', action='store_true', help="不记录内存峰值（tracemalloc 会拖慢计时）")
+    parser.add_argument('--output', default=None, help="将本次结果写入该 JSON 文件")
+    parser.add_argument('--verbose', action='store_true', help="显示各阶段自身的输出")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {}
+    for size in args.sizes:
+        print(f"\n=== 规模 {size} 行 ===")
+        work_dir = tempfile.mkdtemp(prefix=f"bench_{size}_")
+        try:
+            recorder = StageRecorder(track_memory=not args.no_memory, verbose=args.verbose)
+            results[str(size)] = run_size(size, work_dir, recorder, seed=args.seed)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'track_memory': not args.no_memory,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline: Optional[Dict[str, Any]] = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    exit_code = 0
+    if baseline is not None:
+        if baseline.get('track_memory', True) != report['track_memory']:
+            print("\n⚠ 基线与本次的内存记录设置不同（tracemalloc 影响耗时），比较结果仅供参考")
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 相对基线 ({baseline.get('time', '')}) 发现 {len(regressions)} 处退化 (容差 {args.tolerance}x):")
+            for line in regressions:
+                print(f"  - {line}")
+            exit_code = 1 if args.fail_on_regression else 0
+        else:
+            print(f"\n✅ 未发现相对基线 ({baseline.get('time', '')}) 的退化 (容差 {args.tolerance}x)")
+    else:
+        print(f"\n未找到基线文件: {args.baseline}（可使用 --save-baseline 生成）")
+
+    if args.save_baseline:
+        merged = dict(report)
+        if baseline is not None:
+            merged['results'] = dict(baseline.get('results', {}), **results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+        print(f"基线已保存到: {args.baseline}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
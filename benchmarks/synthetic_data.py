@@ -0,0 +1,129 @@
+"""
+合成论文数据生成器（供基准测试使用）
+按 tag_config 中启用字段的类型/验证规则与 categories_config 中启用的分类生成可通过验证的论文，
+包含多分类论文与冲突论文（与已有论文同 DOI/标题、部分字段不同，并带冲突标记）
+相同参数与随机种子生成的数据完全一致，以便不同版本之间的结果可比
+"""
+import os
+import sys
+import random
+from dataclasses import asdict
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config_loader import get_config_instance
+from src.core.database_model import Paper
+
+_WORDS = [
+    "graph", "neural", "social", "media", "misinformation", "detection", "language", "model",
+    "agent", "simulation", "multimodal", "stance", "sentiment", "diffusion", "network", "user",
+    "behavior", "prediction", "generation", "retrieval", "benchmark", "dataset", "learning",
+    "contrastive", "large", "framework", "community", "temporal", "hate", "speech", "rumor",
+]
+_CONFERENCES = ["ACL", "EMNLP", "NAACL", "WWW", "KDD", "AAAI", "IJCAI", "ICLR", "NeurIPS", "ICWSM"]
+
+
+class SyntheticPaperGenerator:
+    """按当前配置生成合成论文"""
+
+    def __init__(self, seed: int = 0, multi_category_ratio: float = 0.2, conflict_ratio: float = 0.02):
+        self.config = get_config_instance()
+        self.seed = seed
+        self.multi_category_ratio = multi_category_ratio
+        self.conflict_ratio = conflict_ratio
+        self.tags = self.config.get_active_tags()
+        self.categories = [c['unique_name'] for c in self.config.get_active_categories()]
+        try:
+            self.max_categories = int(self.config.settings['database'].get('max_categories_per_paper', 4))
+        except (TypeError, ValueError):
+            self.max_categories = 4
+
+    # ========== 字段取值 ==========
+
+    def _sentence(self, rng: random.Random, min_words: int, max_words: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize() + "."
+
+    def _category(self, rng: random.Random) -> str:
+        if rng.random() < self.multi_category_ratio and self.max_categories > 1:
+            count = rng.randint(2, min(self.max_categories, len(self.categories)))
+            return ";".join(rng.sample(self.categories, count))
+        return rng.choice(self.categories)
+
+    def _field_value(self, rng: random.Random, tag: Dict[str, Any], i: int) -> Any:
+        """生成单个字段的取值：已知字段按其语义生成，其余字段按 type 生成"""
+        var = tag['variable']
+        tag_type = str(tag.get('type', 'string'))
+        if var == 'doi':
+            return f"10.{5000 + self.seed}/bench.{i}"
+        if var == 'title':
+            return f"{self._sentence(rng, 4, 10)[:-1]} {i}"
+        if var == 'authors':
+            return ", ".join(f"Author{rng.randint(1, 5000)} {chr(65 + k)}" for k in range(rng.randint(1, 6)))
+        if var == 'date':
+            return f"{rng.randint(2018, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        if var == 'category':
+            return self._category(rng)
+        if var == 'conference':
+            return rng.choice(_CONFERENCES)
+        if var == 'submission_time':
+            return f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+        if var in ('pipeline_image', 'paper_file', 'invalid_fields', 'status'):
+            # 不引用不存在的文件，避免渲染时输出缺图警告
+            return ""
+        if var == 'show_in_readme':
+            return True
+        if tag.get('validation') == r"^https?://":
+            return f"https://example.org/{var}/{i}" if tag.get('required') or rng.random() < 0.5 else ""
+        if tag_type == 'bool':
+            return False
+        if tag_type in ('int', 'float'):
+            return 0
+        if tag_type == 'text':
+            return " ".join(self._sentence(rng, 8, 20) for _ in range(rng.randint(1, 4)))
+        if tag_type.startswith('enum'):
+            return ""
+        return self._sentence(rng, 1, 4)[:-1]
+
+    def make_paper(self, i: int) -> Paper:
+        """生成编号为 i 的论文（同一 i 在同一种子下结果固定）"""
+        rng = random.Random(f"{self.seed}:{i}")
+        return Paper.from_dict({tag['variable']: self._field_value(rng, tag, i) for tag in self.tags})
+
+    def make_conflict(self, paper: Paper, i: int) -> Paper:
+        """生成与 paper 同身份但部分字段不同的冲突论文"""
+        data = asdict(paper)
+        data['notes'] = f"conflicting revision {i}"
+        data['conference'] = "Conflict Conference"
+        data['conflict_marker'] = True
+        return Paper.from_dict(data)
+
+    # ========== 数据集 ==========
+
+    def generate_database(self, size: int) -> List[Paper]:
+        """生成约 size 行的数据库论文，其中约 conflict_ratio 比例为冲突论文"""
+        conflict_count = int(size * self.conflict_ratio)
+        base_count = size - conflict_count
+        papers = [self.make_paper(i) for i in range(base_count)]
+        rng = random.Random(f"{self.seed}:conflicts")
+        for k in range(conflict_count):
+            papers.append(self.make_conflict(papers[rng.randrange(base_count)], k))
+        return papers
+
+    def generate_submissions(self, database_size: int, count: int) -> Tuple[List[Paper], Dict[str, int]]:
+        """
+        生成一批提交：约 70% 新论文、20% 与已有论文冲突、10% 与已有论文完全重复
+        返回 (论文列表, 各类数量)
+        """
+        rng = random.Random(f"{self.seed}:submissions")
+        base_count = database_size - int(database_size * self.conflict_ratio)
+        conflicts = count // 5
+        duplicates = count // 10
+        new = count - conflicts - duplicates
+        submissions = [self.make_paper(database_size + k) for k in range(new)]
+        for k in range(conflicts):
+            submissions.append(self.make_conflict(self.make_paper(rng.randrange(base_count)), k))
+            submissions[-1].conflict_marker = False
+        for _ in range(duplicates):
+            submissions.append(self.make_paper(rng.randrange(base_count)))
+        return submissions, {'new': new, 'conflicts': conflicts, 'duplicates': duplicates}
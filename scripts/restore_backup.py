@@ -0,0 +1,53 @@
+"""
+备份恢复脚本
+功能：
+1. 列出备份存储（backup_dir/store）中的快照：python scripts/restore_backup.py list [源路径]
+2. 将快照恢复到原路径或指定路径：python scripts/restore_backup.py restore <快照id> [目标路径]
+   文件快照解压恢复；文件夹快照整体复制恢复（恢复出的文件与快照不共享硬链接）
+"""
+import os
+import sys
+import argparse
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.config_loader import get_config_instance
+from src.backup_store import BackupStore
+
+
+def list_snapshots(store: BackupStore, source: str = None):
+    """打印快照列表"""
+    snapshots = store.list_snapshots(source)
+    if not snapshots:
+        print("没有找到快照")
+        return
+    for s in snapshots:
+        kind = f"文件夹, {s.get('files', 0)} 个文件" if s.get('type') == 'dir' else "文件"
+        print(f"{s['id']}  {s['time']}  {s['name']}  ({kind}, {s.get('size', 0)} bytes)  <- {s['source']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="列出或恢复备份快照")
+    parser.add_argument('--backup-dir', default=None, help="备份目录，默认读取 config.ini 中的 backup_dir")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help="列出快照")
+    list_parser.add_argument('source', nargs='?', default=None, help="仅列出该源路径的快照")
+
+    restore_parser = subparsers.add_parser('restore', help="恢复快照")
+    restore_parser.add_argument('snapshot_id', help="快照id（见 list）")
+    restore_parser.add_argument('target', nargs='?', default=None, help="恢复目标路径，默认恢复到原路径")
+
+    args = parser.parse_args(argv)
+    backup_dir = args.backup_dir or get_config_instance().settings['paths']['backup_dir']
+    store = BackupStore(backup_dir)
+
+    if args.command == 'list':
+        list_snapshots(store, args.source)
+        return 0
+    return 0 if store.restore(args.snapshot_id, args.target) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
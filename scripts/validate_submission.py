@@ -4,6 +4,7 @@
 1. 验证 submit_template.xlsx 和 submit_template.json 中的论文格式 (validate_paper_fields)
 2. 验证论文是否为实质性新增 (对比 origin/main 分支的模版内容，排除完全未修改的占位符)
 3. 验证 figures/ 目录下所有文件的格式
+4. 提示与核心数据库中已有论文标题高度相似的疑似重复提交（仅提示，不影响结果）
 """
 import os
 import sys
@@ -18,6 +19,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from src.core.config_loader import get_config_instance
 from src.core.update_file_utils import get_update_file_utils
 from src.core.database_model import Paper, is_duplicate_paper
+from src.core.database_manager import DatabaseManager
+from src.core.title_index import TitleIndex
 
 def get_original_content(repo_path: str, temp_path: str) -> bool:
     """
@@ -37,9 +40,28 @@ def get_original_content(repo_path: str, temp_path: str) -> bool:
         print(f"Warning: Failed to fetch original file {repo_path}: {e}")
         return False
 
-def validate_papers(papers: List[Paper], original_papers: List[Paper], source_name: str) -> int:
+def build_database_title_index() -> Tuple[TitleIndex, List[Paper]]:
+    """
+    为核心数据库中的论文建立近似重复标题索引
+    返回: (索引, 论文列表)，索引键为论文在列表中的下标；数据库读取失败时返回空索引
+    """
+    db_manager = DatabaseManager()
+    index = TitleIndex(db_manager.near_duplicate_threshold)
+    try:
+        papers = db_manager.update_utils.excel_to_paper(db_manager.load_database(), only_non_system=False, skip_invalid=False)
+    except Exception as e:
+        print(f"Warning: Failed to load core database for duplicate check: {e}")
+        return index, []
+    for i, paper in enumerate(papers):
+        if not paper.conflict_marker:
+            index.add(i, paper.title)
+    return index, papers
+
+def validate_papers(papers: List[Paper], original_papers: List[Paper], source_name: str,
+                    title_index: TitleIndex = None, database_papers: List[Paper] = None) -> int:
     """
     验证论文列表
+    title_index/database_papers: 核心数据库的近似重复标题索引（见 build_database_title_index），提供时提示疑似重复
     返回: 有效且非重复的论文数量
     """
     config = get_config_instance()
@@ -77,6 +99,11 @@ def validate_papers(papers: List[Paper], original_papers: List[Paper], source_na
         print(f"✅ [Item {paper_idx}] Valid New Submission: {paper.title[:30]}...")
         valid_count += 1
 
+        # 3. 疑似重复提示 (标题与数据库已有论文高度相似)
+        if title_index is not None:
+            for key, score in title_index.find_similar(paper.title)[:3]:
+                print(f"   ⚠️ Possible duplicate of existing paper (similarity {score:.2f}): {database_papers[key].title[:60]}")
+
     return valid_count
 
 def validate_figures(figure_dir: str):
@@ -124,6 +151,9 @@ def main():
     if not os.path.exists(update_json_path):
         open(update_json_path, 'w').close()
 
+    # 核心数据库的近似重复标题索引
+    title_index, database_papers = build_database_title_index()
+
     # 创建临时目录用于存放原始模版
     with tempfile.TemporaryDirectory() as temp_dir:
         # ==================== 1. 验证 Excel ====================
@@ -148,7 +178,9 @@ def main():
             total_valid_submissions += validate_papers(
                 current_excel_papers, 
                 original_excel_papers, 
-                "Excel Template"
+                "Excel Template",
+                title_index,
+                database_papers
             )
             
 
@@ -174,7 +206,9 @@ def main():
             total_valid_submissions += validate_papers(
                 current_json_papers, 
                 original_json_papers, 
-                "JSON Template"
+                "JSON Template",
+                title_index,
+                database_papers
             )
 
     # ==================== 3. 验证图片 ====================
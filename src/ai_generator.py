@@ -1,11 +1,18 @@
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import asdict
 from src.core.config_loader import get_config_instance
 from src.core.database_model import Paper
+from src.ai_response_cache import AIResponseCache, get_ai_response_cache
+from src.utils import compute_file_hash, ensure_directory
 
 # 统一的 Provider 配置数据结构
 PROVIDER_CONFIGS = [
@@ -32,10 +39,101 @@ SYSTEM_PROMPT = (
     "act as a academic assistant."
 )
 
+
+class _TokenBucket:
+    """令牌桶限速器：每秒补充 rate 个令牌，最多积攒 capacity 个；线程安全"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """取走一个令牌，令牌不足时阻塞等待；rate <= 0 表示不限速"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# read_paper_file 的页面选择（前5页 + 后5页），作为 PDF 提取缓存键的一部分，修改选页逻辑时需同步修改
+PDF_PAGE_SELECTION = "head5_tail5"
+
+# 可重试的 HTTP 状态码（限流与服务端临时错误）
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# 单次重试的最长等待秒数（包括服务端 Retry-After 要求的等待）
+MAX_RETRY_DELAY = 60.0
+
+
+class AIProviderError(Exception):
+    """AI 服务请求失败：重试用尽后仍为 429/5xx、其它 HTTP 错误状态或连接失败/超时"""
+
+
+# 按 provider 共享的 HTTP 会话，复用 keep-alive 连接
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _get_session(provider: str, pool_size: int) -> requests.Session:
+    """获取 provider 对应的连接池会话，连接池大小不小于并发数"""
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(provider)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _SESSIONS[provider] = session
+        return session
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头（秒数或 HTTP 日期），无效时返回 None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+# 按 (provider, profile) 共享的限速器，同一 Profile 的所有 AIGenerator 实例与线程共用一个令牌桶
+_RATE_LIMITERS: Dict[Tuple[str, str], _TokenBucket] = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _get_rate_limiter(provider: str, profile_name: str, requests_per_minute: float, burst: int) -> _TokenBucket:
+    """获取 (provider, profile) 对应的令牌桶；限速配置变化时重建"""
+    key = (provider, profile_name)
+    rate = requests_per_minute / 60.0
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(key)
+        if limiter is None or limiter.rate != rate or limiter.capacity != max(1, burst):
+            limiter = _TokenBucket(rate, burst)
+            _RATE_LIMITERS[key] = limiter
+        return limiter
+
 class AIGenerator:
     """AI内容生成器 (支持 DeepSeek, Gemini, OpenAI-Compatible)"""
     
-    def __init__(self):
+    def __init__(self, bypass_cache: bool = False):
         self.config_loader = get_config_instance()
         self.settings = self.config_loader.settings
         
@@ -46,11 +144,50 @@ class AIGenerator:
         enable_val = self.settings['ai'].get('enable_ai_generation', 'true')
         self.enabled = str(enable_val).lower() == 'true'
 
+        # 并发与限速：批量增强时同时处理的论文数；每个 (provider, profile) 每分钟最多发出的请求数
+        self.max_concurrency = self._get_int_setting('max_concurrency', 4, minimum=1)
+        self.requests_per_minute = self._get_int_setting('requests_per_minute', 60, minimum=0)
+        # 网络：限流 (429) / 服务端错误 (5xx) / 连接失败时按指数退避重试；连接与读取分别超时
+        self.max_retries = self._get_int_setting('max_retries', 3, minimum=0)
+        self.retry_backoff = self._get_float_setting('retry_backoff', 1.0)
+        self.connect_timeout = self._get_float_setting('connect_timeout', 10.0)
+        self.read_timeout = self._get_float_setting('read_timeout', 60.0)
+        # 合并生成：一篇论文缺失的多个字段在一次请求中以 JSON 返回，解析失败的字段再逐个生成
+        self.combined_generation = str(self.settings['ai'].get('combined_generation', 'true')).lower() == 'true'
+
+        # 响应缓存：bypass_cache=True 时不读取缓存（用于 GUI 强制重新生成），但仍写入新响应
+        self.bypass_cache = bypass_cache
+        self.response_cache = None
+        if str(self.settings['ai'].get('enable_ai_cache', 'true')).lower() == 'true':
+            cache_dir = self.settings['paths'].get('cache_dir') or os.path.join(str(self.config_loader.project_root), '.cache')
+            self.response_cache = get_ai_response_cache(
+                os.path.join(cache_dir, 'ai_response_cache.sqlite3'),
+                ttl_days=self._get_int_setting('ai_cache_ttl_days', 30, minimum=0),
+                max_mb=self._get_int_setting('ai_cache_max_mb', 50, minimum=0),
+            )
+
+        # 最近一次 batch_enhance_papers 中处理失败的论文及原因
+        self.batch_errors: List[str] = []
+
         # 加载配置的 Profiles (已在 ConfigLoader 中解析)
         self.profiles = self._load_profiles_from_settings()
         self.active_profile_name = self.settings['ai'].get('active_profile', 'default_deepseek')
         self.active_profile = self.get_profile(self.active_profile_name)
 
+    def _get_int_setting(self, name: str, default: int, minimum: int = 0) -> int:
+        """读取 [ai] 中的整数配置，缺失或无效时使用默认值"""
+        try:
+            return max(minimum, int(self.settings['ai'].get(name, default)))
+        except (TypeError, ValueError):
+            return default
+
+    def _get_float_setting(self, name: str, default: float, minimum: float = 0.0) -> float:
+        """读取 [ai] 中的小数配置，缺失或无效时使用默认值"""
+        try:
+            return max(minimum, float(self.settings['ai'].get(name, default)))
+        except (TypeError, ValueError):
+            return default
+
     def _load_profiles_from_settings(self) -> Dict[str, Dict]:
         """从 settings 中转换 Profiles 列表为字典"""
         profiles_list = self.settings['ai'].get('profiles', [])
@@ -104,12 +241,20 @@ class AIGenerator:
         """保存配置 (代理到 ConfigLoader)"""
         self.config_loader.save_ai_settings(enable_ai, active_profile_name, profiles_list, key_path)
         # 刷新自身状态
-        self.__init__()
+        self.__init__(self.bypass_cache)
 
-    def read_paper_file(self, file_path: str) -> str:
-        """读取论文PDF内容"""
+    def read_paper_file(self, file_path: str, max_chars: int = 15000) -> str:
+        """
+        读取论文PDF内容（前5页和后5页，最多 max_chars 个字符）
+        按页提取，已收集到足够字符时停止；提取结果按文件内容哈希缓存在 papers 目录的 .text_cache 下
+        """
         if not file_path or not os.path.exists(file_path):
             return ""
+
+        cache_path = self._get_pdf_text_cache_path(file_path)
+        cached = self._load_pdf_text_cache(cache_path)
+        if cached and (cached['complete'] or len(cached['text']) >= max_chars):
+            return cached['text'][:max_chars]
         
         try:
             import pypdf
@@ -118,6 +263,7 @@ class AIGenerator:
             
         try:
             text = ""
+            complete = True
             with open(file_path, 'rb') as f:
                 reader = pypdf.PdfReader(f)
                 # 只读前几页和最后几页以节省token，涵盖摘要、引言和结论
@@ -127,11 +273,53 @@ class AIGenerator:
                     pages_to_read.extend(list(range(max(5, num_pages-5), num_pages))) # 后5页
                 
                 for i in sorted(list(set(pages_to_read))):
+                    if len(text) >= max_chars:
+                        complete = False
+                        break
                     text += reader.pages[i].extract_text() + "\n"
-            return text[:15000] # 截断防止过长
         except Exception as e:
             return f"[Error reading PDF: {str(e)}]"
 
+        self._save_pdf_text_cache(cache_path, text, complete)
+        return text[:max_chars] # 截断防止过长
+
+    def _get_pdf_text_cache_path(self, file_path: str) -> Optional[str]:
+        """PDF 提取缓存路径：<paper_dir>/.text_cache/<文件sha256>_<页面选择>.json"""
+        try:
+            digest = compute_file_hash(file_path)
+        except OSError:
+            return None
+        paper_dir = self.settings['paths'].get('paper_dir') or os.path.dirname(os.path.abspath(file_path))
+        return os.path.join(paper_dir, '.text_cache', f"{digest}_{PDF_PAGE_SELECTION}.json")
+
+    @staticmethod
+    def _load_pdf_text_cache(cache_path: Optional[str]) -> Optional[Dict[str, Any]]:
+        """读取 PDF 提取缓存，不存在或损坏时返回 None"""
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if isinstance(cached.get('text'), str) and isinstance(cached.get('complete'), bool):
+                return cached
+        except Exception:
+            pass
+        return None
+
+    @staticmethod
+    def _save_pdf_text_cache(cache_path: Optional[str], text: str, complete: bool):
+        """原子写入 PDF 提取缓存；complete 表示所选页面已全部提取"""
+        if not cache_path:
+            return
+        try:
+            ensure_directory(os.path.dirname(cache_path))
+            tmp_path = cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'text': text, 'complete': complete}, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"写入PDF提取缓存失败: {e}")
+
     def generate_category(self, paper: Paper, paper_text: str = "") -> Tuple[str, str]:
         """生成分类建议。返回 (category_unique_name, reasoning/raw_response)"""
         if not self.is_available():
@@ -213,11 +401,7 @@ Constraint:
             ;Wisdom of the crowd: Decision-making team model {self.translation_separator} 群体智慧：决策小组模式
             ;A closed ABM simulation system for news dissemination, simulates fake news formation with four role-playing elements {self.translation_separator} 一个封闭的新闻传播仿真 ABM 系统，扮演四种角色，模拟假新闻形成过程"""
         else:
-            # 通过 ConfigLoader 在运行时获取该字段的描述（避免直接导入配置模块）
-            try:
-                field_desc = self.config_loader.get_tag_field(field, 'description') or ""
-            except Exception:
-                field_desc = ""
+            field_desc = self._get_field_description(field)
             prompt = (
                 f"{base_prompt}\nSummarize the {field.replace('summary_', '')}.\n"
                 f"Field Description: {field_desc}"
@@ -231,8 +415,92 @@ Constraint:
             return f"{self.ai_generate_mark} {resp.strip()}"
         return ""
 
+    def _get_field_description(self, field: str) -> str:
+        """通过 ConfigLoader 在运行时获取字段的描述（避免直接导入配置模块）"""
+        try:
+            return self.config_loader.get_tag_field(field, 'description') or ""
+        except Exception:
+            return ""
+
+    def generate_fields_combined(self, paper: Paper, fields: List[str], paper_text: str = "") -> Dict[str, str]:
+        """
+        一次请求生成多个字段：要求模型返回以字段名为键的 JSON 对象
+        返回解析成功且非空的字段值（已加 AI 标记）；缺失或无效的字段由调用方逐字段回退生成
+        """
+        if not self.is_available() or not fields: return {}
+
+        category_name = self.config_loader.get_category_field(paper.category.split(';')[0], 'name') if paper.category else "General"
+
+        field_lines = []
+        for field in fields:
+            if field == 'title_translation':
+                desc = "Chinese translation of the title. Output ONLY the Chinese translation."
+            elif field == 'analogy_summary':
+                desc = (
+                    "One-sentence analogy summary (TL;DR). "
+                    f"E.g., Wisdom of the crowd: Decision-making team model {self.translation_separator} 群体智慧：决策小组模式"
+                )
+            else:
+                desc = f"Summarize the {field.replace('summary_', '')}. Field Description: {self._get_field_description(field)}"
+            field_lines.append(f'- "{field}": {desc}')
+        field_prompt = "\n".join(field_lines)
+
+        prompt = f"""Paper: {paper.title}
+Category: {category_name}
+Abstract: {paper.abstract}
+Content Snippet: {paper_text[:3000]}
+
+Req: Generate content for each of the following fields.
+{field_prompt}
+
+Constraint: 
+1. Except title_translation, every value is bilingual (English then Chinese), separated by '{self.translation_separator}'.
+2. Maintain academic rigor while ensuring readability
+3. Concise (each value under 100 words).
+4. Fields marked with {self.ai_generate_mark} in the prompt are AI-generated and unreviewed by humans, please refer to them cautiously
+
+Response Format: ONLY a JSON object whose keys are exactly the field names above and whose values are strings.
+"""
+        resp = self._call_api(prompt, max_tokens=250 * len(fields))
+        data = self._parse_json_object(resp)
+
+        generated = {}
+        for field in fields:
+            value = data.get(field)
+            if isinstance(value, str) and value.strip():
+                generated[field] = f"{self.ai_generate_mark} {value.strip()}"
+        return generated
+
+    @staticmethod
+    def _parse_json_object(text: Optional[str]) -> Dict[str, Any]:
+        """从模型回复中解析 JSON 对象（容忍 ```json 代码块与前后说明文字），失败时返回空字典"""
+        if not text:
+            return {}
+        text = text.strip()
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end <= start:
+            return {}
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
     def _call_api(self, prompt: str, max_tokens: int = 200) -> Optional[str]:
         if not self.active_profile: return None
+
+        provider = self.active_profile.get('provider', 'deepseek')
+        url = self.active_profile.get('api_url')
+        model = self.active_profile.get('model')
+
+        # 命中响应缓存时不发请求；键包含接口地址与系统提示，二者变化时不会误用旧响应
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = AIResponseCache.make_key(provider, model, max_tokens, f"{url}\n{SYSTEM_PROMPT}\n\n{prompt}")
+            if not self.bypass_cache:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
         
         # 优先使用配置中直接填写的 key (如果它是像Key的字符串)
         source = self.active_profile.get('api_key_source', '')
@@ -249,15 +517,62 @@ Constraint:
             print(f"Error: No API Key found for profile '{self.active_profile_name}'")
             return None
 
-        provider = self.active_profile.get('provider', 'deepseek')
-        url = self.active_profile.get('api_url')
-        model = self.active_profile.get('model')
+        # 同一 Profile 的请求共享令牌桶，突发量不超过并发数
+        _get_rate_limiter(provider, self.active_profile_name, self.requests_per_minute, self.max_concurrency).acquire()
         
         if provider == 'deepseek' or provider == 'openai_compatible':
-            return self._call_openai_style(api_key, url, model, prompt, max_tokens)
+            response = self._call_openai_style(api_key, url, model, prompt, max_tokens)
         elif provider == 'gemini':
-            return self._call_gemini(api_key, model, prompt, max_tokens)
-        return None
+            response = self._call_gemini(api_key, model, prompt, max_tokens)
+        else:
+            return None
+
+        # 仅缓存成功的响应
+        if response and cache_key is not None:
+            self.response_cache.put(cache_key, provider, model, max_tokens, response)
+        return response
+
+    def _post_with_retry(self, provider: str, url: str, **kwargs) -> requests.Response:
+        """
+        通过 provider 的连接池会话发送 POST 请求
+        429/5xx 与连接失败/超时按指数退避重试（优先遵循 Retry-After），重试用尽后返回最后一次响应或抛出异常
+        """
+        session = _get_session(provider, self.max_concurrency)
+        attempt = 0
+        while True:
+            try:
+                resp = session.post(url, timeout=(self.connect_timeout, self.read_timeout), **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.retry_backoff * (2 ** attempt)
+                reason = type(e).__name__
+            else:
+                if resp.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return resp
+                retry_after = _parse_retry_after(resp.headers.get('Retry-After'))
+                delay = retry_after if retry_after is not None else self.retry_backoff * (2 ** attempt)
+                reason = f"HTTP {resp.status_code}"
+                resp.close()
+            attempt += 1
+            delay = min(delay, MAX_RETRY_DELAY)
+            print(f"⚠ {provider} 请求失败 ({reason})，{delay:.1f} 秒后重试 ({attempt}/{self.max_retries})")
+            time.sleep(delay)
+
+    def _post_checked(self, provider: str, url: str, **kwargs) -> requests.Response:
+        """
+        带重试地发送请求（见 _post_with_retry），重试用尽后仍失败或返回错误状态码时抛出 AIProviderError，
+        避免服务持续限流/故障时被当作“未生成”而静默留空
+        """
+        try:
+            resp = self._post_with_retry(provider, url, **kwargs)
+        except requests.RequestException as e:
+            raise AIProviderError(f"{provider} 请求失败: {type(e).__name__}") from e
+        if resp.status_code >= 400:
+            detail = resp.text[:200].strip()
+            resp.close()
+            raise AIProviderError(f"{provider} 返回 HTTP {resp.status_code}" + (f": {detail}" if detail else ""))
+        return resp
 
     def _call_openai_style(self, api_key, url, model, prompt, max_tokens):
         headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
@@ -271,10 +586,9 @@ Constraint:
             "max_tokens": max_tokens,
             "temperature": 0.3
         }
+        # 兼容 DeepSeek 和其他 OpenAI 格式
+        resp = self._post_checked(self.active_profile.get('provider', 'deepseek'), url, headers=headers, json=payload)
         try:
-            # 兼容 DeepSeek 和其他 OpenAI 格式
-            resp = requests.post(url, headers=headers, json=payload, timeout=30)
-            resp.raise_for_status()
             return resp.json()['choices'][0]['message']['content']
         except Exception as e:
             print(f"API Error ({model}): {e}")
@@ -288,9 +602,8 @@ Constraint:
         # 将系统提示与用户 prompt 合并，保证 Gemini 也能接收到系统级说明
         prompt = f"{SYSTEM_PROMPT}\n\n{prompt}"
         payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        resp = self._post_checked('gemini', final_url, json=payload)
         try:
-            resp = requests.post(final_url, json=payload, timeout=30)
-            resp.raise_for_status()
             data = resp.json()
             # 安全获取
             if 'candidates' in data and data['candidates']:
@@ -301,6 +614,7 @@ Constraint:
             return None
 
     def enhance_paper_with_ai(self, paper: Paper, paper_text: str = "", fields_to_gen: List[str] = None) -> Tuple[Paper, bool]:
+        """生成论文缺失（或指定）的 AI 字段；AI 服务请求失败时抛出 AIProviderError，不会把字段静默留空"""
         is_enhanced = False
         new_paper = Paper.from_dict(asdict(paper))
         
@@ -308,28 +622,54 @@ Constraint:
                   'summary_innovation', 'summary_method', 'summary_conclusion', 'summary_limitation']
         
         target_fields = fields_to_gen if fields_to_gen else all_ai_fields
-        
+
+        # 如果指定了字段，强制生成；否则仅生成空的或Deprecated的
+        pending = []
         for f in target_fields:
-            # 如果指定了字段，强制生成；否则仅生成空的或Deprecated的
             curr = getattr(new_paper, f)
             if fields_to_gen or (not curr or self.value_deprecation_mark in str(curr)):
-                val = self.generate_field(new_paper, f, paper_text)
-                if val:
-                    setattr(new_paper, f, val)
-                    is_enhanced = True
+                pending.append(f)
+
+        # 多个字段先合并为一次请求，未能从 JSON 中取得的字段再逐个生成
+        generated = {}
+        if self.combined_generation and len(pending) > 1:
+            generated = self.generate_fields_combined(new_paper, pending, paper_text)
+
+        for f in pending:
+            val = generated.get(f) or self.generate_field(new_paper, f, paper_text)
+            if val:
+                setattr(new_paper, f, val)
+                is_enhanced = True
         return new_paper, is_enhanced
 
     def batch_enhance_papers(self, papers: List[Paper]) -> Tuple[List[Paper],bool]:
-        """批量增强论文信息 (兼容旧接口)"""
+        """
+        批量增强论文信息 (兼容旧接口)
+        以 [ai] max_concurrency 个线程并发处理论文，请求速率由 (provider, profile) 令牌桶限制；
+        返回列表与输入顺序一致；处理失败的论文保留原内容，失败原因逐篇记录在 self.batch_errors 中
+        """
+        self.batch_errors = []
         if not self.is_available():
             return papers, False
-        is_enhanced = False
-        enhanced_papers = []
-        for i, paper in enumerate(papers):
-            print(f"AI处理论文 {i+1}/{len(papers)}: {paper.title[:50]}...")
-            enhanced_paper, _is_enhanced = self.enhance_paper_with_ai(paper)
-            if _is_enhanced:
-                is_enhanced = True
-            enhanced_papers.append(enhanced_paper)
-            time.sleep(1)
-        return enhanced_papers, is_enhanced
\ No newline at end of file
+        if not papers:
+            return [], False
+
+        total = len(papers)
+        results: List[Optional[Tuple[Paper, bool]]] = [None] * total
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, total)) as executor:
+            futures = {executor.submit(self.enhance_paper_with_ai, paper): i for i, paper in enumerate(papers)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    # 单篇失败时保留原论文，不影响其他论文
+                    error = f"AI处理论文失败: {papers[i].title[:50]}... - {e}"
+                    print(error)
+                    self.batch_errors.append(error)
+                    results[i] = (papers[i], False)
+                print(f"AI处理论文 {done}/{total}: {papers[i].title[:50]}...")
+
+        enhanced_papers = [paper for paper, _ in results]
+        is_enhanced = any(_is_enhanced for _, _is_enhanced in results)
+        return enhanced_papers, is_enhanced
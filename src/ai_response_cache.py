@@ -0,0 +1,126 @@
+"""
+AI 响应缓存
+以“provider + model + max_tokens + 提示词哈希”为键，将 AI 接口的成功响应持久化到 SQLite，
+重复运行 update.py 或重复生成同一论文的确定性字段（如 title_translation、分类建议）时直接复用，
+避免为相同的补全重复付费
+支持过期时间（TTL）与按总大小淘汰（最久未使用的条目优先淘汰）；线程安全，供批量并发生成共用
+该脚本不应使用任何非基础第三方包，以供submit_gui调用
+"""
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../'))
+
+from src.utils import ensure_directory
+
+
+class AIResponseCache:
+    """AI 响应缓存 (SQLite)"""
+
+    def __init__(self, db_path: str, ttl_days: float = 30, max_mb: float = 50):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """首次使用时打开数据库并建表"""
+        if self._conn is None:
+            ensure_directory(os.path.dirname(self.db_path))
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, provider TEXT, model TEXT, max_tokens INTEGER, "
+                "response TEXT, size INTEGER, created REAL, accessed REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(provider: str, model: str, max_tokens: int, prompt: str) -> str:
+        """生成缓存键；prompt 应包含系统提示，系统提示变化时缓存自然失效"""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return f"{provider}|{model}|{max_tokens}|{prompt_hash}"
+
+    def get(self, key: str) -> Optional[str]:
+        """获取未过期的缓存响应，命中时刷新最近使用时间"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                conn.commit()
+                return row[0]
+        except sqlite3.Error as e:
+            print(f"读取AI响应缓存失败: {e}")
+            return None
+
+    def put(self, key: str, provider: str, model: str, max_tokens: int, response: str):
+        """写入（或覆盖）缓存响应，并按过期时间与总大小清理"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, max_tokens, response, len(response.encode('utf-8')), now, now)
+                )
+                self._evict(conn, now)
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"写入AI响应缓存失败: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """删除过期条目；总大小超出上限时按最近使用时间从旧到新淘汰"""
+        if self.ttl_seconds > 0:
+            conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        if self.max_bytes <= 0:
+            return
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        to_delete = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+
+# 按数据库路径共享的缓存实例，所有 AIGenerator 实例与线程共用
+_RESPONSE_CACHES: Dict[Tuple[str, float, float], AIResponseCache] = {}
+_RESPONSE_CACHES_LOCK = threading.Lock()
+
+
+def get_ai_response_cache(db_path: str, ttl_days: float = 30, max_mb: float = 50) -> AIResponseCache:
+    """获取共享的 AI 响应缓存实例"""
+    key = (os.path.abspath(db_path), ttl_days, max_mb)
+    with _RESPONSE_CACHES_LOCK:
+        cache = _RESPONSE_CACHES.get(key)
+        if cache is None:
+            cache = AIResponseCache(db_path, ttl_days, max_mb)
+            _RESPONSE_CACHES[key] = cache
+        return cache
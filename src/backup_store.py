@@ -0,0 +1,272 @@
+"""
+内容寻址备份存储
+文件备份按内容 sha256 去重并以 gzip 压缩保存为对象；文件夹备份为增量快照（类似 rsync --link-dest），
+未变化的文件硬链接到上一次快照，仅复制新增或修改的文件。
+清单（manifest.json）记录每次快照的时间、源路径与哈希；
+支持保留策略（保留最近 N 个快照 + 最近若干天每天最后一个快照）
+目录结构:
+    <backup_dir>/store/manifest.json
+    <backup_dir>/store/objects/<哈希前两位>/<哈希>.gz
+    <backup_dir>/store/snapshots/<文件夹名>/<快照id>/...
+"""
+import os
+import sys
+import json
+import gzip
+import shutil
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../'))
+
+from src.utils import ensure_directory, compute_file_hash
+
+
+class BackupStore:
+    """内容寻址备份存储"""
+    MANIFEST_VERSION = 1
+
+    def __init__(self, backup_dir: str, keep_last: int = 20, keep_daily: int = 30):
+        self.backup_dir = backup_dir
+        self.root = os.path.join(backup_dir, 'store')
+        self.objects_dir = os.path.join(self.root, 'objects')
+        self.snapshots_dir = os.path.join(self.root, 'snapshots')
+        self.manifest_path = os.path.join(self.root, 'manifest.json')
+        self.keep_last = keep_last
+        self.keep_daily = keep_daily
+
+    # ========== 清单 ==========
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """读取清单，不存在或损坏时返回空清单"""
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if isinstance(manifest.get('snapshots'), list):
+                    return manifest
+            except Exception as e:
+                print(f"⚠ 读取备份清单失败，将重建: {e}")
+        return {'version': self.MANIFEST_VERSION, 'snapshots': []}
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        """原子写入清单"""
+        ensure_directory(self.root)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def list_snapshots(self, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """按时间顺序列出快照，可按源路径过滤"""
+        snapshots = self._load_manifest()['snapshots']
+        if source is not None:
+            source = os.path.abspath(source)
+            snapshots = [s for s in snapshots if s.get('source') == source]
+        return snapshots
+
+    # ========== 对象 ==========
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.gz")
+
+    def _write_object(self, filepath: str, digest: str) -> str:
+        """压缩写入对象；相同内容的对象已存在时直接复用"""
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            ensure_directory(os.path.dirname(object_path))
+            tmp_path = object_path + '.tmp'
+            with open(filepath, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(tmp_path, object_path)
+        return object_path
+
+    # ========== 备份 / 恢复 ==========
+
+    def backup(self, filepath: str) -> Optional[str]:
+        """
+        备份单个文件
+        内容与该源路径最近一次快照相同时不新增快照
+        返回对象路径
+        """
+        source = os.path.abspath(filepath)
+        digest = compute_file_hash(source)
+
+        manifest = self._load_manifest()
+        previous = [s for s in manifest['snapshots'] if s.get('source') == source and s.get('type') != 'dir']
+        if previous and previous[-1].get('hash') == digest:
+            return self._object_path(digest)
+
+        object_path = self._write_object(source, digest)
+        now = datetime.now()
+        manifest['snapshots'].append({
+            'id': f"{now.strftime('%Y%m%d_%H%M%S_%f')}_{digest[:8]}",
+            'time': now.isoformat(timespec='seconds'),
+            'source': source,
+            'name': os.path.basename(source),
+            'hash': digest,
+            'size': os.path.getsize(source),
+        })
+        removed = self._apply_retention(manifest, source)
+        self._save_manifest(manifest)
+        self._collect_garbage(manifest, removed)
+        return object_path
+
+    def restore(self, snapshot_id: str, target_path: Optional[str] = None) -> Optional[str]:
+        """
+        将快照恢复到 target_path（默认恢复到原路径）
+        返回恢复后的路径，快照不存在时返回 None
+        """
+        snapshot = next((s for s in self._load_manifest()['snapshots'] if s.get('id') == snapshot_id), None)
+        if snapshot is None:
+            print(f"❌ [恢复失败] 快照不存在: {snapshot_id}")
+            return None
+
+        target_path = target_path or snapshot['source']
+        ensure_directory(os.path.dirname(os.path.abspath(target_path)))
+        tmp_path = target_path + '.restore_tmp'
+        if snapshot.get('type') == 'dir':
+            # 复制而非硬链接，避免之后修改恢复出的文件时改动快照
+            if os.path.exists(tmp_path):
+                shutil.rmtree(tmp_path)
+            shutil.copytree(self._snapshot_dir_path(snapshot), tmp_path)
+            if os.path.exists(target_path):
+                old_path = target_path + '.restore_old'
+                if os.path.exists(old_path):
+                    shutil.rmtree(old_path)
+                os.replace(target_path, old_path)
+                os.replace(tmp_path, target_path)
+                shutil.rmtree(old_path, ignore_errors=True)
+            else:
+                os.replace(tmp_path, target_path)
+        else:
+            with gzip.open(self._object_path(snapshot['hash']), 'rb') as src, open(tmp_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(tmp_path, target_path)
+        print(f"♻ [恢复成功] {snapshot['name']} ({snapshot['time']}) 已恢复至: {target_path}")
+        return target_path
+
+    def snapshot_directory(self, dirpath: str) -> Optional[str]:
+        """
+        增量备份文件夹
+        与上一次快照相比大小与修改时间均未变的文件以硬链接复用，其余文件复制；
+        文件夹内容（文件列表、大小、修改时间）与上一次快照完全相同时不新增快照
+        返回快照文件夹路径
+        """
+        source = os.path.abspath(dirpath)
+        listing = self._scan_directory(source)
+        signature = hashlib.sha256(json.dumps(listing).encode('utf-8')).hexdigest()
+
+        manifest = self._load_manifest()
+        previous = [s for s in manifest['snapshots'] if s.get('source') == source and s.get('type') == 'dir']
+        if previous and previous[-1].get('hash') == signature:
+            return self._snapshot_dir_path(previous[-1])
+        link_dest = self._snapshot_dir_path(previous[-1]) if previous else None
+
+        now = datetime.now()
+        name = os.path.basename(source.rstrip(os.sep))
+        snapshot_id = f"{now.strftime('%Y%m%d_%H%M%S_%f')}_{signature[:8]}"
+        snapshot = {
+            'id': snapshot_id,
+            'time': now.isoformat(timespec='seconds'),
+            'source': source,
+            'name': name,
+            'type': 'dir',
+            'hash': signature,
+            'path': os.path.join('snapshots', name, snapshot_id),
+            'files': len(listing),
+            'size': sum(size for _, size, _ in listing),
+        }
+        snapshot_path = self._snapshot_dir_path(snapshot)
+        tmp_path = snapshot_path + '.tmp'
+        linked = 0
+        for rel_path, size, mtime_ns in listing:
+            src_file = os.path.join(source, rel_path)
+            dst_file = os.path.join(tmp_path, rel_path)
+            ensure_directory(os.path.dirname(dst_file))
+            if link_dest and self._link_unchanged(os.path.join(link_dest, rel_path), dst_file, size, mtime_ns):
+                linked += 1
+            else:
+                shutil.copy2(src_file, dst_file)
+        ensure_directory(tmp_path)
+        os.replace(tmp_path, snapshot_path)
+
+        manifest['snapshots'].append(snapshot)
+        removed = self._apply_retention(manifest, source)
+        self._save_manifest(manifest)
+        self._collect_garbage(manifest, removed)
+        print(f"📁 [增量快照] {name}: 复用 {linked} 个文件，复制 {len(listing) - linked} 个文件")
+        return snapshot_path
+
+    def _snapshot_dir_path(self, snapshot: Dict[str, Any]) -> str:
+        return os.path.join(self.root, snapshot['path'])
+
+    @staticmethod
+    def _scan_directory(dirpath: str) -> List[Tuple[str, int, int]]:
+        """列出文件夹内所有文件 (相对路径, 大小, 修改时间ns)，按相对路径排序"""
+        listing = []
+        for root, dirs, files in os.walk(dirpath):
+            dirs.sort()
+            for filename in sorted(files):
+                full_path = os.path.join(root, filename)
+                st = os.stat(full_path)
+                rel_path = os.path.relpath(full_path, dirpath).replace(os.sep, '/')
+                listing.append((rel_path, st.st_size, st.st_mtime_ns))
+        return listing
+
+    @staticmethod
+    def _link_unchanged(previous_file: str, dst_file: str, size: int, mtime_ns: int) -> bool:
+        """上一次快照中的同名文件大小与修改时间均未变时创建硬链接，返回是否已链接"""
+        try:
+            st = os.stat(previous_file)
+        except OSError:
+            return False
+        if st.st_size != size or st.st_mtime_ns != mtime_ns:
+            return False
+        try:
+            os.link(previous_file, dst_file)
+            return True
+        except OSError:
+            # 文件系统不支持硬链接时回退为复制
+            return False
+
+    # ========== 保留策略 ==========
+
+    def _apply_retention(self, manifest: Dict[str, Any], source: str) -> List[Dict[str, Any]]:
+        """
+        对指定源路径的快照应用保留策略：最近 keep_last 个 + 最近 keep_daily 天每天最后一个
+        返回被移除的快照
+        """
+        snapshots = [s for s in manifest['snapshots'] if s.get('source') == source]
+        keep_ids = {s['id'] for s in snapshots[-self.keep_last:]} if self.keep_last > 0 else set()
+
+        daily_latest: Dict[str, str] = {}
+        for snapshot in snapshots:
+            daily_latest[snapshot['time'][:10]] = snapshot['id']
+        if self.keep_daily > 0:
+            for day in sorted(daily_latest)[-self.keep_daily:]:
+                keep_ids.add(daily_latest[day])
+
+        removed = [s for s in snapshots if s['id'] not in keep_ids]
+        if removed:
+            manifest['snapshots'] = [
+                s for s in manifest['snapshots']
+                if s.get('source') != source or s['id'] in keep_ids
+            ]
+        return removed
+
+    def _collect_garbage(self, manifest: Dict[str, Any], removed: List[Dict[str, Any]]):
+        """删除被移除的文件夹快照，以及被移除文件快照中已不再被任何快照引用的对象"""
+        referenced = {s.get('hash') for s in manifest['snapshots'] if s.get('type') != 'dir'}
+        for snapshot in removed:
+            if snapshot.get('type') == 'dir':
+                # 快照文件夹之间只共享硬链接，直接删除不影响其他快照
+                shutil.rmtree(self._snapshot_dir_path(snapshot), ignore_errors=True)
+                continue
+            digest = snapshot.get('hash')
+            if digest and digest not in referenced:
+                try:
+                    os.remove(self._object_path(digest))
+                except OSError:
+                    pass
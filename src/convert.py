@@ -3,6 +3,10 @@
 """
 import os
 import sys
+import json
+import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from urllib.parse import quote
 
@@ -13,8 +17,9 @@ from core.database_manager import DatabaseManager
 from core.database_model import Paper
 from src.core.update_file_utils import get_update_file_utils
 from src.utils import truncate_text, format_authors, create_hyperlink, escape_markdown,escape_markdown_base
+from src.profiler import profile_span, profiled, enable_profiling, default_report_path
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import re
 
 from src.core.config_loader import get_config_instance
@@ -28,6 +33,12 @@ class ReadmeGenerator:
         self.settings = get_config_instance().settings
         self.db_manager = DatabaseManager()
         self.update_utils = get_update_file_utils()
+        # 渲染上下文（一次README渲染中共享的论文分组与分类计数），见 _build_render_context
+        self._render_context = None
+        # 表格行片段缓存（内容哈希 -> 渲染好的行），仅在 update_readme_file 中启用，见 _load_row_cache
+        self.row_cache_path = os.path.join(self.db_manager.cache_dir, 'readme_rows.json')
+        self._row_cache = None
+        self._used_row_cache = None
 
         self.max_title_length = int(self.settings['readme'].get('max_title_length', 100))
         self.max_authors_length = int(self.settings['readme'].get('max_authors_length', 150))
@@ -45,45 +56,46 @@ class ReadmeGenerator:
             self.enable_markdown = str(markdown_val).lower() == 'true'
         except Exception:
             self.enable_markdown = bool(markdown_val)
+        # 多进程渲染表格行：进程数（0 为按CPU核数自动，1 为不使用多进程）与启用所需的最少待渲染行数
+        try:
+            self.render_workers = int(self.settings['readme'].get('render_workers', 0))
+        except (TypeError, ValueError):
+            self.render_workers = 0
+        try:
+            self.parallel_render_min_rows = int(self.settings['readme'].get('parallel_render_min_rows', 2000))
+        except (TypeError, ValueError):
+            self.parallel_render_min_rows = 2000
 
-    def generate_readme_tables(self) -> str:
+    @profiled('readme_render')
+    def generate_readme_tables(self, render_context: Dict = None) -> str:
         """生成README的论文表格部分
 
         现在按照一级/二级分类组织输出：
         - 一级分类（primary_category 为 None）作为分组头，前面加一个额外的标注
         - 对应的二级分类会在其下面显示（保持原有 '###' 级别），并只列出有论文的分类
         - 若一级分类本身包含论文，则在一级标题下先显示这些论文表格
+
+        render_context: 已构建的渲染上下文（见 _build_render_context），为 None 时重新加载数据库构建
         """
-        # 加载数据库
-        df = self.db_manager.load_database()
-        # 若开启翻译截断，在生成 README 之前，确保所有字段在 "翻译分隔符" 之前截断
-        if self.is_truncate_translation==True:
-            if df is not None and not df.empty:
-                df = self._truncate_translation_suffix(df)
-        papers = self.update_utils.excel_to_paper(df, only_non_system=False, skip_invalid=True)
-        # 排除冲突条目
-        papers=[p for p in papers if p.conflict_marker==False]
-        # 按分类分组
-        papers_by_category = self._group_papers_by_category(papers)
+        # 加载数据库并分组（整个渲染过程只加载一次）
+        if render_context is None:
+            render_context = self._build_render_context()
+        # 渲染上下文只在本次渲染内有效，渲染结束后清除，避免长期复用的生成器在数据库变化后沿用旧的分组与计数
+        self._render_context = render_context
+        try:
+            return self._render_readme_tables(render_context)
+        finally:
+            self._render_context = None
+
+    def _render_readme_tables(self, render_context: Dict) -> str:
+        """按渲染上下文输出各分类标题与论文表格"""
+        papers_by_category = render_context['papers_by_category']
         
-        # 生成Markdown表格（按一级分类组织）
-        markdown_output = ""
-
-        cats = [c for c in self.config.get_active_categories() if c.get('enabled', True)]
-        # 构建父 -> 子 的映射（主键使用父类的 unique_name）
-        children_map = {}
-        parents = []
-        for c in cats:
-            p = c.get('primary_category')
-            if p is None:
-                parents.append(c)
-            else:
-                children_map.setdefault(p, []).append(c)
+        # 生成Markdown表格（按一级分类组织）：先按输出顺序收集标题片段与各分类的论文表格，再统一渲染表格行
+        sections = []
 
-        # 按 order 排序父和子（order 仍用于显示排序）
-        parents = sorted(parents, key=lambda x: x.get('order', 0))
-        for k in children_map:
-            children_map[k] = sorted(children_map[k], key=lambda x: x.get('order', 0))
+        parents = render_context['parents']
+        children_map = render_context['children_map']
 
         for parent in parents:
             parent_name = parent.get('name', parent.get('unique_name'))
@@ -103,11 +115,11 @@ class ReadmeGenerator:
 
             
             # 添加一级分类标题（包含计数）
-            markdown_output += f"\n### | {parent_name} ({parent_count} papers)\n\n"
+            sections.append(f"\n### | {parent_name} ({parent_count} papers)\n\n")
 
             # 若父类本身有论文，先显示父类表格
             if parent_papers:
-                markdown_output += self._generate_category_table(parent_papers)
+                sections.append(parent_papers)
 
             # 依次显示每个二级分类（保持原来的 ### 级别）
             for child in child_list:
@@ -117,10 +129,12 @@ class ReadmeGenerator:
                     continue
                 # 子类计数
                 child_count = len(child_papers)
-                markdown_output += f"\n### {child_name} ({child_count} papers)\n\n"
-                markdown_output += self._generate_category_table(child_papers)
+                sections.append(f"\n### {child_name} ({child_count} papers)\n\n")
+                sections.append(child_papers)
 
-        return markdown_output
+        table_rows = iter(self._render_category_rows([s for s in sections if isinstance(s, list)]))
+        return "".join(s if isinstance(s, str) else self._generate_category_table(s, next(table_rows))
+                       for s in sections)
     
     def _slug(self, name: str) -> str:
         """简单 slug（用于Anchor链接）"""
@@ -128,6 +142,75 @@ class ReadmeGenerator:
         s = re.sub(r'[^A-Za-z0-9\s\-]', '', s)
         return re.sub(r'\s+', '-', s)
     
+    @profiled('build_render_context')
+    def _build_render_context(self) -> Dict:
+        """构建README渲染上下文：只加载并分组一次论文，并一次性预计算整个分类树的计数与锚点
+
+        Returns:
+            {
+                'papers_by_category': 分类 unique_name -> 论文列表（已排除冲突条目与不在README显示的论文）,
+                'parents': 按 order 排序的一级分类列表,
+                'children_map': 一级分类 unique_name -> 按 order 排序的二级分类列表,
+                'category_stats': 分类 unique_name -> (去重论文数, 锚点),
+                'total_unique': README 中去重后的论文总数,
+            }
+        """
+        try:
+            df = self.db_manager.load_database()
+            # 若开启翻译截断，在生成 README 之前，确保所有字段在 "翻译分隔符" 之前截断
+            if self.is_truncate_translation and df is not None and not df.empty:
+                df = self._truncate_translation_suffix(df)
+            papers = self.update_utils.excel_to_paper(df, only_non_system=False, skip_invalid=True)
+            # 排除冲突条目
+            papers = [p for p in papers if p.conflict_marker == False]
+        except Exception as e:
+            print(f"加载README论文数据失败: {e}")
+            papers = []
+        # 按分类分组（_group_papers_by_category 会排除 show_in_readme=False 的论文）
+        papers_by_category = self._group_papers_by_category(papers)
+
+        # 每篇论文的唯一键只计算一次（基于 doi/title）
+        paper_keys = {id(p): p.get_key() for p in papers if p.show_in_readme}
+
+        # 父 -> 子 的映射（主键使用父类的 unique_name），父和子均按 order 排序
+        parents = self.config.get_primary_categories()
+        children_map = self.config.get_category_children_map()
+
+        # 预计算所有已配置分类（包括未启用的，供 multi-category 链接使用）的计数与锚点
+        category_stats = {}
+        for category_config in self.config.categories_config.get('categories', []):
+            unique_name = category_config.get('unique_name')
+            if unique_name in category_stats:
+                continue
+            unique_paper_keys = {paper_keys[id(p)] for p in papers_by_category.get(unique_name, [])}
+            name = category_config.get('name', unique_name)
+            if category_config.get('primary_category') is None:
+                # 一级分类：计算该分类加所有子分类的论文
+                for child in children_map.get(unique_name, []):
+                    for paper in papers_by_category.get(child.get('unique_name'), []):
+                        unique_paper_keys.add(paper_keys[id(paper)])
+                count = len(unique_paper_keys)
+                anchor = self._slug(f"|-{name} {count} papers")
+            else:
+                # 二级分类：只计算该分类的论文
+                count = len(unique_paper_keys)
+                anchor = self._slug(f"{name} {count} papers")
+            category_stats[unique_name] = (count, anchor)
+
+        return {
+            'papers_by_category': papers_by_category,
+            'parents': parents,
+            'children_map': children_map,
+            'category_stats': category_stats,
+            'total_unique': len(set(paper_keys.values())),
+        }
+
+    def _get_render_context(self) -> Dict:
+        """获取当前渲染上下文；不在渲染过程中时按当前数据库临时构建（不缓存）"""
+        if getattr(self, '_render_context', None) is None:
+            return self._build_render_context()
+        return self._render_context
+
     def _get_category_paper_count_and_anchor(self, unique_name: str) -> Tuple[int,str]:
         """计算分类的论文总数（去重）
         
@@ -135,59 +218,26 @@ class ReadmeGenerator:
         - 一级分类（primary_category为None）：计算该一级分类及其所有二级分类的论文总数
         - 二级分类（有primary_category）：只计算该分类的论文总数
         
+        结果取自渲染上下文中预计算的表，不会重新加载数据库
+        
         Args:
             unique_name: 分类的 unique_name
         
         Returns:
             去重后的论文总数，对应的anchor字符串
         """
-        # 自动加载论文数据
         try:
-            df = self.db_manager.load_database()
-            if self.is_truncate_translation and df is not None and not df.empty:
-                df = self._truncate_translation_suffix(df)
-            papers = self.update_utils.excel_to_paper(df, only_non_system=False, skip_invalid=True)
-            papers = [p for p in papers if p.conflict_marker == False and p.show_in_readme]
-            papers_by_category = self._group_papers_by_category(papers)
+            render_context = self._get_render_context()
         except Exception:
             return 0,''
         
-        # 获取分类信息
-        category_config = self.config.get_category_by_unique_name(unique_name)
-        if not category_config:
-            return len(papers_by_category.get(unique_name, [])), ''
-        
-        unique_paper_keys = set()
-        
-        # 判断是一级还是二级分类
-        primary_category = category_config.get('primary_category')
-        
-        if primary_category is None:
-            # 一级分类：计算该分类加所有子分类的论文
-            # 先计算该分类本身的论文
-            for paper in papers_by_category.get(unique_name, []):
-                unique_paper_keys.add(paper.get_key())
-            
-            # 再计算所有子分类的论文
-            all_cats = [c for c in self.config.get_active_categories() if c.get('enabled', True)]
-            for cat in all_cats:
-                if cat.get('primary_category') == unique_name:
-                    cat_unique = cat.get('unique_name')
-                    if cat_unique:
-                        for paper in papers_by_category.get(cat_unique, []):
-                            unique_paper_keys.add(paper.get_key())
-
-            count = len(unique_paper_keys)
-            anchor = self._slug(f"|-{category_config.get('name', unique_name)} {count} papers")
-        else:
-            # 二级分类：只计算该分类的论文
-            for paper in papers_by_category.get(unique_name, []):
-                unique_paper_keys.add(paper.get_key())
-            count = len(unique_paper_keys)
-            anchor = self._slug(f"{category_config.get('name', unique_name)} {count} papers")
-        
-        return count, anchor
+        stats = render_context['category_stats'].get(unique_name)
+        if stats is None:
+            # 未配置的分类
+            return len(render_context['papers_by_category'].get(unique_name, [])), ''
+        return stats
     
+    @profiled('quick_links')
     def _generate_quick_links(self) -> str:
         """根据 categories 配置生成 Quick Links 列表（插入到表格前）
 
@@ -195,25 +245,13 @@ class ReadmeGenerator:
         - 一级分类（primary_category 为 None）作为父条目列出
         - 二级分类（primary_category 指向父分类的 `unique_name`）会被放在对应一级分类下，换行并缩进显示
         """
-        cats = [c for c in self.config.get_active_categories() if c.get('enabled', True)]
-        if not cats:
+        render_context = self._get_render_context()
+        # 父 -> 子 的映射（按 order 排序）
+        parents = render_context['parents']
+        children_map = render_context['children_map']
+        if not parents and not children_map:
             return ""
 
-        # 构建父 -> 子 的映射（按 order 排序）
-        children_map = {}
-        parents = []
-        for c in cats:
-            p = c.get('primary_category')
-            if p is None:
-                parents.append(c)
-            else:
-                children_map.setdefault(p, []).append(c)
-
-        # 按 order 排序父和子
-        parents = sorted(parents, key=lambda x: x.get('order', 0))
-        for k in children_map:
-            children_map[k] = sorted(children_map[k], key=lambda x: x.get('order', 0))
-
         lines = ["### Quick Links", ""]
         for parent in parents:
             name = parent.get('name', parent.get('unique_name'))
@@ -271,8 +309,8 @@ class ReadmeGenerator:
         
         return papers_by_category
     
-    def _generate_category_table(self, papers: List[Paper]) -> str:
-        """为单个分类生成Markdown表格"""
+    def _generate_category_table(self, papers: List[Paper], rows: Optional[List[str]] = None) -> str:
+        """为单个分类生成Markdown表格（rows 为已渲染好的各论文表格行，为 None 时逐行渲染）"""
         if not papers:
             return ""
         
@@ -280,14 +318,172 @@ class ReadmeGenerator:
         table_header = "| Title & Info | Analogy Summary | Pipeline | Summary |\n"
         table_separator = "|:--| :---: | :----: | :---: |\n"
         
-        table_rows = ""
+        if rows is None:
+            rows = [self._generate_paper_row_cached(paper) for paper in papers]
         
-        for paper in papers:
-            row = self._generate_paper_row(paper)
-            table_rows += row
-        
-        return table_header + table_separator + table_rows
+        return table_header + table_separator + "".join(rows)
+
+    def _render_category_rows(self, tables: List[List[Paper]]) -> List[List[str]]:
+        """
+        渲染各分类表格的全部论文行，返回与 tables 一一对应的行列表
+        行片段缓存命中的行直接复用；其余行按分类切分为独立任务，待渲染行数达到 parallel_render_min_rows
+        且可用进程数大于1时在进程池中并行渲染，否则在当前进程中依次渲染，两种方式结果逐字节一致
+        """
+        rows: List[List[Optional[str]]] = [[None] * len(papers) for papers in tables]
+        # 待渲染的行：(表格序号, 行序号, 缓存键)
+        pending: List[Tuple[int, int, Optional[str]]] = []
+        for t, papers in enumerate(tables):
+            for i, paper in enumerate(papers):
+                key = None
+                if self._row_cache is not None:
+                    key = self._get_row_cache_key(paper)
+                    cached = self._row_cache.get(key) if key is not None else None
+                    if cached is not None:
+                        rows[t][i] = cached
+                        self._used_row_cache[key] = cached
+                        continue
+                pending.append((t, i, key))
+        if not pending:
+            return rows
+
+        # 按分类切分任务；较大的分类再切块，使各进程负载均衡
+        workers = self._get_render_worker_count(len(pending))
+        chunk_size = max(1, -(-len(pending) // (workers * 4)))
+        jobs: List[List[Tuple[int, int, Optional[str]]]] = []
+        for entry in pending:
+            if not jobs or jobs[-1][0][0] != entry[0] or len(jobs[-1]) >= chunk_size:
+                jobs.append([])
+            jobs[-1].append(entry)
+
+        rendered = None
+        if workers > 1:
+            rendered = self._render_rows_in_pool([[tables[t][i] for t, i, _ in job] for job in jobs], workers)
+        if rendered is None:
+            rendered = [[self._generate_paper_row(tables[t][i]) for t, i, _ in job] for job in jobs]
+
+        for job, job_rows in zip(jobs, rendered):
+            for (t, i, key), row in zip(job, job_rows):
+                rows[t][i] = row
+                if key is not None:
+                    self._row_cache[key] = row
+                    self._used_row_cache[key] = row
+        return rows
+
+    def _get_render_worker_count(self, pending_count: int) -> int:
+        """本次渲染使用的进程数；待渲染行数不足 parallel_render_min_rows 时为1（进程启动有固定开销）"""
+        if pending_count < max(1, self.parallel_render_min_rows):
+            return 1
+        workers = self.render_workers if self.render_workers > 0 else (os.cpu_count() or 1)
+        return max(1, min(workers, pending_count))
+
+    @profiled('render_rows_parallel')
+    def _render_rows_in_pool(self, jobs: List[List[Paper]], workers: int) -> Optional[List[List[str]]]:
+        """在进程池中渲染各任务的论文行（结果按任务顺序返回）；进程池不可用时返回 None，由调用方改为串行渲染"""
+        snapshot = {
+            'max_title_length': self.max_title_length,
+            'max_authors_length': self.max_authors_length,
+            'enable_markdown': self.enable_markdown,
+            'category_stats': dict(self._get_render_context()['category_stats']),
+        }
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                                     initargs=(snapshot,)) as executor:
+                return list(executor.map(_render_rows_job, jobs))
+        except Exception as e:
+            print(f"多进程渲染README失败，改为单进程渲染: {e}")
+            return None
     
+    def _generate_paper_row_cached(self, paper: Paper) -> str:
+        """生成单篇论文的表格行，若片段缓存已启用且命中则直接复用"""
+        if self._row_cache is None:
+            return self._generate_paper_row(paper)
+        key = self._get_row_cache_key(paper)
+        if key is None:
+            return self._generate_paper_row(paper)
+        row = self._row_cache.get(key)
+        if row is None:
+            row = self._generate_paper_row(paper)
+            self._row_cache[key] = row
+        self._used_row_cache[key] = row
+        return row
+
+    def _get_row_cache_salt(self) -> List:
+        """影响行渲染结果的全局因素：渲染代码版本（本文件与 src/utils.py 中的渲染辅助函数）、[readme] 设置、summary 标签显示名"""
+        code_hash = hashlib.sha256()
+        try:
+            for path in (__file__, sys.modules[truncate_text.__module__].__file__):
+                with open(path, 'rb') as f:
+                    code_hash.update(f.read())
+            code_version = code_hash.hexdigest()
+        except Exception:
+            code_version = ""
+        summary_labels = [self.config.get_tag_field(v, 'display_name') for v in
+                          ('summary_motivation', 'summary_innovation', 'summary_method',
+                           'summary_conclusion', 'summary_limitation')]
+        return [code_version, self.max_title_length, self.max_authors_length,
+                self.enable_markdown, summary_labels, str(self.config.project_root)]
+
+    def _get_row_cache_key(self, paper: Paper) -> str:
+        """
+        计算论文表格行的内容哈希：渲染所用字段 + 全局设置 + 多分类锚点 + pipeline 图片存在性
+        若 pipeline 图片缺失则返回 None（不缓存，以便每次渲染都输出缺图警告）
+        """
+        raw_cat = paper.category or ""
+        parts = [p.strip() for p in re.split(r'[;；]', raw_cat) if p.strip()]
+        category_links = []
+        if len(parts) > 1:
+            for uname in parts:
+                display = self.config.get_category_field(uname, 'name') or uname
+                category_links.append([display, self._get_category_paper_count_and_anchor(uname)[1]])
+
+        image_state = []
+        if paper.pipeline_image:
+            project_root = str(self.config.project_root)
+            for p in [p.strip() for p in str(paper.pipeline_image).split(';') if p.strip()][:3]:
+                exists = os.path.exists(os.path.join(project_root, p))
+                fallback_exists = os.path.exists(os.path.join(project_root, "figures", os.path.basename(p)))
+                if not exists and not fallback_exists:
+                    return None
+                image_state.append([p, exists, fallback_exists])
+
+        fields = [paper.title, paper.authors, paper.date, paper.conference, paper.project_url,
+                  paper.paper_url, paper.analogy_summary, paper.pipeline_image,
+                  paper.summary_motivation, paper.summary_innovation, paper.summary_method,
+                  paper.summary_conclusion, paper.summary_limitation, paper.notes]
+        payload = json.dumps([self._row_cache_salt, fields, category_links, image_state],
+                             ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load_row_cache(self):
+        """加载持久化的表格行片段缓存并启用"""
+        self._row_cache_salt = self._get_row_cache_salt()
+        self._row_cache = {}
+        self._used_row_cache = {}
+        try:
+            if os.path.exists(self.row_cache_path):
+                with open(self.row_cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._row_cache = data
+        except Exception as e:
+            print(f"读取README行缓存失败，将全部重新渲染: {e}")
+
+    def _save_row_cache(self):
+        """保存本次渲染用到的表格行片段（不再使用的条目随之淘汰）并停用缓存"""
+        if self._used_row_cache is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.row_cache_path), exist_ok=True)
+            tmp_path = f"{self.row_cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._used_row_cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.row_cache_path)
+        except Exception as e:
+            print(f"写入README行缓存失败: {e}")
+        finally:
+            self._row_cache = None
+            self._used_row_cache = None
+
     def _generate_paper_row(self, paper: Paper) -> str:
         """生成单篇论文的表格行"""
         # 第1列：标题、作者、年份
@@ -361,7 +557,7 @@ class ReadmeGenerator:
                 for uname in parts:
                     # 获取分类显示名
                     display = self.config.get_category_field(uname, 'name') or uname
-                    count, anchor = self._get_category_paper_count_and_anchor(uname)  # 仅用于生成锚点，自动加载数据
+                    count, anchor = self._get_category_paper_count_and_anchor(uname)  # 仅用于生成锚点，取自渲染上下文
                     links.append(f"[{display}](#{anchor})")
                 links_str = ", ".join(links)
                 multi_line = f" <br> <span style=\"color:cyan\">[multi-category：{links_str}]</span>"
@@ -535,10 +731,23 @@ class ReadmeGenerator:
             print(f"读取README文件失败: {e}")
             return False
         
-        # 生成新的表格部分
-        new_tables = self.generate_readme_tables()
-        # 生成 Quick Links（基于 categories 配置）
-        tables_intro = self._generate_quick_links()
+        # 构建一次渲染上下文，表格、Quick Links 与论文总数共用
+        render_context = self._build_render_context()
+        # 生成新的表格部分（启用行片段缓存，只重新渲染内容变化的论文行）
+        self._load_row_cache()
+        try:
+            new_tables = self.generate_readme_tables(render_context)
+        except Exception:
+            self._row_cache = None
+            self._used_row_cache = None
+            raise
+        self._save_row_cache()
+        # 生成 Quick Links（基于 categories 配置，与表格共用同一渲染上下文，用完即清除）
+        self._render_context = render_context
+        try:
+            tables_intro = self._generate_quick_links()
+        finally:
+            self._render_context = None
         
         # 查找并替换表格部分
         # 表格部分在"## Full paper list"之后开始
@@ -552,19 +761,7 @@ class ReadmeGenerator:
             print("无法找到README中的标记部分")
             return False
         # 计算表格中论文总数（不重复计数）并把数量附加到标题后
-        try:
-            df = self.db_manager.load_database()
-            if self.is_truncate_translation and df is not None and not df.empty:
-                df = self._truncate_translation_suffix(df)
-            papers = self.update_utils.excel_to_paper(df, only_non_system=False, skip_invalid=True)
-            papers = [p for p in papers if p.conflict_marker == False and p.show_in_readme]
-            # 使用 get_key 去重（基于 doi/title）
-            unique_keys = set()
-            for p in papers:
-                unique_keys.add(p.get_key())
-            total_unique = len(unique_keys)
-        except Exception:
-            total_unique = 0
+        total_unique = render_context['total_unique']
 
         before_tables = content[:start_index + len(start_marker)] + f" ({total_unique} papers)"
         after_tables = content[end_index:]
@@ -600,7 +797,7 @@ class ReadmeGenerator:
         
         # 写入文件
         try:
-            with open(readme_path, 'w', encoding='utf-8') as f:
+            with profile_span('write'), open(readme_path, 'w', encoding='utf-8') as f:
                 f.write(new_content)
             print(f"README文件已更新: {readme_path}")
             return True
@@ -639,18 +836,53 @@ class ReadmeGenerator:
         return df
 
 
-def main():
+# 渲染进程中的 README 生成器（由 _init_render_worker 按主进程的设置快照初始化）
+_render_worker: Optional[ReadmeGenerator] = None
+
+
+def _init_render_worker(snapshot: Dict):
+    """渲染进程初始化：创建生成器并套用主进程冻结的渲染设置与分类锚点，不加载数据库"""
+    global _render_worker
+    generator = ReadmeGenerator()
+    generator.max_title_length = snapshot['max_title_length']
+    generator.max_authors_length = snapshot['max_authors_length']
+    generator.enable_markdown = snapshot['enable_markdown']
+    generator._render_context = {
+        'papers_by_category': {},
+        'parents': [],
+        'children_map': {},
+        'category_stats': snapshot['category_stats'],
+        'total_unique': 0,
+    }
+    _render_worker = generator
+
+
+def _render_rows_job(papers: List[Paper]) -> List[str]:
+    """渲染进程任务：渲染一组论文的表格行"""
+    return [_render_worker._generate_paper_row(paper) for paper in papers]
+
+
+def main(argv=None):
     """主函数"""
+    parser = argparse.ArgumentParser(description="根据核心excel生成README论文表格")
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='REPORT_PATH',
+                        help="输出各阶段耗时/调用次数/峰值内存的剖析报告（JSON + .folded 折叠栈），"
+                             "默认写入 cache_dir/profile/")
+    args = parser.parse_args(argv)
+    profiler = enable_profiling('convert') if args.profile is not None else None
+
     print("开始生成README论文表格...")
     
     generator = ReadmeGenerator()
     
     # 生成表格
-    tables = generator.generate_readme_tables()
+    with profile_span('generate_tables'):
+        tables = generator.generate_readme_tables()
     print("论文表格生成完成")
     
     # 更新README文件
-    success = generator.update_readme_file()
+    with profile_span('update_readme'):
+        success = generator.update_readme_file()
     
     if success:
         print("README文件更新成功")
@@ -660,6 +892,11 @@ def main():
         print("\n生成的表格内容：")
         print(tables)
 
+    if profiler is not None:
+        profiler.print_summary()
+        report_path = profiler.write_report(args.profile or default_report_path('convert'))
+        print(f"剖析报告已写入: {report_path}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,4 +2,9 @@
 from .config_loader import *
 from .database_manager import *
 from .database_model import *
+from .paper_store import *
+from .sqlite_storage import *
+from .title_index import *
 from .update_file_utils import *
+from .validation_cache import *
+from .validation_plan import *
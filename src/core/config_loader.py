@@ -7,6 +7,9 @@ import configparser
 from typing import Dict, List, Any, Optional
 import sys
 import json
+import hashlib
+import importlib
+from types import MappingProxyType
 from pathlib import Path
 
 
@@ -41,6 +44,10 @@ class ConfigLoader:
         
         # 加载全局 API Key 池
         self.api_keys = self._load_global_api_keys()
+
+        # 配置指纹缓存（见 get_config_version）与查询索引，设置重新加载时重建
+        self._config_version = None
+        self._build_indexes()
     
     def _load_settings(self) -> Dict[str, Any]:
         """加载config.ini文件，优先加载默认配置，再覆盖用户配置"""
@@ -241,6 +248,7 @@ class ConfigLoader:
         # 刷新
         self.settings = self._load_settings()
         self.api_keys = self._load_global_api_keys()
+        self._invalidate_caches()
 
     def get_ai_provider_defaults(self, provider: str) -> Dict[str, str]:
         """获取 Provider 的默认值"""
@@ -257,56 +265,100 @@ class ConfigLoader:
         # 直接从categories_config模块导入配置
         return categories_config.CATEGORIES_CONFIG
     
+    def _build_indexes(self):
+        """
+        根据 tags_config / categories_config 预先构建只读索引与排序视图
+        仅在初始化、save_ai_settings 或 reload 时重建，查询方法不再逐次扫描配置列表
+        """
+        tags = self.tags_config.get('tags', [])
+        raw_categories = self.categories_config.get('categories', []) or []
+
+        # 标签视图（保持配置中的原始顺序）
+        active_tags = tuple(tag for tag in tags if tag.get('immutable', False) or tag.get('enabled', False))
+        self._active_tags = active_tags
+        self._required_tags = tuple(tag for tag in active_tags if tag.get('required', False))
+        self._non_system_tags = tuple(tag for tag in active_tags if not tag.get('system_var', False))
+        self._system_tags = tuple(tag for tag in active_tags if tag.get('system_var', False))
+
+        # 变量名 -> 标签（同名时取配置中第一个）
+        tag_by_variable: Dict[str, Dict[str, Any]] = {}
+        for tag in tags:
+            tag_by_variable.setdefault(tag.get('variable'), tag)
+        self._tag_by_variable = MappingProxyType(tag_by_variable)
+
+        # unique_name / name -> 分类（同名时取配置中第一个）
+        category_by_unique_name: Dict[str, Dict[str, Any]] = {}
+        category_by_name: Dict[str, Dict[str, Any]] = {}
+        for category in raw_categories:
+            category_by_unique_name.setdefault(category.get('unique_name'), category)
+            category_by_name.setdefault(category.get('name'), category)
+        self._category_by_unique_name = MappingProxyType(category_by_unique_name)
+        self._category_by_name = MappingProxyType(category_by_name)
+
+        # 启用分类按 order 排序；order 相同时保持配置中出现的原始顺序（sorted 为稳定排序）
+        enabled = [dict(category) for category in raw_categories if category.get('enabled', True)]
+        self._active_categories = tuple(sorted(enabled, key=lambda c: c.get('order', 0)))
+
+        # 一级分类 -> 二级分类（均为启用分类，按 order 排序）
+        children: Dict[str, List[Dict[str, Any]]] = {}
+        for category in self._active_categories:
+            parent = category.get('primary_category')
+            if parent is not None:
+                children.setdefault(parent, []).append(category)
+        self._children_by_parent = MappingProxyType({k: tuple(v) for k, v in children.items()})
+
+    def reload(self):
+        """重新加载 config.ini、tag 配置与分类配置，并重建索引"""
+        importlib.reload(tag_config)
+        importlib.reload(categories_config)
+        self.settings = self._load_settings()
+        self.tags_config = self._load_tags_config()
+        self.categories_config = self._load_categories_config()
+        self.paths = self.settings.get('paths', {})
+        self.api_keys = self._load_global_api_keys()
+        self._invalidate_caches()
+
+    def _invalidate_caches(self):
+        """清空配置指纹并重建查询索引"""
+        self._config_version = None
+        self._build_indexes()
+
     def get_active_tags(self) -> List[Dict[str, Any]]:
         """获取所有启用的标签（包括immutable标签）"""
-        active_tags = []
-        for tag in self.tags_config.get('tags', []):
-            if tag.get('immutable', False) or tag.get('enabled', False):
-                active_tags.append(tag)
-        return active_tags
+        return list(self._active_tags)
     
     def get_active_categories(self) -> List[Dict[str, Any]]:
         """获取所有启用的分类"""
         # 返回按 order 排序的启用分类。当 order 值重复时，保持配置中出现的原始顺序。
-        raw = self.categories_config.get('categories', []) or []
-        active_categories = []
-        for idx, category in enumerate(raw):
-            if category.get('enabled', True):
-                # 附加原始索引，便于稳定排序时作为次级键
-                cat = dict(category)
-                cat['_original_index'] = idx
-                active_categories.append(cat)
-
-        # 使用 tuple(key_order, original_index) 进行排序，保证当 order 相同时保持原始出现顺序
-        active_categories.sort(key=lambda c: (c.get('order', 0), c.get('_original_index', 0)))
-
-        # 在返回前移除内部使用的临时字段
-        for c in active_categories:
-            if '_original_index' in c:
-                del c['_original_index']
-
-        return active_categories
+        # 列表中的分类为缓存的配置副本，调用方不应修改
+        return list(self._active_categories)
+
+    def get_primary_categories(self) -> List[Dict[str, Any]]:
+        """获取所有启用的一级分类（primary_category 为 None），按 order 排序"""
+        return [c for c in self._active_categories if c.get('primary_category') is None]
+
+    def get_child_categories(self, unique_name: str) -> List[Dict[str, Any]]:
+        """获取一级分类下所有启用的二级分类，按 order 排序"""
+        return list(self._children_by_parent.get(unique_name, ()))
+
+    def get_category_children_map(self) -> Dict[str, List[Dict[str, Any]]]:
+        """获取 一级分类 unique_name -> 启用的二级分类列表（按 order 排序）的映射"""
+        return {parent: list(children) for parent, children in self._children_by_parent.items()}
     
     def get_tag_by_variable(self, variable: str) -> Optional[Dict[str, Any]]:
         """根据变量名获取标签配置"""
-        for tag in self.tags_config.get('tags', []):
-            if tag.get('variable') == variable:
-                return tag
-        return None
+        return self._tag_by_variable.get(variable)
     def get_tag_field(self, variable: str,field_name:str) -> str:
         """根据变量名和tag域名获取具体tag的具体字段值"""
-        for tag in self.tags_config.get('tags', []):
-            if tag.get('variable') == variable:
-                return tag.get(field_name,"")
+        tag = self._tag_by_variable.get(variable)
+        if tag is not None:
+            return tag.get(field_name,"")
 
         return ''
     
     def get_category_by_unique_name(self, unique_name: str) -> Optional[Dict[str, Any]]:
         """根据唯一标识名获取分类配置"""
-        for category in self.categories_config.get('categories', []):
-            if category.get('unique_name') == unique_name:
-                return category
-        return None
+        return self._category_by_unique_name.get(unique_name)
     
     def get_categories_change_list(self) -> List[Dict[str, str]]:
         """获取分类变更列表"""
@@ -314,49 +366,44 @@ class ConfigLoader:
     
     def get_category_by_name_or_unique_name(self, identifier: str) -> Optional[Dict[str, Any]]:
         """根据 unique_name 或 name 获取分类配置"""
-        # 首先按 unique_name 匹配
-        for category in self.categories_config.get('categories', []):
-            if category.get('unique_name') == identifier:
-                return category
-        
-        # 如果按 unique_name 未找到，则按 name 匹配
-        for category in self.categories_config.get('categories', []):
-            if category.get('name') == identifier:
-                return category
-        
-        return None
+        # 首先按 unique_name 匹配，未找到则按 name 匹配
+        category = self._category_by_unique_name.get(identifier)
+        if category is None:
+            category = self._category_by_name.get(identifier)
+        return category
     
     def get_category_field(self, unique_name: str,field_name:str) -> str:
         """根据唯一标识名和category域名获取具体category的具体字段值"""
-        for category in self.categories_config.get('categories', []):
-            if category.get('unique_name') == unique_name:
-                return category.get(field_name,"")
+        category = self._category_by_unique_name.get(unique_name)
+        if category is not None:
+            return category.get(field_name,"")
 
         return ''
     def get_required_tags(self) -> List[Dict[str, Any]]:
         """获取所有必填标签"""
-        required_tags = []
-        for tag in self.get_active_tags():
-            if tag.get('required', False):
-                required_tags.append(tag)
-        return required_tags
+        return list(self._required_tags)
     
     def get_non_system_tags(self) -> List[Dict[str, Any]]:
         """获取所有非系统字段标签（system_var=False）,不包括禁用的tag！"""
-        non_system_tags = []
-        for tag in self.get_active_tags():
-            # 从配置中读取system_var字段，默认为False
-            if not tag.get('system_var', False):
-                non_system_tags.append(tag)
-        return non_system_tags
+        return list(self._non_system_tags)
     def get_system_tags(self) -> List[Dict[str, Any]]:
         """获取所有系统字段标签（system_var=True）"""
-        system_tags = []
-        for tag in self.get_active_tags():
-            # 从配置中读取system_var字段，默认为False
-            if tag.get('system_var', False):
-                system_tags.append(tag)
-        return system_tags
+        return list(self._system_tags)
+    
+    def get_config_version(self) -> str:
+        """
+        获取配置指纹：tag配置、分类配置以及 [database]/[paths] 设置的哈希
+        这些配置决定论文字段的规范化与验证结果，任一变化时指纹随之变化
+        结果会被缓存，设置重新加载（save_ai_settings / reload）后重新计算
+        """
+        if self._config_version is None:
+            payload = json.dumps(
+                [self.tags_config, self.categories_config,
+                 self.settings.get('database', {}), self.settings.get('paths', {})],
+                sort_keys=True, ensure_ascii=False, default=str
+            )
+            self._config_version = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return self._config_version
     
     def validate_value(self, tag: Dict[str, Any], value: Any) -> bool:
         """验证值是否符合标签的验证规则"""
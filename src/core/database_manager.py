@@ -3,25 +3,41 @@
 处理Excel数据库的读写操作
 """
 import os,sys,re
+import json
+import sqlite3
+import difflib
 import pandas as pd
 import openpyxl
-from openpyxl.styles import PatternFill, Font
+from openpyxl.styles import PatternFill, Font, Alignment
+from openpyxl.formatting.formatting import ConditionalFormattingList
+from openpyxl.formatting.rule import FormulaRule
 from openpyxl.utils import get_column_letter
-from typing import Dict, List, Optional, Any, Tuple
+from pandas.io.parsers import TextParser
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 import shutil
-from datetime import datetime
+from datetime import datetime, date, time, timedelta
 import warnings
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
 
 # 导入配置和模型
 from src.core.config_loader import get_config_instance
-from src.core.database_model import Paper, is_same_identity, is_duplicate_paper
+from src.core.database_model import Paper, is_same_identity, is_duplicate_paper, validate_papers_fields
+from src.core.paper_store import PaperStore
+from src.core.sqlite_storage import SQLiteStorage
+from src.core.title_index import TitleIndex
 from src.core.update_file_utils import get_update_file_utils
-from src.utils import backup_file
+from src.utils import backup_file, ensure_directory, get_file_signature, compute_file_hash
+from src.profiler import profile_span, profiled
 
 
 class DatabaseManager:
     """数据库管理器"""
+    # 增量保存时，变更行数超过总行数的该比例则改为全量重写
+    DELTA_SAVE_MAX_RATIO = 0.5
+    # 可选的存储引擎
+    STORAGE_BACKENDS = ('excel', 'sqlite')
+    # 冲突/不规范高亮的条件格式作用到的末行（Excel 最大行号），增删行后规则无需更新
+    HIGHLIGHT_MAX_ROW = 1048576
     
     def __init__(self):
         self.config = get_config_instance()
@@ -29,6 +45,24 @@ class DatabaseManager:
         self.core_excel_path = self.settings['paths']['core_excel']
         self.backup_dir = self.settings['paths']['backup_dir']
         self.conflict_marker = self.settings['database']['conflict_marker']
+        # 数据库侧车缓存目录（缓存解析后的DataFrame，避免重复解析xlsx）
+        self.cache_dir = self.settings['paths'].get('cache_dir') or os.path.join(str(self.config.project_root), '.cache')
+        # 近似重复标题检测：规范化标题的词元相似度不低于该阈值时提示疑似重复
+        try:
+            self.near_duplicate_threshold = float(self.settings['database'].get('near_duplicate_threshold', 0.8))
+        except (TypeError, ValueError):
+            self.near_duplicate_threshold = 0.8
+        # 最近一次 add_papers 发现的疑似重复提示
+        self.near_duplicate_msg: List[str] = []
+        
+        # 存储引擎：excel 直接读写 core_excel；sqlite 读写 core_sqlite，core_excel 仅作为导出视图（见 export_excel）
+        self.storage_backend = str(self.settings['database'].get('storage_backend', 'excel') or 'excel').strip().lower()
+        if self.storage_backend not in self.STORAGE_BACKENDS:
+            print(f"⚠ 未知的存储引擎 '{self.storage_backend}'，改用 excel")
+            self.storage_backend = 'excel'
+        self.core_sqlite_path = self.settings['paths'].get('core_sqlite') or \
+            os.path.splitext(self.core_excel_path)[0] + '.sqlite3'
+        self.sqlite_storage = SQLiteStorage(self.core_sqlite_path, self.config)
         
         self.update_utils = get_update_file_utils()
 
@@ -38,23 +72,175 @@ class DatabaseManager:
     
 
     
+    @profiled('load_database')
     def load_database(self) -> pd.DataFrame:
-        """加载数据库到DataFrame"""
+        """加载数据库到DataFrame（按存储引擎读取 core_sqlite 或 core_excel）"""
+        if self.storage_backend == 'sqlite':
+            return self._load_sqlite_database()
+        return self._load_excel_database()
+    
+    def _load_sqlite_database(self) -> pd.DataFrame:
+        """从SQLite加载数据库；SQLite数据库尚不存在时先导入现有的 core_excel（首次切换存储引擎时自动迁移）"""
+        try:
+            if not self.sqlite_storage.exists() and os.path.exists(self.core_excel_path):
+                df = self.update_utils.normalize_dataframe_columns(self._load_excel_database(), self.config)
+                self.sqlite_storage.save(df)
+                print(f"已将 {self.core_excel_path} 中的 {len(df)} 条论文导入SQLite数据库: {self.core_sqlite_path}")
+            df = self.sqlite_storage.load()
+        except sqlite3.Error as e:
+            print(f"加载SQLite数据库失败: {e}")
+            return self._create_new_database()
+        if df.empty:
+            return self._create_new_database()
+        return self._ensure_columns_exist(df)
+    
+    def _load_excel_database(self) -> pd.DataFrame:
+        """从 core_excel 加载数据库（优先命中侧车缓存，xlsx或列配置变化时自动重建缓存）"""
         if not os.path.exists(self.core_excel_path):
             # 创建新的数据库文件
             return self._create_new_database()
         
+        required_columns = self.update_utils._regenerate_columns_from_tags(self.config)
+        cached_df = self._read_sidecar_cache(required_columns)
+        if cached_df is not None:
+            return cached_df
+        
         try:
+            # 先记录文件签名再读取，若读取期间文件被修改，下次加载时签名不一致会重建缓存
+            signature = get_file_signature(self.core_excel_path, with_hash=True)
             # 尝试读取Excel文件
             df = pd.read_excel(self.core_excel_path, engine='openpyxl')
             
             # 确保所有必需的列都存在
-            return self._ensure_columns_exist(df)
+            df = self._ensure_columns_exist(df)
+            self._write_sidecar_cache(df, signature, required_columns)
+            return df
         except Exception as e:
             print(f"加载数据库失败: {e}")
             # 创建新的数据库文件
             return self._create_new_database()
     
+    def _get_sidecar_cache_paths(self) -> Tuple[str, str]:
+        """获取侧车缓存的数据文件和元信息文件路径"""
+        base_name = os.path.basename(self.core_excel_path)
+        data_path = os.path.join(self.cache_dir, f"{base_name}.pkl")
+        meta_path = os.path.join(self.cache_dir, f"{base_name}.meta.json")
+        return data_path, meta_path
+    
+    def _read_sidecar_cache(self, required_columns: List[str]) -> Optional[pd.DataFrame]:
+        """
+        读取侧车缓存，缓存失效时返回None
+        缓存键：xlsx 的 mtime、大小、内容哈希，以及 tag_config 生成的列顺序
+        """
+        data_path, meta_path = self._get_sidecar_cache_paths()
+        if not os.path.exists(data_path) or not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except Exception:
+            return None
+        
+        if meta.get('columns') != required_columns or meta.get('pandas_version') != pd.__version__:
+            return None
+        
+        signature = get_file_signature(self.core_excel_path)
+        if signature is None:
+            return None
+        if meta.get('mtime_ns') != signature['mtime_ns'] or meta.get('size') != signature['size']:
+            # mtime变化但内容可能未变（如git checkout），大小一致时再比较内容哈希
+            if meta.get('size') != signature['size']:
+                return None
+            try:
+                if compute_file_hash(self.core_excel_path) != meta.get('sha256'):
+                    return None
+            except Exception:
+                return None
+            meta.update(signature)
+            self._write_cache_meta(meta_path, meta)
+        
+        try:
+            return pd.read_pickle(data_path)
+        except Exception as e:
+            print(f"读取数据库缓存失败，将重新解析Excel: {e}")
+            return None
+    
+    def _write_sidecar_cache(self, df: pd.DataFrame, signature: Optional[Dict[str, Any]], required_columns: List[str]):
+        """写入侧车缓存（失败不影响正常加载）"""
+        if not signature:
+            return
+        data_path, meta_path = self._get_sidecar_cache_paths()
+        try:
+            ensure_directory(self.cache_dir)
+            tmp_path = f"{data_path}.tmp"
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, data_path)
+            meta = dict(signature)
+            meta['columns'] = required_columns
+            meta['pandas_version'] = pd.__version__
+            self._write_cache_meta(meta_path, meta)
+        except Exception as e:
+            print(f"写入数据库缓存失败: {e}")
+    
+    def _refresh_sidecar_cache(self, rows: Iterable[Iterable[Any]]):
+        """
+        保存 core_excel 后按写出的单元格值（首行为表头）重建侧车缓存，使保存后的首次加载也无需重新解析xlsx
+        无法保证与 pd.read_excel 结果一致的值（日期时间等）存在时不写缓存，下次加载时照常解析
+        """
+        try:
+            df = self._excel_values_to_frame(rows)
+            if df is None:
+                return
+            signature = get_file_signature(self.core_excel_path, with_hash=True)
+            required_columns = self.update_utils._regenerate_columns_from_tags(self.config)
+            self._write_sidecar_cache(self._ensure_columns_exist(df), signature, required_columns)
+        except Exception as e:
+            print(f"写入数据库缓存失败: {e}")
+    
+    @staticmethod
+    def _excel_values_to_frame(rows: Iterable[Iterable[Any]]) -> Optional[pd.DataFrame]:
+        """
+        以与 pd.read_excel(engine='openpyxl') 相同的规则将单元格值（首行为表头）转换为 DataFrame：
+        空单元格为 ""、整数值的数字转为 int、去除行尾与表尾的空单元格，再交由 TextParser 推断列类型
+        含日期时间值时返回 None
+        """
+        data = []
+        last_row_with_data = -1
+        for row_number, row in enumerate(rows):
+            converted_row = []
+            for value in row:
+                if value is None:
+                    value = ""
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    if value == value and int(value) == value:
+                        value = int(value)
+                    else:
+                        value = float(value)
+                elif isinstance(value, (datetime, date, time, timedelta)):
+                    return None
+                converted_row.append(value)
+            while converted_row and converted_row[-1] == "":
+                converted_row.pop()
+            if converted_row:
+                last_row_with_data = row_number
+            data.append(converted_row)
+        data = data[:last_row_with_data + 1]
+        if not data:
+            return None
+        max_width = max(len(data_row) for data_row in data)
+        data = [data_row + [""] * (max_width - len(data_row)) for data_row in data]
+        return TextParser(data, header=0, skip_blank_lines=False).read()
+    
+    def _write_cache_meta(self, meta_path: str, meta: Dict[str, Any]):
+        """原子写入缓存元信息"""
+        try:
+            tmp_path = f"{meta_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_path, meta_path)
+        except Exception as e:
+            print(f"写入数据库缓存元信息失败: {e}")
+    
     def _create_new_database(self) -> pd.DataFrame:
         """创建新的DataFrame结构（根据tag config的列）"""
         active_tags = self.config.get_active_tags()
@@ -89,36 +275,35 @@ class DatabaseManager:
         
         return df
     
+    @profiled('save_database')
     def save_database(self, df: pd.DataFrame, password: str = "") -> bool:
-        """保存DataFrame到Excel文件"""
+        """
+        保存DataFrame到数据库
+        excel 引擎：优先增量写入，仅修改变化的行；列结构变化时全量重写
+        sqlite 引擎：在单个事务中只写入新增/修改/删除的行（password 仅用于 export_excel 导出的表格）
+        """
         try:
             # 先根据 tag_config 规范 DataFrame 列与 category 值
             df = self.update_utils.normalize_dataframe_columns(df, self.config)
 
+            if self.storage_backend == 'sqlite':
+                return self._save_sqlite_database(df)
+
             # 备份原文件
             backup_file(self.core_excel_path, self.backup_dir)
             
-            # 保存到Excel
-            with pd.ExcelWriter(
-                self.core_excel_path,
-                engine='openpyxl'
-            ) as writer:
-                df.to_excel(writer, index=False, sheet_name='Papers')
-                
-                # 获取工作簿和工作表
-                workbook = writer.book
-                worksheet = writer.sheets['Papers']
-                
-                # 应用格式
-                self._apply_excel_formatting(workbook, worksheet, df)
-                
-                # 如果有密码，尝试设置保护（但openpyxl的写保护有限）
-                if password:
-                    try:
-                        worksheet.protection.set_password(password)
-                        worksheet.protection.sheet = True
-                    except:
-                        print("注意：无法设置Excel保护，文件将以未加密形式保存")
+            # 尝试增量写入
+            try:
+                if self._save_database_delta(df, password):
+                    print(f"数据库已增量保存到: {self.core_excel_path}")
+                    return True
+            except Exception as e:
+                print(f"增量保存数据库失败，改为全量写入: {e}")
+            
+            # 保存到Excel，并以写出的内容重建侧车缓存
+            rows = self._write_excel_file(df, self.core_excel_path, password)
+            to_cell = self.update_utils._to_excel_cell_value
+            self._refresh_sidecar_cache([list(df.columns)] + [[to_cell(v) for v in row] for row in rows])
             
             print(f"数据库已保存到: {self.core_excel_path}")
             return True
@@ -126,51 +311,207 @@ class DatabaseManager:
             print(f"保存数据库失败: {e}")
             return False
     
+    def _save_sqlite_database(self, df: pd.DataFrame) -> bool:
+        """
+        将 df（已规范列）与SQLite数据库比较，只把新增/修改/删除的行在单个事务中写入
+        内容未变化时不备份、不写入
+        """
+        changes = self.sqlite_storage.diff(df)
+        _, upserts, deletes = changes
+        if not upserts and not deletes:
+            print(f"数据库内容未变化: {self.core_sqlite_path}")
+            return True
+        if self.sqlite_storage.exists():
+            backup_file(self.core_sqlite_path, self.backup_dir)
+        self.sqlite_storage.apply_changes(changes)
+        print(f"数据库已保存到: {self.core_sqlite_path}（写入 {len(upserts)} 行，删除 {len(deletes)} 行）")
+        return True
     
+    @profiled('write_excel')
+    def _write_excel_file(self, df: pd.DataFrame, path: str, password: str = "") -> List[Tuple]:
+        """
+        全量写入格式化的Excel数据库文件：流式逐行写出（见 UpdateFileUtils.stream_excel_file），
+        冲突行的 DOI 带冲突标记，冲突/不规范高亮由工作表级条件格式实现（见 _add_highlight_rules）
+        返回写出的数据行（见 _render_excel_rows）
+        """
+        conflict_row_name = self.config.get_tag_field("conflict_marker", "table_name")
+        if conflict_row_name not in df.columns:
+            print(f"添加论文冲突格式时，发现数据库表格没有conflict_marker列")
+        columns = list(df.columns)
+        rows = self._render_excel_rows(df)
+        self.update_utils.stream_excel_file(path, df, rows=rows, password=password,
+                                            prepare_sheet=lambda ws: self._add_highlight_rules(ws, columns))
+        return rows
     
-    def _apply_excel_formatting(self, workbook, worksheet, df):
-        """对Excel应用列宽、表头格式等美化"""
- 
-        self.update_utils.apply_excel_formatting(workbook, worksheet, df)
+    @profiled('export_excel')
+    def export_excel(self, path: Optional[str] = None, password: Optional[str] = None) -> bool:
+        """
+        将当前数据库全量重新生成为格式化的Excel（默认写入 core_excel，覆盖前先备份）
+        sqlite 引擎下 core_excel 不随保存更新，需要供人工审阅时调用本方法导出
+        """
+        path = path or self.core_excel_path
+        try:
+            df = self.update_utils.normalize_dataframe_columns(self.load_database(), self.config)
+            if os.path.exists(path):
+                backup_file(path, self.backup_dir)
+            self._write_excel_file(df, path, self.get_password() if password is None else password)
+            print(f"数据库已导出到: {path}")
+            return True
+        except Exception as e:
+            print(f"导出Excel失败: {e}")
+            return False
+    
+    def _set_sheet_password(self, worksheet, password: str):
+        """设置工作表保护密码"""
+        try:
+            worksheet.protection.set_password(password)
+            worksheet.protection.sheet = True
+        except:
+            print("注意：无法设置Excel保护，文件将以未加密形式保存")
+    
+    @profiled('save_delta')
+    def _save_database_delta(self, df: pd.DataFrame, password: str = "") -> bool:
+        """
+        增量写入：将 df 与当前数据库内容逐行比较，只在现有工作簿中插入/删除/改写发生变化的行
+        返回 False 表示不适用增量写入（文件不存在、列结构变化、变更行过多等），由调用方全量重写
+        """
+        if not os.path.exists(self.core_excel_path):
+            return False
         
-        # 标记冲突行，同时对 invalid_fields 单元格上色
-        conflict_row_name = self.config.get_tag_field("conflict_marker", "table_name")
-        invalid_row_name = self.config.get_tag_field("invalid_fields", "table_name")  # 从config获取正确的表列名
+        # 当前数据库内容（命中侧车缓存时无需重新解析xlsx）
+        base_df = self._load_excel_database()
+        if list(base_df.columns) != list(df.columns):
+            return False
+        base_df = self.update_utils.normalize_dataframe_columns(base_df.copy(), self.config)
         
-        if conflict_row_name in df.columns:
-            # 颜色优先从配置中读取
-            conflict_color = self.settings.get('excel', {}).get('conflict_fill_color', 'FFCCCC')
-            conflict_fill = PatternFill(start_color=conflict_color, end_color=conflict_color, fill_type="solid")
-
-            # invalid_fields 列的单元格填充颜色
-            invalid_color = self.settings.get('excel', {}).get('invalid_fill_color', 'FF0000')
-            invalid_fill = PatternFill(start_color=invalid_color, end_color=invalid_color, fill_type="solid")
-
-            invalid_col_letter = None
-            if invalid_row_name and invalid_row_name in df.columns:
-                invalid_col_letter = get_column_letter(df.columns.get_loc(invalid_row_name) + 1)
+        old_rows = list(base_df.itertuples(index=False, name=None))
+        new_rows = self._render_excel_rows(df)
+        
+        matcher = difflib.SequenceMatcher(None, old_rows, new_rows, autojunk=False)
+        opcodes = [op for op in matcher.get_opcodes() if op[0] != 'equal']
+        changed_count = sum(max(i2 - i1, j2 - j1) for _, i1, i2, j1, j2 in opcodes)
+        # 变更行过多时，全量重写更划算
+        if changed_count > max(len(new_rows), len(old_rows)) * self.DELTA_SAVE_MAX_RATIO:
+            return False
+        
+        workbook = openpyxl.load_workbook(self.core_excel_path)
+        if 'Papers' not in workbook.sheetnames:
+            return False
+        worksheet = workbook['Papers']
+        header = [cell.value for cell in worksheet[1]]
+        if header != list(df.columns) or worksheet.max_row != len(old_rows) + 1:
+            return False
+        
+        # 逆序应用变更，保证前面区块的行号不受影响
+        for _, i1, i2, j1, j2 in reversed(opcodes):
+            overlap = min(i2 - i1, j2 - j1)
+            if i2 - i1 > overlap:
+                worksheet.delete_rows(i1 + overlap + 2, i2 - i1 - overlap)
+            if j2 - j1 > overlap:
+                worksheet.insert_rows(i1 + overlap + 2, j2 - j1 - overlap)
+            for k in range(j2 - j1):
+                excel_row = i1 + k + 2  # +2因为标题行是1，索引从0开始
+                self._write_excel_row(worksheet, excel_row, new_rows[j1 + k])
+        
+        if password:
+            self._set_sheet_password(worksheet, password)
+        
+        if opcodes or password:
+            # 高亮由条件格式根据冲突/不规范列的值自动生效，只需保证规则存在（兼容旧版逐单元格填充的工作簿）
+            self._add_highlight_rules(worksheet, list(df.columns))
+            workbook.save(self.core_excel_path)
+            # 以内存中的工作表重建侧车缓存（错误值单元格按 pd.read_excel 读作 NaN）
+            self._refresh_sidecar_cache([float('nan') if cell.data_type == 'e' else cell.value for cell in row]
+                                        for row in worksheet.iter_rows())
+        return True
+    
+    def _render_excel_rows(self, df: pd.DataFrame) -> List[Tuple]:
+        """
+        生成 df 写入Excel后的单元格值（冲突行的 DOI 带冲突标记），用于写出及与现有数据库逐行比较
+        DOI 前缀按列向量化计算，而非逐行判断
+        """
+        conflict_row_name = self.config.get_tag_field("conflict_marker", "table_name")
+        if 'doi' in df.columns and conflict_row_name in df.columns and len(df):
+            conflicts = df[conflict_row_name]
+            doi = df['doi']
+            doi_text = doi.astype(str)
+            needs_marker = (self._marked_mask(conflicts, include_zero=True) & doi.notna() & (doi_text != "")
+                            & ~doi_text.str.startswith(self.conflict_marker))
+            if needs_marker.any():
+                df = df.copy()
+                df['doi'] = doi.astype(object).where(~needs_marker, self.conflict_marker + " " + doi_text)
+        return list(df.itertuples(index=False, name=None))
+    
+    def _write_excel_row(self, worksheet, excel_row: int, values: Tuple):
+        """写入一行单元格值并应用数据单元格格式（文本格式、不自动换行、清除旧填充）"""
+        for col_idx, value in enumerate(values, start=1):
+            cell = worksheet.cell(row=excel_row, column=col_idx)
+            # 与 DataFrame.to_excel 一致：空字符串写为空单元格
+            cell.value = None if isinstance(value, str) and value == "" else value
+            cell.number_format = '@'
+            cell.alignment = Alignment(wrap_text=False)
+            cell.fill = PatternFill(fill_type=None)
+            # 列宽只增不减，最大不超过50
+            column_letter = get_column_letter(col_idx)
+            current_width = worksheet.column_dimensions[column_letter].width or 15
+            needed_width = min(len(str(value)) + 3, 50)
+            if needed_width > current_width:
+                worksheet.column_dimensions[column_letter].width = needed_width
+    
+    _EMPTY_MARK_VALUES = [False, None, "False", "FALSE", "false", "", "0"]
+    
+    def _is_marked(self, value, include_zero: bool = False) -> bool:
+        """判断冲突/无效标记列的值是否表示“已标记”"""
+        empty_values = list(self._EMPTY_MARK_VALUES)
+        if include_zero:
+            empty_values.append(0)
+        return value not in empty_values
+    
+    def _marked_mask(self, values: pd.Series, include_zero: bool = False) -> pd.Series:
+        """_is_marked 的向量化版本，返回各值是否表示“已标记”的布尔序列"""
+        empty_values = list(self._EMPTY_MARK_VALUES)
+        if include_zero:
+            empty_values.append(0)
+        return ~(values.isna() | values.astype(object).isin(empty_values))
+    
+    def _get_highlight_fills(self) -> Tuple[PatternFill, PatternFill]:
+        """获取冲突行与不规范单元格的填充样式（颜色优先从配置中读取）"""
+        conflict_color = self.settings.get('excel', {}).get('conflict_fill_color', 'FFCCCC')
+        conflict_fill = PatternFill(start_color=conflict_color, end_color=conflict_color, fill_type="solid")
+        invalid_color = self.settings.get('excel', {}).get('invalid_fill_color', 'FF0000')
+        invalid_fill = PatternFill(start_color=invalid_color, end_color=invalid_color, fill_type="solid")
+        return conflict_fill, invalid_fill
+    
+    def _add_highlight_rules(self, worksheet, columns: List[str]):
+        """
+        以工作表级条件格式标注冲突行与不规范单元格（替换工作表上已有的条件格式），规则数量与行数无关：
+        - invalid_fields 列（逗号分隔的列索引，从0起）所列的单元格填充不规范色，优先于冲突色
+        - conflict_marker 列为“已标记”值的行整行填充冲突色
+        “已标记”与 _is_marked 一致：空值、False、"0" 视为未标记
+        """
+        worksheet.conditional_formatting = ConditionalFormattingList()
+        if not columns:
+            return
+        conflict_fill, invalid_fill = self._get_highlight_fills()
+        data_range = f"A2:{get_column_letter(len(columns))}{self.HIGHLIGHT_MAX_ROW}"
 
-            for idx, row in df.iterrows():
-                if row.get(conflict_row_name) not in [False, 0, None, "False", "FALSE", "false", "", "0"]:
-                    for cell in worksheet[idx + 2]:  # +2因为标题行是1，索引从0开始
-                        cell.fill = conflict_fill
-                        # 如果列名是doi，就在该cell内容前加冲突标记
-                        if cell.value and cell.column_letter == get_column_letter(df.columns.get_loc('doi') + 1) \
-                                and cell.value.startswith(self.conflict_marker) == False:
-                            cell.value = f"{self.conflict_marker} {cell.value}"
+        def marked(column_name: str) -> str:
+            text = f'${get_column_letter(columns.index(column_name) + 1)}2&""'
+            return f'{text}<>"",{text}<>"0",UPPER({text})<>"FALSE"', text
 
-                # 对 invalid_fields指定的列单独着色（如果存在并且有内容）
-                if row.get(invalid_row_name) not in [False,None, "False", "FALSE", "false", "", "0"]:
-                    inval_value = row.get(invalid_row_name)
-                    split_result = re.split(r'[,，]', inval_value)
-                    invalid_fields = [int(item.strip()) for item in split_result if item.strip()]
-                    
-                    for field in invalid_fields:
-                        worksheet[idx+2][field].fill = invalid_fill 
-        else:
-            print(f"添加论文冲突格式时，发现数据库表格没有conflict_marker列")
+        invalid_row_name = self.config.get_tag_field("invalid_fields", "table_name")
+        if invalid_row_name in columns:
+            condition, text = marked(invalid_row_name)
+            # 单元格所在列索引（从0起）是否出现在规范化后的 ",i,j," 列表中
+            in_list = f'ISNUMBER(SEARCH(","&(COLUMN()-1)&",",","&SUBSTITUTE(SUBSTITUTE({text},"，",",")," ","")&","))'
+            worksheet.conditional_formatting.add(
+                data_range, FormulaRule(formula=[f"AND({condition},{in_list})"], fill=invalid_fill))
 
-                        
+        conflict_row_name = self.config.get_tag_field("conflict_marker", "table_name")
+        if conflict_row_name in columns:
+            condition, _ = marked(conflict_row_name)
+            worksheet.conditional_formatting.add(
+                data_range, FormulaRule(formula=[f"AND({condition})"], fill=conflict_fill))
     
     def get_password(self) -> str:
         """获取Excel密码"""
@@ -195,6 +536,7 @@ class DatabaseManager:
     
     
     #唯一对外接口
+    @profiled('add_papers')
     def add_papers(self, new_papers: List[Paper], conflict_resolution: str = 'mark') -> Tuple[List[Paper], List[Paper],List[str] ]:
         """
         添加新论文到数据库，同时验证冲突
@@ -211,23 +553,23 @@ class DatabaseManager:
         old_papers = self.update_utils.excel_to_paper(df, only_non_system=False, skip_invalid=False)
 
         # 统一验证所有已写入数据库的论文条目（用于提醒用户修正不规范条目）
+        # 内容与配置均未变化的论文复用验证缓存结果，跳过重复验证
         invalid_msg = []
         invalid_count = 0
-        for p in old_papers:
-            try:
-                valid, errors, _ = p.validate_paper_fields(self.config, check_required=True, check_non_empty=True)
-                if not valid or getattr(p, 'invalid_fields', ""):
-                    invalid_count += 1
-                    invalid_msg_str = f"论文 '{p.title[:50]}' ，invalid_fields={p.invalid_fields}，错误示例: {errors[:3]}"
-                    #print(invalid_msg_str)
-                    invalid_msg.append(invalid_msg_str)
-            except Exception as e:
-                print(f"验证已存在论文时出错: {e}")
+        with profile_span('validate_database'):
+            results = validate_papers_fields(old_papers, self.config, check_required=True, check_non_empty=True,
+                                             cache=self.update_utils.get_validation_cache())
+        for p, (valid, errors, _) in zip(old_papers, results):
+            if not valid or getattr(p, 'invalid_fields', ""):
+                invalid_count += 1
+                invalid_msg_str = f"论文 '{p.title[:50]}' ，invalid_fields={p.invalid_fields}，错误示例: {errors[:3]}"
+                #print(invalid_msg_str)
+                invalid_msg.append(invalid_msg_str)
         # if invalid_count:
         #     print(f"⚠ 注意：数据库中共有 {invalid_count} 条论文包含不规范字段，所在单元格已标红，请手动修正（不影当前续添加/保存操作）。")
 
-        # non_conflict_papers存储结构: [(主论文, [冲突论文1, 冲突论文2, ...]), ...]
-        non_conflict_papers: List[Tuple[Paper, List[Paper]]] = []    
+        # store 以哈希索引维护冲突组结构: 主论文 -> [冲突论文1, 冲突论文2, ...]
+        store = PaperStore()
         conflict_papers: List[Paper] = []
         added_papers = []
         old_conflict_papers = []
@@ -235,43 +577,39 @@ class DatabaseManager:
         # 分离现有论文中的正常论文和冲突论文
         for p in old_papers:
             if not p.conflict_marker:
-                non_conflict_papers.append((p, []))
+                store.add(p)
             else:
                 old_conflict_papers.append(p)
         
         # 还原原有的冲突结构
         for old_conflict in old_conflict_papers:
-            conflict_found = False
-            for i, (main_paper, conflict_list) in enumerate(non_conflict_papers):
-                if is_same_identity(old_conflict, main_paper):
-                    conflict_list.append(old_conflict)
-                    conflict_found = True
-                    break
-            
-            if not conflict_found:
+            main_ids = store.match(old_conflict, mains_only=True)
+            if main_ids:
+                store.add(old_conflict, main_id=main_ids[0])
+            else:
                 # 如果没有找到对应的主论文，将这个冲突论文作为一个新的主论文
                 print(f"警告：数据库原有冲突论文 {old_conflict.title[:50]}... 没有找到对应主论文，将其作为新论文添加")
-                non_conflict_papers.append((old_conflict, []))
                 old_conflict.conflict_marker = False  # 清除冲突标记
+                store.add(old_conflict)
         
+        # 近似重复标题索引（键为 store 中主论文的 entry_id，随主论文的增删/替换同步更新），
+        # 用于提示身份未精确匹配的疑似重复论文
+        title_index = TitleIndex(self.near_duplicate_threshold)
+        for main_id in store.main_ids():
+            title_index.add(main_id, store.get(main_id).title)
+        self.near_duplicate_msg = []
+
         # 处理新论文
         for new_paper in new_papers:
-            # 检查是否已存在
-            same_identity_indices = []
-            main_paper_idx = -1
+            # 找出所有同identity论文（按主论文加入顺序）
+            same_identity_ids = store.match(new_paper, mains_only=True)
+            main_paper_id = next((i for i in same_identity_ids if not store.get(i).conflict_marker), None)
             
-            # 找出所有同identity论文
-            for idx, (main_paper, conflict_list) in enumerate(non_conflict_papers):
-                if is_same_identity(new_paper, main_paper):
-                    same_identity_indices.append(idx)
-                    if not main_paper.conflict_marker and main_paper_idx == -1:
-                        main_paper_idx = idx
-            
-            if same_identity_indices:
+            if same_identity_ids:
                 # 检查是否为"完全重复提交" - 需要包括主论文和所有冲突论文
                 all_same_papers = []
-                for idx in same_identity_indices:
-                    main_paper, conflict_list = non_conflict_papers[idx]
+                for main_id in same_identity_ids:
+                    main_paper, conflict_list = store.get_group(main_id)
                     all_same_papers.append(main_paper)
                     all_same_papers.extend(conflict_list)
                 
@@ -286,45 +624,52 @@ class DatabaseManager:
                     continue
                 
                 elif conflict_resolution == 'replace':
-                    # 完全替换：删除所有同身份论文，添加新论文
-                    # 从后往前删除，避免索引错乱
-                    for idx in sorted(same_identity_indices, reverse=True):
-                        del non_conflict_papers[idx]
+                    # 完全替换：删除所有同身份论文（含其冲突论文），添加新论文
+                    for main_id in same_identity_ids:
+                        store.remove(main_id)
+                        title_index.remove(main_id)
                     
-                    non_conflict_papers.append((new_paper, []))
+                    new_id = store.add(new_paper)
+                    title_index.add(new_id, new_paper.title)
                     added_papers.append(new_paper)
                     print(f"论文: {new_paper.title}——在'{conflict_field}'字段与原有论文存在冲突，替换原有论文")
                 
                 elif conflict_resolution == 'mark':
                     new_paper.conflict_marker = True
                     
-                    if main_paper_idx != -1:
+                    if main_paper_id is not None:
                         # 添加到对应主论文的冲突列表中
-                        non_conflict_papers[main_paper_idx][1].append(new_paper)
+                        store.add(new_paper, main_id=main_paper_id)
                         conflict_papers.append(new_paper)
                         print(f"论文: {new_paper.title}——在'{conflict_field}'字段与原有论文存在冲突，已标记并作为冲突论文添加")
                     else:
                         # 所有同身份论文都有冲突标记，这是一个特殊情况
                         # 将第一篇作为主论文，并添加冲突
-                        first_idx = same_identity_indices[0]
-                        main_paper = non_conflict_papers[first_idx][0]
-                        conflict_list = non_conflict_papers[first_idx][1]
+                        first_id = same_identity_ids[0]
                         
                         # 清除第一篇的冲突标记，使其成为主论文
-                        main_paper.conflict_marker = False
-                        conflict_list.append(new_paper)
+                        store.get(first_id).conflict_marker = False
+                        store.add(new_paper, main_id=first_id)
                         conflict_papers.append(new_paper)
                         print(f"警告：论文 {new_paper.title[:50]}... 的所有同身份论文都有冲突标记，将第一篇清除标记并作为主论文")
             else:
-                # 新论文，添加到列表
-                non_conflict_papers.append((new_paper, []))
+                # 新论文，添加到列表；标题与已有论文高度相似时提示疑似重复（仍正常添加）
+                similar = title_index.find_similar(new_paper.title)
+                if similar:
+                    key, score = similar[0]
+                    msg = (f"论文 '{new_paper.title[:50]}' 与已有论文 '{store.get(key).title[:50]}' "
+                           f"标题相似度 {score:.2f}，疑似重复，请人工确认")
+                    print(f"⚠ {msg}")
+                    self.near_duplicate_msg.append(msg)
+                new_id = store.add(new_paper)
+                title_index.add(new_id, new_paper.title)
                 added_papers.append(new_paper)
                 print(f"论文: {new_paper.title}——作为新论文添加")
         
         # 排序
         # 按category分组
         category_groups = {}
-        for main_paper, conflict_list in non_conflict_papers:
+        for main_paper, conflict_list in store.groups():
             if main_paper.category not in category_groups:
                 category_groups[main_paper.category] = []
             category_groups[main_paper.category].append((main_paper, conflict_list))
@@ -361,28 +706,12 @@ class DatabaseManager:
         """更新单篇论文"""
         df = self.load_database()
         papers = self.update_utils.excel_to_paper(df,only_non_system=False, skip_invalid=False)
-        success = False
-
-        updated_papers=[]
-        # 查找论文
-        target_papers = [p for p in papers if is_same_identity(p, paper)]
+        store = PaperStore(papers)
 
-        for paper in papers:
-            if paper in target_papers:
-                if success == False:
-                    success = True
-                    # 应用更新
-                    for key, value in updates.items():
-                        if hasattr(paper, key):
-                                setattr(paper, key, value)
-                    updated_papers.append(paper)
-                else:
-                    continue # 只更新第一篇找到的，其他的过滤掉
-            else:
-                updated_papers.append(paper)
+        self._apply_update_to_store(store, paper, updates)
                 
         # 保存更新
-        df = self.update_utils.paper_to_excel(updated_papers,only_non_system=False, skip_invalid=False) 
+        df = self.update_utils.paper_to_excel(store.papers(),only_non_system=False, skip_invalid=False) 
         password = self.get_password()
         return self.save_database(df, password)
         
@@ -391,14 +720,97 @@ class DatabaseManager:
         """删除单篇论文"""
         df = self.load_database()
         papers = self.update_utils.excel_to_paper(df,only_non_system=False, skip_invalid=False)
+        store = PaperStore(papers)
         
-        # 过滤掉要删除的论文
-        filtered_papers = [p for p in papers if not is_same_identity(p, paper)]
-
-        if len(filtered_papers) < len(papers):
+        if self._apply_delete_to_store(store, paper):
             # 有论文被删除
-            df = self.update_utils.paper_to_excel(filtered_papers,only_non_system=False)
+            df = self.update_utils.paper_to_excel(store.papers(),only_non_system=False)
             password = self.get_password()
             return self.save_database(df, password)
         
-        return False
\ No newline at end of file
+        return False
+
+    def update_papers(self, updates: List[Tuple[Paper, Dict[str, Any]]]) -> Tuple[bool, List[Dict[str, Any]]]:
+        """批量更新论文，见 apply_batch"""
+        return self.apply_batch([('update', paper, fields) for paper, fields in updates])
+
+    def delete_papers(self, papers: List[Paper]) -> Tuple[bool, List[Dict[str, Any]]]:
+        """批量删除论文，见 apply_batch"""
+        return self.apply_batch([('delete', paper, None) for paper in papers])
+
+    def apply_batch(self, operations: List[Tuple[str, Paper, Optional[Dict[str, Any]]]]) -> Tuple[bool, List[Dict[str, Any]]]:
+        """
+        批量执行更新/删除操作：只加载一次数据库，在同一内存快照上按顺序应用全部操作，
+        最后只备份、保存一次
+        
+        参数:
+            operations: 操作列表，每项为 (action, paper, updates)
+                action 为 'update' 或 'delete'；delete 时 updates 可为 None
+        
+        返回:
+            Tuple[是否已保存, 逐项结果列表]
+            逐项结果为 {'action', 'paper', 'success', 'message'}，顺序与 operations 一致；
+            没有任何操作生效时不写入数据库，是否已保存为 False
+        """
+        df = self.load_database()
+        papers = self.update_utils.excel_to_paper(df, only_non_system=False, skip_invalid=False)
+        store = PaperStore(papers)
+
+        results: List[Dict[str, Any]] = []
+        changed = False
+        for action, paper, updates in operations:
+            result = {'action': action, 'paper': paper, 'success': False, 'message': ""}
+            try:
+                if action == 'update':
+                    found = self._apply_update_to_store(store, paper, updates or {})
+                elif action == 'delete':
+                    found = self._apply_delete_to_store(store, paper)
+                else:
+                    result['message'] = f"未知操作: {action}"
+                    results.append(result)
+                    continue
+                if found:
+                    result['success'] = True
+                    changed = True
+                else:
+                    result['message'] = "数据库中未找到该论文"
+            except Exception as e:
+                result['message'] = f"操作失败: {e}"
+            results.append(result)
+
+        if not changed:
+            return False, results
+
+        df = self.update_utils.paper_to_excel(store.papers(), only_non_system=False, skip_invalid=False)
+        password = self.get_password()
+        saved = self.save_database(df, password)
+        if not saved:
+            # 保存失败时整批均未生效
+            for result in results:
+                if result['success']:
+                    result['success'] = False
+                    result['message'] = "保存数据库失败"
+        return saved, results
+
+    def _apply_update_to_store(self, store: PaperStore, paper: Paper, updates: Dict[str, Any]) -> bool:
+        """在内存索引上更新论文：只更新第一篇找到的，其他同身份条目过滤掉；返回是否找到"""
+        target_ids = store.match(paper)
+        if not target_ids:
+            return False
+        target = store.get(target_ids[0])
+        # 应用更新
+        for key, value in updates.items():
+            if hasattr(target, key):
+                setattr(target, key, value)
+        for entry_id in target_ids[1:]:
+            store.remove(entry_id)
+        # DOI/title 可能被修改，刷新索引以便同批次后续操作能按新身份查找
+        store.reindex(target_ids[0])
+        return True
+
+    def _apply_delete_to_store(self, store: PaperStore, paper: Paper) -> bool:
+        """在内存索引上删除所有同身份条目；返回是否有论文被删除"""
+        target_ids = store.match(paper)
+        for entry_id in target_ids:
+            store.remove(entry_id)
+        return bool(target_ids)
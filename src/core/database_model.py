@@ -14,6 +14,7 @@ import os
 import re
 
 from src.core.config_loader import get_config_instance
+from src.core.validation_plan import get_validation_plan
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
@@ -121,7 +122,8 @@ class Paper:
         check_required: bool = True,
         check_non_empty: bool = True,
         variable: str = None,
-        no_normalize: bool = False
+        no_normalize: bool = False,
+        column_errors=None
     ) -> Tuple[bool, List[str], List[str]]:
         """
         统一的论文字段验证函数
@@ -133,295 +135,21 @@ class Paper:
             check_non_empty: 是否检查非空字段（包括类型验证和validation字段验证）
             variable: 指定只验证该字段（变量名）。若为None，则验证所有字段。
             no_normalize: 若为True，则仅进行验证，不更新对象的属性值（不规范化）。
+            column_errors: 可选的按列检查结果（ValidationPlan.check_frame 中该论文所在行），提供时复用其中已检查字段的结果
         
         返回:
             (是否有效, 错误信息列表, 验证未通过的字段变量名列表)
         """
-        errors = []
-        invalid_vars = set()
-        
-        # 获取配置
-        conflict_marker = config_instance.settings['database'].get('conflict_marker')
-        required_tags = config_instance.get_required_tags() if check_required else []
-        active_tags = config_instance.get_active_tags()
-        
-        # 0. 辅助函数：判断是否需要验证当前字段
-        def should_check(var_name):
-            if variable is not None and variable != var_name:
-                return False
-            return True
-
-        # 规范化 category 字段：支持多分类（用 ; 或 中文； 分隔），去重并限制最大数量
-        # 注意：如果 no_normalize=True，我们不应该修改 self.category，
-        # 但验证逻辑可能依赖规范化后的形式（例如查重），这里为了验证逻辑统一，
-        # 若 no_normalize=True，使用临时变量进行检查。
-        
-        temp_category = getattr(self, 'category', "")
-        
-        if should_check('category'):
-            try:
-                raw_cat = str(temp_category) if temp_category else ""
-                # 使用 update_file_utils 的方法进行统一规范化（若可用）
-                normalized_cat = raw_cat
-                try:
-                    from src.core.update_file_utils import UpdateFileUtils
-                    ufu = UpdateFileUtils()
-                    normalized_cat = ufu.normalize_category_value(raw_cat, config_instance)
-                except Exception:
-                    # 回退实现
-                    parts = [p.strip() for p in re.split(r'[;；]', raw_cat) if p.strip()]
-                    seen = set()
-                    out = []
-                    try:
-                        max_allowed = int(config_instance.settings['database'].get('max_categories_per_paper', 4))
-                    except Exception:
-                        max_allowed = 4
-                    for part in parts:
-                        cat = config_instance.get_category_by_name_or_unique_name(part)
-                        uname = cat.get('unique_name') if cat else part
-                        if uname not in seen:
-                            seen.add(uname)
-                            out.append(uname)
-                        if len(out) >= max_allowed:
-                            break
-                    normalized_cat = ";".join(out)
-                
-                # 如果不是纯验证模式，回写
-                if not no_normalize:
-                    self.category = normalized_cat
-                else:
-                    # 验证模式下使用规范化后的值进行后续检查（如重复检查）
-                    temp_category = normalized_cat
-            except Exception:
-                pass
-        
-        # 1. 特殊字段验证
-        
-        # 验证 invalid_fields 字段格式
-        if should_check('invalid_fields'):
-            if self.invalid_fields:
-                invalid_fields_valid, invalid_fields_error = validate_invalid_fields(self.invalid_fields)
-                if not invalid_fields_valid:
-                    errors.append(f"invalid_fields 字段格式无效: {invalid_fields_error}")
-                    invalid_vars.add('invalid_fields')
-        
-        # DOI验证
-        if should_check('doi'):
-            if self.doi:
-                doi_valid, cleaned_doi = validate_doi(self.doi, check_format=True, conflict_marker=conflict_marker)
-                if not doi_valid and check_non_empty:
-                    errors.append(f"DOI格式无效: {self.doi}")
-                    invalid_vars.add('doi')
-                # 即使 check_format 失败，validate_doi 也会返回尝试 clean 后的值
-                # 只有当 no_normalize=False 时才写回
-                if not no_normalize: 
-                     self.doi = cleaned_doi
-
-        # 作者验证
-        if should_check('authors'):
-            if self.authors:
-                authors_valid, formatted_authors = validate_authors(self.authors)
-                if not authors_valid and check_non_empty:
-                    errors.append(f"作者格式无效")
-                    invalid_vars.add('authors')
-                elif not no_normalize:
-                    self.authors = formatted_authors
-        
-        # Pipeline图片验证
-        if should_check('pipeline_image'):
-            if self.pipeline_image:
-                figure_dir = config_instance.settings['paths'].get('figure_dir', 'figures')
-                pipeline_valid, normalized_path = validate_pipeline_image(self.pipeline_image, figure_dir)
-                if not pipeline_valid and check_non_empty:
-                    errors.append(f"Pipeline图片格式无效: {self.pipeline_image}")
-                    invalid_vars.add('pipeline_image')
-                elif pipeline_valid:
-                    if not no_normalize:
-                        self.pipeline_image = normalized_path
-        # 验证 paper_file
-        if should_check('paper_file'):
-            if self.paper_file:
-                paper_dir = config_instance.settings['paths'].get('paper_dir', 'assets/papers/')
-                # 复用 image 的路径规范化逻辑 (因为逻辑是一样的：相对路径 check)
-                is_valid, normalized_path = validate_pipeline_image(self.paper_file, paper_dir) 
-                # 注意：validate_pipeline_image 会检查图片后缀，这里我们需要忽略后缀检查或者使用通用路径检查
-                # 这里暂时简单检查是否在目录下
-                from src.utils import normalize_figure_path
-                normalized = normalize_figure_path(self.paper_file, paper_dir)
-                # 简单验证：必须是相对路径且在目录下
-                if ".." in normalized or normalized.startswith("/"): # Basic check
-                     pass # 实际上 normalize_figure_path 已经处理了大部分
-                
-                if not no_normalize:
-                    self.paper_file = normalized
-        
-        # URL验证
-        if should_check('paper_url'):
-            if self.paper_url and not validate_url(self.paper_url) and check_non_empty:
-                errors.append(f"论文链接格式无效: {self.paper_url}")
-                invalid_vars.add('paper_url')
-        
-        if should_check('project_url'):
-            if self.project_url and not validate_url(self.project_url) and check_non_empty:
-                errors.append(f"项目链接格式无效: {self.project_url}")
-                invalid_vars.add('project_url')
-        
-        # 日期验证
-        if should_check('date'):
-            if self.date:
-                date_valid, formatted_date = validate_date(self.date)
-                if not date_valid and check_non_empty:
-                    errors.append(f"日期格式无效: {self.date} (应为 YYYY-MM-DD)")
-                    invalid_vars.add('date')
-                elif not no_normalize:
-                    self.date = formatted_date
-                
-        # 2. 必填字段检查
-        if check_required:
-            for tag in required_tags:
-                var_name = tag['variable']
-                if not should_check(var_name):
-                    continue
-                    
-                display_name = tag.get('display_name', var_name)
-                # 使用 self 中的值 (注意 category 可能在 temp_category 中)
-                value = temp_category if var_name == 'category' and no_normalize else getattr(self, var_name, "")
-                
-                # 在验证前忽略 conflict_marker
-                try:
-                    if isinstance(value, str) and conflict_marker:
-                        value = value.replace(conflict_marker, '').strip()
-                except Exception:
-                    pass
-
-                if not value or str(value).strip() == "":
-                    errors.append(f"必填字段为空: {display_name} ({var_name})")
-                    invalid_vars.add(var_name)
-        
-        # 3. 非空字段检查（类型验证和validation字段验证）
-        if check_non_empty:
-            for tag in active_tags:
-                var_name = tag['variable']
-                if not should_check(var_name):
-                    continue
-                    
-                display_name = tag.get('display_name', var_name)
-                tag_type = tag.get('type', 'string')
-                validation_pattern = tag.get('validation')
-                
-                value = temp_category if var_name == 'category' and no_normalize else getattr(self, var_name, "")
-                
-                # 跳过空值（除非是必填字段，已经在上面检查过了）
-                try:
-                    if isinstance(value, str) and conflict_marker:
-                        value = value.replace(conflict_marker, '').strip()
-                except Exception:
-                    pass
-
-                if not value or str(value).strip() == "":
-                    continue
-                
-                # 类型验证
-                if tag_type == 'bool':
-                    if str(value).lower() not in ['true', 'false', 'yes', 'no', '1', '0', 'y', 'n']:
-                        errors.append(f"字段类型不匹配: {display_name} 应为布尔值")
-                        invalid_vars.add(var_name)
-                elif (str(tag_type).startswith('enum')) and var_name == 'category':
-                    # 支持多分类，先按 ';' 分割
-                    val_str = str(value)
-                    try:
-                        parts = [p.strip() for p in re.split(r'[;；]', val_str) if p.strip()]
-                    except Exception:
-                        parts = [val_str.strip()]
-
-                    valid_categories = {cat['unique_name'] for cat in config_instance.get_active_categories()}
-
-                    # 检查重复（原始输入是否包含重复项）
-                    if len(parts) != len(list(dict.fromkeys(parts))):
-                        errors.append(f"分类包含重复项: {value}")
-                        invalid_vars.add(var_name)
-
-                    # 检查每一项是否合法
-                    for p in parts:
-                        if p not in valid_categories:
-                            errors.append(f"分类无效: {p}，分类须为categories_config.py中已启用的分类")
-                            invalid_vars.add(var_name)
-
-                    # 检查数量不超过配置限制
-                    try:
-                        max_allowed = int(config_instance.settings['database'].get('max_categories_per_paper', 4))
-                    except Exception:
-                        max_allowed = 4
-                    if len(parts) > max_allowed:
-                        errors.append(f"分类数量超过限制: 最多允许 {max_allowed} 个分类")
-                        invalid_vars.add(var_name)
-                elif tag_type == 'int':
-                    try:
-                        int(value)
-                    except ValueError:
-                        errors.append(f"字段类型不匹配: {display_name} 应为整数")
-                        invalid_vars.add(var_name)
-                elif tag_type == 'float':
-                    try:
-                        float(value)
-                    except ValueError:
-                        errors.append(f"字段类型不匹配: {display_name} 应为浮点数")
-                        invalid_vars.add(var_name)
-                
-                # validation字段验证（正则表达式）
-                if validation_pattern:
-                    try:
-                        if not re.match(validation_pattern, str(value)):
-                            errors.append(f"字段格式无效: {display_name} 不符合验证规则")
-                            invalid_vars.add(var_name)
-                    except re.error:
-                        # 如果正则表达式有问题，跳过验证
-                        pass
-
-        # 处理 invalid_fields 字段更新
-        # 仅当 no_normalize=False (即允许更新对象状态) 时，才更新 self.invalid_fields
-        if not no_normalize:
-            # 准备映射：变量名 -> Order
-            var_to_order = {}
-            for tag in active_tags:
-                var = tag.get('variable')
-                order = tag.get('order')
-                if var is not None and order is not None:
-                    var_to_order[var] = str(order)
-
-            # 解析当前的 invalid_fields
-            current_invalid_orders = set()
-            if self.invalid_fields:
-                parts = str(self.invalid_fields).split(',')
-                for p in parts:
-                    if p.strip():
-                        current_invalid_orders.add(p.strip())
-
-            if variable is None:
-                # 全量验证模式：重置 invalid_fields 为当前 invalid_vars 对应的 order
-                orders = []
-                for v in sorted(invalid_vars):
-                    if v in var_to_order:
-                        orders.append(var_to_order[v])
-                self.invalid_fields = ",".join(orders)
-            else:
-                # 单字段验证模式：更新当前字段的状态
-                target_order = var_to_order.get(variable)
-                if target_order:
-                    if variable in invalid_vars:
-                        # 验证失败，添加 order
-                        current_invalid_orders.add(target_order)
-                    else:
-                        # 验证通过，移除 order
-                        if target_order in current_invalid_orders:
-                            current_invalid_orders.remove(target_order)
-                    
-                    # 重新生成字符串，保持排序以便一致性
-                    # 将字符串转int排序再转回str
-                    sorted_orders = sorted(current_invalid_orders, key=lambda x: int(x) if x.isdigit() else 0)
-                    self.invalid_fields = ",".join(sorted_orders)
-
-        return (len(errors) == 0, errors, list(invalid_vars))
+        # 按配置版本编译的验证计划（预编译正则、分类集合、字段 order 映射等），配置不变时复用
+        plan = get_validation_plan(config_instance)
+        return plan.validate(
+            self,
+            check_required=check_required,
+            check_non_empty=check_non_empty,
+            variable=variable,
+            no_normalize=no_normalize,
+            column_errors=column_errors
+        )
         
     
     # 检查时，注意看看和这个函数有没有必要存在
@@ -442,6 +170,57 @@ class Paper:
         return errors
 
 
+def validate_papers_fields(
+    papers: List[Paper],
+    config_instance,
+    check_required: bool = True,
+    check_non_empty: bool = True,
+    cache=None,
+    column_errors=None,
+) -> List[Tuple[Optional[bool], List[str], List[str]]]:
+    """
+    批量验证论文字段（全量验证模式，会规范化并更新各论文的 invalid_fields）
+    
+    参数:
+        cache: 可选的 ValidationCache；内容与配置均未变化的论文直接复用缓存结果，跳过验证
+        column_errors: 可选的按列检查结果列表（ValidationPlan.check_frame），与 papers 一一对应
+    
+    返回:
+        与 papers 顺序一致的 (是否有效, 错误信息列表, 验证未通过的字段变量名列表) 列表；
+        单篇验证抛出异常时记为 (None, ["验证失败: 异常信息"], [])，调用方可据此区分验证异常与验证未通过
+    """
+    if cache is not None:
+        cache.sync_config()
+
+    results = []
+    for i, paper in enumerate(papers):
+        try:
+            key = None
+            if cache is not None:
+                key = cache.make_key(paper, check_required, check_non_empty)
+                entry = cache.get(key)
+                if entry is not None:
+                    results.append(cache.apply(entry, paper))
+                    continue
+                before = asdict(paper)
+
+            result = paper.validate_paper_fields(
+                config_instance,
+                check_required=check_required,
+                check_non_empty=check_non_empty,
+                column_errors=column_errors[i] if column_errors is not None else None
+            )
+            if key is not None:
+                cache.put(key, before, paper, result)
+            results.append(result)
+        except Exception as e:
+            results.append((None, [f"验证失败: {e}"], []))
+
+    if cache is not None:
+        cache.save()
+    return results
+
+
 # Paper对象间级方法
 def is_same_identity(a: Union[Paper, Dict[str, Any]], b: Union[Paper, Dict[str, Any]]) -> bool:
     """
@@ -0,0 +1,140 @@
+"""
+论文内存索引
+按规范化DOI与小写标题建立哈希索引，并维护冲突组（主论文 -> 冲突论文）关系，
+使入库、更新、删除时的身份查找为 O(1)，替代逐条 is_same_identity 线性扫描
+该脚本不应使用任何非基础第三方包，以供submit_gui调用
+"""
+from typing import Dict, List, Optional, Tuple
+
+from src.core.database_model import Paper
+
+
+class PaperStore:
+    """论文内存索引"""
+
+    def __init__(self, papers: Optional[List[Paper]] = None):
+        # 条目按插入顺序保存：entry_id -> Paper（entry_id 单调递增，因此顺序即插入顺序）
+        self._entries: Dict[int, Paper] = {}
+        # 条目身份键缓存：entry_id -> (doi, title)，与 Paper.get_key 一致
+        self._keys: Dict[int, Tuple[str, str]] = {}
+        # 哈希索引：规范化键 -> entry_id 列表
+        self._doi_index: Dict[str, List[int]] = {}
+        self._title_index: Dict[str, List[int]] = {}
+        # 冲突组：主论文 entry_id -> 冲突论文 entry_id 列表；冲突论文 entry_id -> 主论文 entry_id
+        self._conflicts: Dict[int, List[int]] = {}
+        self._main_of: Dict[int, int] = {}
+        self._next_id = 0
+
+        for paper in papers or []:
+            self.add(paper)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ========== 写操作 ==========
+
+    def add(self, paper: Paper, main_id: Optional[int] = None) -> int:
+        """
+        添加论文条目
+        main_id 为 None 时作为主论文（独立条目）加入；否则作为 main_id 对应主论文的冲突论文加入
+        返回新条目的 entry_id
+        """
+        entry_id = self._next_id
+        self._next_id += 1
+
+        self._entries[entry_id] = paper
+        self._index_entry(entry_id)
+
+        if main_id is None:
+            self._conflicts[entry_id] = []
+        else:
+            if main_id not in self._conflicts:
+                raise KeyError(f"主论文条目不存在: {main_id}")
+            self._conflicts[main_id].append(entry_id)
+            self._main_of[entry_id] = main_id
+        return entry_id
+
+    def remove(self, entry_id: int):
+        """移除单个条目；若为主论文，其冲突论文一并移除"""
+        if entry_id not in self._entries:
+            return
+        for conflict_id in self._conflicts.pop(entry_id, []):
+            self._main_of.pop(conflict_id, None)
+            self._drop_entry(conflict_id)
+
+        main_id = self._main_of.pop(entry_id, None)
+        if main_id is not None and main_id in self._conflicts:
+            self._conflicts[main_id].remove(entry_id)
+        self._drop_entry(entry_id)
+
+    def reindex(self, entry_id: int):
+        """条目的 DOI/title 被修改后，按新身份键重建该条目的索引"""
+        self._unindex_entry(entry_id)
+        self._index_entry(entry_id)
+
+    def _drop_entry(self, entry_id: int):
+        """从条目表与索引中删除条目"""
+        self._unindex_entry(entry_id)
+        self._entries.pop(entry_id, None)
+
+    def _index_entry(self, entry_id: int):
+        """按条目当前身份键写入哈希索引"""
+        key = self._entries[entry_id].get_key()
+        self._keys[entry_id] = key
+        doi, title = key
+        for index, k in ((self._doi_index, doi), (self._title_index, title)):
+            if not k:
+                continue
+            index.setdefault(k, []).append(entry_id)
+
+    def _unindex_entry(self, entry_id: int):
+        """从哈希索引中移除条目"""
+        doi, title = self._keys.pop(entry_id, ("", ""))
+        for index, key in ((self._doi_index, doi), (self._title_index, title)):
+            if not key or key not in index:
+                continue
+            ids = index[key]
+            ids.remove(entry_id)
+            if not ids:
+                del index[key]
+
+    # ========== 查询 ==========
+
+    def get(self, entry_id: int) -> Paper:
+        """根据 entry_id 获取论文"""
+        return self._entries[entry_id]
+
+    def match(self, paper: Paper, mains_only: bool = False) -> List[int]:
+        """
+        查找与 paper 身份相同（DOI 或 title 相同，语义同 is_same_identity）的条目
+        返回按插入顺序排列的 entry_id 列表
+        """
+        doi, title = paper.get_key()
+        matched = set()
+        if doi:
+            matched.update(self._doi_index.get(doi, []))
+        if title:
+            matched.update(self._title_index.get(title, []))
+        if mains_only:
+            matched = {i for i in matched if i in self._conflicts}
+        return sorted(matched)
+
+    def is_main(self, entry_id: int) -> bool:
+        """条目是否为主论文"""
+        return entry_id in self._conflicts
+
+    def get_group(self, main_id: int) -> Tuple[Paper, List[Paper]]:
+        """获取冲突组：(主论文, [冲突论文...])"""
+        return self._entries[main_id], [self._entries[i] for i in self._conflicts[main_id]]
+
+    def papers(self) -> List[Paper]:
+        """按插入顺序返回所有论文"""
+        return list(self._entries.values())
+
+    def main_ids(self) -> List[int]:
+        """按插入顺序返回所有主论文的 entry_id"""
+        return [i for i in self._entries if i in self._conflicts]
+
+    def groups(self) -> List[Tuple[Paper, List[Paper]]]:
+        """按主论文插入顺序返回所有冲突组 [(主论文, [冲突论文...]), ...]"""
+        return [self.get_group(i) for i in self.main_ids()]
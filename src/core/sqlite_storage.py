@@ -0,0 +1,273 @@
+"""
+SQLite 存储引擎
+DatabaseManager 的可选存储后端（[database] storage_backend = sqlite）：论文数据保存在 SQLite 文件中，
+表结构由 tag_config 的激活标签生成（列名为标签 variable，列类型按标签 type 映射），
+并在 DOI、标题、分类、提交时间上建立索引；core_excel 仅作为供人工审阅的格式化导出视图
+每行以论文身份（规范化 DOI + 小写标题 + 提交时间）作为主键 paper_key，保存时只写入变化的行：
+新增或修改的论文以 INSERT ... ON CONFLICT DO UPDATE 写入，移除的论文按主键删除，
+全部变更在单个事务中完成，失败时整体回滚，数据库不会停留在半写入状态
+"""
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import difflib
+import contextlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
+
+from src.utils import ensure_directory, validate_doi
+
+# 论文表名；paper_key 为论文身份主键，row_order 保存论文在数据库中的排列顺序（与 Excel 行顺序一致，允许小数以便插入），
+# row_hash 为该行内容的哈希，用于保存时判断哪些行发生了变化
+TABLE_NAME = 'papers'
+KEY_COLUMN = 'paper_key'
+ORDER_COLUMN = 'row_order'
+HASH_COLUMN = 'row_hash'
+# 建立索引的字段（标签 variable），未激活的字段自动跳过
+INDEXED_FIELDS = ('doi', 'title', 'category', 'submission_time')
+# 单条 DELETE 语句中主键参数的数量上限（SQLite 默认变量上限为 999）
+DELETE_CHUNK_SIZE = 500
+# 插入行时相邻 row_order 的最小间隔，小于该值时整表重新编号
+MIN_ORDER_GAP = 1e-6
+
+_SQLITE_TYPES = {'bool': 'INTEGER', 'int': 'INTEGER', 'float': 'REAL'}
+
+# 行变更：(字段值对应的标签 variable 列表, 待写入的行 [(paper_key, row_order, row_hash, 字段值...)], 待删除的 paper_key 列表)
+RowChanges = Tuple[List[str], List[Tuple], List[str]]
+
+
+def build_table_schema(config) -> List[Tuple[str, str, str]]:
+    """根据激活标签生成表结构，返回按 order 排序的 [(variable, table_name, SQLite类型), ...]"""
+    tags = sorted(config.get_active_tags(), key=lambda t: t.get('order', 0))
+    return [(tag['variable'], tag['table_name'], _SQLITE_TYPES.get(str(tag.get('type', 'string')), 'TEXT'))
+            for tag in tags]
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteStorage:
+    """SQLite 论文存储"""
+
+    def __init__(self, db_path: str, config):
+        self.db_path = db_path
+        self.config = config
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """打开连接并确保表结构与当前 tag_config 一致；每次操作使用独立连接，结束即关闭"""
+        ensure_directory(os.path.dirname(os.path.abspath(self.db_path)))
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self._ensure_schema(conn)
+            yield conn
+        finally:
+            conn.close()
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        """建表、补充新增标签对应的列并建立索引（已有列不删除，停用的标签数据予以保留）"""
+        schema = build_table_schema(self.config)
+        with conn:
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE_NAME})")}
+            legacy = bool(existing) and KEY_COLUMN not in existing
+            if legacy:
+                # 早期版本以 row_order 为主键、没有 paper_key，迁移到新表结构
+                conn.execute(f"ALTER TABLE {TABLE_NAME} RENAME TO {TABLE_NAME}_legacy")
+                existing = set()
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE_NAME} ({KEY_COLUMN} TEXT PRIMARY KEY, "
+                         f"{ORDER_COLUMN} REAL NOT NULL, {HASH_COLUMN} TEXT NOT NULL)")
+            for variable, _, sql_type in schema:
+                if variable not in existing:
+                    conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN {_quote(variable)} {sql_type}")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote('idx_' + TABLE_NAME + '_' + ORDER_COLUMN)} "
+                         f"ON {TABLE_NAME}({ORDER_COLUMN})")
+            for variable, _, _ in schema:
+                if variable in INDEXED_FIELDS:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote('idx_' + TABLE_NAME + '_' + variable)} "
+                                 f"ON {TABLE_NAME}({_quote(variable)})")
+            if legacy:
+                self._migrate_legacy_table(conn, schema)
+
+    def _migrate_legacy_table(self, conn: sqlite3.Connection, schema: List[Tuple[str, str, str]]):
+        """将旧表（papers_legacy）的数据按原顺序写入新表后删除旧表（在 _ensure_schema 的事务中执行）"""
+        legacy_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE_NAME}_legacy)")}
+        variables = [variable for variable, _, _ in schema if variable in legacy_columns]
+        rows = conn.execute(f"SELECT {', '.join(_quote(v) for v in variables)} FROM {TABLE_NAME}_legacy "
+                            f"ORDER BY {ORDER_COLUMN}").fetchall()
+        df = pd.DataFrame(rows, columns=[table_name for variable, table_name, _ in schema if variable in variables])
+        entries, columns = self._frame_rows(df)
+        upserts = [(key, float(order), row_hash) + values for order, (key, row_hash, values) in enumerate(entries)]
+        self._write_changes(conn, (columns, upserts, []))
+        conn.execute(f"DROP TABLE {TABLE_NAME}_legacy")
+
+    def exists(self) -> bool:
+        """数据库文件是否存在"""
+        return os.path.exists(self.db_path)
+
+    def count(self) -> int:
+        """论文条目数量"""
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()[0]
+
+    def load(self) -> pd.DataFrame:
+        """
+        按保存顺序读取全部论文，返回与读取 core_excel 相同列名（table_name）的 DataFrame
+        空值为 None（对应 Excel 中的空单元格），bool 类型字段还原为 bool
+        """
+        schema = build_table_schema(self.config)
+        columns = ", ".join(_quote(variable) for variable, _, _ in schema)
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT {columns} FROM {TABLE_NAME} ORDER BY {ORDER_COLUMN}").fetchall()
+
+        bool_indexes = {i for i, (variable, _, _) in enumerate(schema) if self._tag_type(variable) == 'bool'}
+        if bool_indexes:
+            rows = [tuple(bool(v) if v is not None and i in bool_indexes else v for i, v in enumerate(row))
+                    for row in rows]
+        return pd.DataFrame(rows, columns=[table_name for _, table_name, _ in schema])
+
+    def diff(self, df: pd.DataFrame) -> RowChanges:
+        """
+        将 df（行顺序即论文顺序）与数据库当前内容比较，得到需要写入与删除的行：
+        - 内容变化的论文按原 paper_key 更新，不变的论文不写入
+        - 新增论文的 row_order 取前后相邻论文之间的值，其余论文的 row_order 保持不变
+        - df 中不再出现的 paper_key 删除
+        比较只读取 paper_key、row_order、row_hash 三列
+        """
+        entries, columns = self._frame_rows(df)
+        with self._connect() as conn:
+            base = conn.execute(f"SELECT {KEY_COLUMN}, {ORDER_COLUMN}, {HASH_COLUMN} FROM {TABLE_NAME} "
+                                f"ORDER BY {ORDER_COLUMN}").fetchall()
+
+        new_keys = [key for key, _, _ in entries]
+        new_key_set = set(new_keys)
+        deletes = [key for key, _, _ in base if key not in new_key_set]
+
+        matcher = difflib.SequenceMatcher(None, [key for key, _, _ in base], new_keys, autojunk=False)
+        opcodes = matcher.get_opcodes()
+        # 每个变更区块之后第一个保持不变的论文的 row_order（新增论文的 row_order 上界）
+        next_orders: List[Optional[float]] = [None] * len(opcodes)
+        upcoming = None
+        for index in range(len(opcodes) - 1, -1, -1):
+            tag, i1, _, _, _ = opcodes[index]
+            if tag == 'equal':
+                upcoming = base[i1][1]
+            next_orders[index] = upcoming
+
+        upserts = []
+        previous = None
+        for index, (tag, i1, _, j1, j2) in enumerate(opcodes):
+            if tag == 'equal':
+                for k in range(j2 - j1):
+                    key, order, stored_hash = base[i1 + k]
+                    _, row_hash, values = entries[j1 + k]
+                    if row_hash != stored_hash:
+                        upserts.append((key, order, row_hash) + values)
+                    previous = order
+                continue
+            count = j2 - j1
+            upper = next_orders[index]
+            if upper is None:
+                lower = previous if previous is not None else -1.0
+                step = 1.0
+            else:
+                lower = previous if previous is not None else upper - count - 1
+                step = (upper - lower) / (count + 1)
+            if step < MIN_ORDER_GAP:
+                # 相邻 row_order 间隔耗尽，整表按当前顺序重新编号
+                upserts = [(key, float(order), row_hash) + values
+                           for order, (key, row_hash, values) in enumerate(entries)]
+                return columns, upserts, deletes
+            for k in range(count):
+                key, row_hash, values = entries[j1 + k]
+                previous = lower + step * (k + 1)
+                upserts.append((key, previous, row_hash) + values)
+        return columns, upserts, deletes
+
+    def apply_changes(self, changes: RowChanges) -> bool:
+        """在单个事务中应用行变更（见 diff），返回是否发生写入；写入失败时抛出 sqlite3.Error 并回滚"""
+        _, upserts, deletes = changes
+        if not upserts and not deletes:
+            return False
+        with self._connect() as conn:
+            with conn:
+                self._write_changes(conn, changes)
+        return True
+
+    def save(self, df: pd.DataFrame) -> bool:
+        """
+        以 df 为数据库的完整新内容保存（行顺序即 df 顺序），只写入变化的行，返回是否发生写入
+        df 应已按 tag_config 规范列（normalize_dataframe_columns）；写入失败时抛出 sqlite3.Error 并回滚
+        """
+        return self.apply_changes(self.diff(df))
+
+    @staticmethod
+    def _write_changes(conn: sqlite3.Connection, changes: RowChanges):
+        """在调用方的事务中执行写入：按 paper_key 插入或更新，再按 paper_key 删除"""
+        columns, upserts, deletes = changes
+        if upserts:
+            all_columns = [KEY_COLUMN, ORDER_COLUMN, HASH_COLUMN] + [_quote(c) for c in columns]
+            assignments = ", ".join(f"{c} = excluded.{c}" for c in all_columns[1:])
+            conn.executemany(
+                f"INSERT INTO {TABLE_NAME} ({', '.join(all_columns)}) VALUES ({', '.join('?' * len(all_columns))}) "
+                f"ON CONFLICT({KEY_COLUMN}) DO UPDATE SET {assignments}", upserts)
+        for start in range(0, len(deletes), DELETE_CHUNK_SIZE):
+            chunk = deletes[start:start + DELETE_CHUNK_SIZE]
+            conn.execute(f"DELETE FROM {TABLE_NAME} WHERE {KEY_COLUMN} IN ({', '.join('?' * len(chunk))})", chunk)
+
+    def _frame_rows(self, df: pd.DataFrame) -> Tuple[List[Tuple[str, str, Tuple]], List[str]]:
+        """
+        将 df 转换为 [(paper_key, row_hash, SQLite字段值), ...] 与字段值对应的标签 variable 列表
+        身份相同（含提交时间）的多行依次追加 #1、#2 ... 以保证主键唯一
+        """
+        schema = [(variable, table_name) for variable, table_name, _ in build_table_schema(self.config)
+                  if table_name in df.columns]
+        variables = [variable for variable, _ in schema]
+        key_indexes = [variables.index(v) if v in variables else None for v in ('doi', 'title', 'submission_time')]
+
+        entries = []
+        seen: Dict[str, int] = {}
+        for row in df[[table_name for _, table_name in schema]].itertuples(index=False, name=None):
+            values = tuple(self._to_sql_value(value) for value in row)
+            key = self._identity_key(*(values[i] if i is not None else None for i in key_indexes))
+            occurrence = seen.get(key, 0)
+            seen[key] = occurrence + 1
+            if occurrence:
+                key = f"{key}#{occurrence}"
+            row_hash = hashlib.sha1(json.dumps(values, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+            entries.append((key, row_hash, values))
+        return entries, variables
+
+    @staticmethod
+    def _identity_key(doi: Any, title: Any, submission_time: Any) -> str:
+        """论文身份主键：与 Paper.get_key 一致的规范化 DOI 与小写标题，加上提交时间（区分同一论文的冲突条目）"""
+        _, normalized_doi = validate_doi(str(doi).strip() if doi else "", check_format=False)
+        normalized_title = str(title).strip().lower() if title else ""
+        return "\t".join([normalized_doi.lower(), normalized_title, str(submission_time or "")])
+
+    def _tag_type(self, variable: str) -> str:
+        return str(self.config.get_tag_field(variable, 'type') or 'string')
+
+    @staticmethod
+    def _to_sql_value(value: Any) -> Any:
+        """DataFrame 单元格值转换为 SQLite 值：空字符串与缺失值写为 NULL，bool 写为 0/1"""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return value if value != "" else None
+        if isinstance(value, bool):
+            return int(value)
+        try:
+            if pd.isna(value):
+                return None
+        except (TypeError, ValueError):
+            pass
+        if hasattr(value, 'item'):
+            # numpy 标量
+            return value.item()
+        return value
@@ -0,0 +1,90 @@
+"""
+近似重复标题索引
+将标题规范化（Unicode 规范化、小写、去除标点与连字符）后切分为词元，建立词元倒排索引，
+用于发现 "LLM-based X: a survey" 与 "LLM based X — A Survey" 这类精确身份匹配（is_same_identity）漏掉的疑似重复论文
+查询时只需探查查询标题中最罕见的少数词元（前缀过滤），再按词元 Jaccard 相似度核验候选，
+单次查询的开销与数据库规模基本无关
+该脚本不应使用任何非基础第三方包，以供submit_gui调用
+"""
+import re
+import math
+import unicodedata
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize_title(title: str) -> str:
+    """规范化标题：NFKC、小写，标点/连字符/破折号等非文字字符统一为单个空格"""
+    if not title:
+        return ""
+    text = unicodedata.normalize('NFKC', str(title)).lower()
+    return _NON_WORD_RE.sub(' ', text).strip()
+
+
+def title_tokens(title: str) -> FrozenSet[str]:
+    """规范化标题的词元集合"""
+    return frozenset(normalize_title(title).split())
+
+
+class TitleIndex:
+    """近似重复标题索引（词元倒排索引 + 前缀过滤）"""
+
+    def __init__(self, threshold: float = 0.8):
+        # 词元 Jaccard 相似度不低于 threshold 视为疑似重复
+        self.threshold = threshold
+        self._tokens: Dict[Hashable, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def add(self, key: Hashable, title: str):
+        """加入（或替换）key 对应的标题"""
+        self.remove(key)
+        tokens = title_tokens(title)
+        if not tokens:
+            return
+        self._tokens[key] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(key)
+
+    def remove(self, key: Hashable):
+        """移除 key 对应的标题"""
+        tokens = self._tokens.pop(key, None)
+        if not tokens:
+            return
+        for token in tokens:
+            keys = self._postings.get(token)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[token]
+
+    def find_similar(self, title: str, exclude: Optional[Hashable] = None) -> List[Tuple[Hashable, float]]:
+        """
+        查找与 title 相似度不低于阈值的条目，按相似度从高到低返回 [(key, 相似度), ...]
+        相似度 >= threshold 意味着二者至少共享 ceil(threshold * |q|) 个词元，
+        因此只需探查查询词元中最罕见的 |q| - ceil(threshold * |q|) + 1 个即可找出全部候选
+        """
+        query = title_tokens(title)
+        if not query:
+            return []
+        min_overlap = max(1, math.ceil(self.threshold * len(query) - 1e-9))
+        probe_count = len(query) - min_overlap + 1
+        probes = sorted(query, key=lambda t: (len(self._postings.get(t, ())), t))[:probe_count]
+
+        candidates: Set[Hashable] = set()
+        for token in probes:
+            candidates.update(self._postings.get(token, ()))
+        candidates.discard(exclude)
+
+        matches = []
+        for key in candidates:
+            tokens = self._tokens[key]
+            overlap = len(query & tokens)
+            score = overlap / (len(query) + len(tokens) - overlap)
+            if score >= self.threshold:
+                matches.append((key, score))
+        matches.sort(key=lambda m: (-m[1], str(m[0])))
+        return matches
@@ -7,6 +7,7 @@ read_json_file
 write_json_file
 read_excel_file
 write_excel_file
+stream_excel_file
 load_papers_from_excel
 load_papers_from_json
 save_papers_to_json  <-- 新增
@@ -29,7 +30,10 @@ from typing import List, Dict, Any, Optional,Union,Tuple
 from dataclasses import asdict
 
 from src.core.config_loader import get_config_instance
-from src.core.database_model import Paper,is_same_identity
+from src.core.database_model import Paper,is_same_identity,validate_papers_fields
+from src.profiler import profiled
+from src.core.validation_cache import ValidationCache
+from src.core.validation_plan import get_validation_plan
 # 导入统一的备份函数
 from src.utils import ensure_directory, backup_file, get_current_timestamp
 
@@ -42,7 +46,14 @@ class UpdateFileUtils:
         self.update_excel_path = self.settings['paths']['update_excel']
         self.update_json_path = self.settings['paths']['update_json']
         self.backup_dir = self.settings['paths']['backup_dir']
+        self._validation_cache = None
 
+    def get_validation_cache(self) -> ValidationCache:
+        """获取验证结果缓存（位于 cache_dir 下，首次使用时加载）"""
+        if self._validation_cache is None:
+            cache_dir = self.settings['paths'].get('cache_dir') or os.path.join(str(self.config.project_root), '.cache')
+            self._validation_cache = ValidationCache(os.path.join(cache_dir, 'validation_cache.json'), self.config)
+        return self._validation_cache
 
     def read_json_file(self,filepath: str) -> Optional[Dict]:
         """读取JSON文件"""
@@ -89,7 +100,7 @@ class UpdateFileUtils:
 
 
     def write_excel_file(self,filepath: str, df) -> bool:
-        """写入Excel文件"""
+        """写入Excel文件（流式写入并逐行应用格式，见 stream_excel_file）"""
         try:
             import pandas as pd
 
@@ -98,19 +109,103 @@ class UpdateFileUtils:
             return False
         try:
             ensure_directory(os.path.dirname(filepath))
-            with pd.ExcelWriter(
-                filepath,
-                engine='openpyxl'
-            ) as writer:
-                df.to_excel(writer, index=False, sheet_name='Papers')
-                workbook = writer.book
-                worksheet = writer.sheets['Papers']
-                # 应用格式
-                self.apply_excel_formatting(workbook, worksheet, df)
-                return True
+            self.stream_excel_file(filepath, df)
+            return True
         except Exception as e:
             print(f"写入Excel文件失败 {filepath}: {e}")
             return False
+
+    @profiled('stream_excel')
+    def stream_excel_file(self, filepath: str, df, rows=None, password: str = "", prepare_sheet=None, auto_enter=False):
+        """
+        以 openpyxl write_only 模式流式写入带格式的Excel（'Papers' 工作表），
+        结果与 df.to_excel 后调用 apply_excel_formatting 一致：表头填充与字体（必填列深色）、
+        所有单元格文本格式、列宽、自动换行设置
+        各类单元格的样式预先计算一次并在单元格间共享，格式随每行写出时应用，不在内存中构建完整工作簿
+        
+        参数:
+            rows: 实际写入的各行单元格值（可迭代，与 df 行一一对应），默认为 df 各行
+            password: 非空时设置工作表保护密码
+            prepare_sheet: 可选，在写出第一行前以工作表为参数调用（如添加条件格式）
+        """
+        import openpyxl
+        from copy import copy
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, PatternFill, Font
+        from openpyxl.utils import get_column_letter
+
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Papers')
+
+        # 列宽、行高与保护需在写出第一行前设置
+        for i, width in enumerate(self._compute_column_widths(df)):
+            worksheet.column_dimensions[get_column_letter(i + 1)].width = width
+        worksheet.sheet_format.defaultRowHeight = 15
+        if password:
+            try:
+                worksheet.protection.set_password(password)
+                worksheet.protection.sheet = True
+            except Exception:
+                print("注意：无法设置Excel保护，文件将以未加密形式保存")
+        if prepare_sheet is not None:
+            prepare_sheet(worksheet)
+
+        def make_style(fill=None, font=None):
+            template = WriteOnlyCell(worksheet)
+            template.number_format = '@'
+            template.alignment = Alignment(wrap_text=auto_enter)
+            if fill is not None:
+                template.fill = fill
+            if font is not None:
+                template.font = font
+            return template._style
+
+        def solid(color):
+            color = color.lstrip('#')
+            return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+        def styled(value, style):
+            cell = WriteOnlyCell(worksheet, value)
+            cell._style = copy(style)
+            return cell
+
+        header_row_color, required_color, required_font_color = self._resolve_header_colors(df)
+        header_style = make_style(solid(header_row_color), Font(bold=True))
+        required_style = make_style(solid(required_color), Font(color=required_font_color.lstrip('#'), bold=True))
+        required_vars = {t['table_name'] for t in self.config.get_required_tags()}
+        worksheet.append([styled(str(col), required_style if col in required_vars else header_style)
+                          for col in df.columns])
+
+        text_style = make_style()
+        if rows is None:
+            rows = df.itertuples(index=False, name=None)
+        for values in rows:
+            worksheet.append([styled(self._to_excel_cell_value(v), text_style) for v in values])
+
+        workbook.save(filepath)
+
+    @staticmethod
+    def _to_excel_cell_value(value):
+        """与 DataFrame.to_excel 一致的单元格值：缺失值与空字符串写为空单元格，不支持的类型转为字符串"""
+        if value is None or (isinstance(value, str) and value == ""):
+            return None
+        if isinstance(value, float) and value != value:
+            return None
+        if isinstance(value, (str, bool, int, float)):
+            return value
+        if hasattr(value, 'item'):
+            # numpy 标量
+            return value.item()
+        try:
+            import pandas as pd
+            if pd.isna(value):
+                return None
+        except (TypeError, ValueError):
+            pass
+        import datetime
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time, datetime.timedelta)):
+            return value
+        return str(value)
         
 
 
@@ -480,6 +575,7 @@ class UpdateFileUtils:
         return df
     
 
+    @profiled('format_update_file')
     def ensure_update_file_format(self, filepath: str = None) -> bool:
         """确保更新文件按非系统字段规范化并写回，保证表头样式存在。
         返回True表示写回成功或文件存在并已格式化，False表示失败。
@@ -540,55 +636,8 @@ class UpdateFileUtils:
         Returns:
             规范化后的 unique_name，或原值字符串形式
         """
-        if raw_val is None:
-            return ""
-        s = str(raw_val).strip()
-        if not s:
-            return ""
-
-        # 支持多分类输入，可能以 ';' 或中文 '；' 分隔
-        parts = [p.strip() for p in re.split(r'[;；]', s) if p.strip()]
-        if not parts:
-            return ""
-
-        # 最大允许分类数（从配置中读取，若无则默认4）
-        try:
-            max_allowed = int(config_instance.settings['database'].get('max_categories_per_paper', 4))
-        except Exception:
-            max_allowed = 4
-
-        out = []
-        seen = set()
-
-        # 先获取变更列表，方便快速替换
-        categories_change_list = config_instance.get_categories_change_list()
-
-        for raw_part in parts:
-            val = raw_part
-            # 应用分类变更规则（针对 unique_name）
-            for change_rule in categories_change_list:
-                old_unique_name = change_rule.get('old_unique_name', '').strip()
-                new_unique_name = change_rule.get('new_unique_name', '').strip()
-                if old_unique_name and new_unique_name and val == old_unique_name:
-                    val = new_unique_name
-                    break
-
-            # 通过 name 或 unique_name 查询分类，优先 unique_name
-            category = config_instance.get_category_by_name_or_unique_name(val)
-            if category:
-                uname = category.get('unique_name', '').strip()
-            else:
-                uname = val
-
-            if not uname or uname in seen:
-                continue
-
-            seen.add(uname)
-            out.append(uname)
-            if len(out) >= max_allowed:
-                break
-
-        return ";".join(out)
+        # 变更规则、分类查找表与最大分类数均由验证计划按配置版本预先整理
+        return get_validation_plan(config_instance).normalize_category(raw_val)
 
 
     def normalize_dataframe_columns(self,df, config_instance) -> Any:
@@ -728,6 +777,7 @@ class UpdateFileUtils:
         
         return papers
     
+    @profiled('excel_to_paper')
     def excel_to_paper(self, df, only_non_system: bool = False, skip_invalid: bool = False) -> List[Paper]:
         """
         数据规范化方法：将Excel数据转换为Paper对象列表
@@ -757,34 +807,58 @@ class UpdateFileUtils:
         else:
             tags = self.config.get_active_tags()
         
+        # 按列完成类型转换与缺失值填充
+        frame = self._excel_frame_to_columns(df, tags)
+        
+        # 构建Paper对象之前按列完成category规范化与必填/类型/分类/正则检查；失败时退回逐篇验证
+        plan = get_validation_plan(self.config)
+        frame_errors = None
+        try:
+            normalized = frame
+            if 'category' in frame.columns:
+                normalized = frame.assign(category=plan.normalize_category_column(frame['category']))
+            frame_errors = plan.check_frame(normalized, check_required=False, check_non_empty=True)
+            frame = normalized
+        except Exception as e:
+            print(f"警告: 按列验证失败，将逐篇验证: {e}")
+        
         papers = []
-        for _, row in df.iterrows():
+        column_errors = []
+        records = frame.to_dict('records') if len(frame.columns) else [{} for _ in range(len(frame))]
+        for i, paper_data in enumerate(records):
             try:
-                # 转换为Paper对象
-                paper_data = self._excel_row_to_paper_data(row, tags)
-                paper = Paper.from_dict(paper_data)
-                
-                # 验证论文字段
-                valid, errors , _= paper.validate_paper_fields(
-                    self.config,
-                    check_required=False,  # Excel文件可能不完整
-                    check_non_empty=True
-                )
-                
-                if not valid:
-                    if skip_invalid:
-                        print(f"警告: 跳过验证失败的论文: {paper.title[:50]}...")
-                        continue
-                    else:
-                        # 保留验证失败的论文（用于保护已存在数据库的数据）
-                        print(f"警告: 保留验证失败的论文: {paper.title[:50]}...")
-                
-                papers.append(paper)
+                papers.append(Paper.from_dict(paper_data))
+                if frame_errors is not None:
+                    column_errors.append(frame_errors[i])
             except Exception as e:
                 print(f"警告: 解析Excel行失败: {e}")
+        
+        # 批量验证论文字段（已按列检查的字段直接复用按列检查结果）
+        results = validate_papers_fields(
+            papers,
+            self.config,
+            check_required=False,  # Excel文件可能不完整
+            check_non_empty=True,
+            cache=self.get_validation_cache(),
+            column_errors=column_errors if frame_errors is not None else None
+        )
+        
+        valid_papers = []
+        for paper, (valid, errors, _) in zip(papers, results):
+            if valid is None:
+                # 验证过程抛出异常的行视为解析失败，不保留
+                print(f"警告: 解析Excel行失败: {errors[0]}")
                 continue
+            if not valid:
+                if skip_invalid:
+                    print(f"警告: 跳过验证失败的论文: {paper.title[:50]}...")
+                    continue
+                else:
+                    # 保留验证失败的论文（用于保护已存在数据库的数据）
+                    print(f"警告: 保留验证失败的论文: {paper.title[:50]}...")
+            valid_papers.append(paper)
         
-        return papers
+        return valid_papers
     
     def paper_to_json(self, papers: Union[Paper, List[Paper]], skip_invalid: bool = False) -> Union[Dict, List[Dict]]:
         """
@@ -998,6 +1072,93 @@ class UpdateFileUtils:
         
         return paper_data
     
+    def _excel_frame_to_paper_data(self, df, tags: List[Dict]) -> List[Dict]:
+        """
+        核心方法：将整个Excel DataFrame按列转换为Paper可用的数据字典列表
+        结果与逐行调用 _excel_row_to_paper_data 一致，但类型转换与NaN填充按列进行
+        
+        Args:
+            df: pandas DataFrame
+            tags: 标签配置列表
+            
+        Returns:
+            规范化的Paper数据字典列表，顺序与df行顺序一致
+        """
+        frame = self._excel_frame_to_columns(df, tags)
+        if not len(frame.columns):
+            return [{} for _ in range(len(df))]
+        return frame.to_dict('records')
+    
+    def _excel_frame_to_columns(self, df, tags: List[Dict]):
+        """
+        按列完成类型转换与NaN填充，返回以变量名为列名的 object 类型 DataFrame（行顺序与df一致）
+        
+        Args:
+            df: pandas DataFrame
+            tags: 标签配置列表
+        """
+        import pandas as pd
+        
+        columns = {}
+        for tag in tags:
+            var_name = tag['variable']
+            table_name = tag['table_name']
+            tag_type = tag.get('type', 'string')
+            
+            # Excel中使用table_name作为列名；缺失的列按类型默认值填充
+            if table_name in df.columns:
+                values = self._convert_column_by_type(df[table_name], tag_type)
+            else:
+                values = [self._get_type_default(tag_type)] * len(df)
+            columns[var_name] = values
+        
+        return pd.DataFrame(columns, index=pd.RangeIndex(len(df)), dtype=object)
+    
+    def _convert_column_by_type(self, series, tag_type: str) -> List[Any]:
+        """
+        按列进行类型转换与NaN填充，语义与 _convert_value_by_type 一致
+        列的 dtype 已满足目标类型时走 pandas 向量化路径，否则逐个值回退到 _convert_value_by_type
+        
+        Args:
+            series: pandas Series（Excel中的一列）
+            tag_type: 标签类型
+            
+        Returns:
+            转换后的值列表
+        """
+        import pandas as pd
+        from pandas.api import types as ptypes
+        
+        default = self._get_type_default(tag_type)
+        dtype = series.dtype
+        try:
+            if tag_type == 'bool':
+                if ptypes.is_bool_dtype(dtype):
+                    return series.fillna(default).astype(bool).tolist()
+            elif tag_type in ('int', 'float'):
+                if ptypes.is_numeric_dtype(dtype) and not ptypes.is_bool_dtype(dtype):
+                    return series.fillna(default).astype(tag_type).tolist()
+            elif pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+                # 'string' / 'text' / 'enum' 等文本类型；仅当非空值全为 str 时向量化
+                # （pandas 3 中 object 列的 is_string_dtype 恒为 True，混合类型列需逐值 str() 转换）
+                return series.fillna("").astype(object).str.strip().tolist()
+        except (ValueError, TypeError, OverflowError):
+            pass
+        
+        na_mask = series.isna().tolist()
+        return [default if is_na else self._convert_value_by_type(value, tag_type)
+                for value, is_na in zip(series.tolist(), na_mask)]
+    
+    def _get_type_default(self, tag_type: str) -> Any:
+        """Excel单元格为空（NaN）时，各标签类型对应的默认值"""
+        if tag_type == 'bool':
+            return False
+        elif tag_type == 'int':
+            return 0
+        elif tag_type == 'float':
+            return 0.0
+        return ""
+    
     def _paper_to_dict(self, paper: Paper) -> Dict:
         """
         核心方法：将Paper对象转换为字典
@@ -1179,14 +1340,7 @@ class UpdateFileUtils:
             print(f"无法导入openpyxl依赖:{e}\n 注意如果要应用excel格式，你需要安装openpyxl依赖包")
             return
         
-        # 获取样式（优先使用 df.attrs 中保存的初始化样式）
-        hs = df.attrs.get('header_styles', None) if hasattr(df, 'attrs') else None
-        if hs:
-            header_row_color = hs.get('header_row_fill', '#D9EEFF')
-            required_color = hs.get('required_header_fill', '#0B66C3')
-            required_font_color = hs.get('required_font_color', '#FFFFFF')
-        else:
-            header_row_color, required_color, required_font_color = self.get_header_styles()
+        header_row_color, required_color, required_font_color = self._resolve_header_colors(df)
 
         header_fill = PatternFill(start_color=header_row_color.lstrip('#'), 
                                 end_color=header_row_color.lstrip('#'), 
@@ -1221,37 +1375,44 @@ class UpdateFileUtils:
                     # '@' 是 Excel 的文本格式代码
                     cell.number_format = '@'
 
-        # 设置列宽 - 修复列宽计算问题
+        # 设置列宽
+        for i, width in enumerate(self._compute_column_widths(df)):
+            worksheet.column_dimensions[get_column_letter(i + 1)].width = width
+        
+        # 确保所有行都可见（解除隐藏）
+        worksheet.sheet_format.defaultRowHeight = 15
+        
+        # 设置单元格自动换行格式
+        for row in worksheet.iter_rows(min_row=1, max_row=worksheet.max_row, 
+                                    min_col=1, max_col=worksheet.max_column):
+            for cell in row:
+                cell.alignment = cell.alignment.copy(wrapText=auto_enter)
+
+    def _resolve_header_colors(self, df) -> Tuple[str, str, str]:
+        """表头颜色（优先使用 df.attrs 中保存的初始化样式），返回 (表头填充, 必填表头填充, 必填表头字体颜色)"""
+        hs = df.attrs.get('header_styles', None) if hasattr(df, 'attrs') else None
+        if hs:
+            return (hs.get('header_row_fill', '#D9EEFF'), hs.get('required_header_fill', '#0B66C3'),
+                    hs.get('required_font_color', '#FFFFFF'))
+        return self.get_header_styles()
+
+    def _compute_column_widths(self, df) -> List[float]:
+        """按列名与列中数据的最大长度计算各列列宽（最小15，最大50）"""
+        widths = []
         for column in df.columns:
-            column_letter = get_column_letter(df.columns.get_loc(column) + 1)
-            
-            # 计算合适的列宽
             if df.empty:
                 # 如果DataFrame为空，使用列名的长度
                 column_length = len(str(column))
             else:
                 # 如果有数据，计算列名和列中数据的最大长度
                 try:
-                    import pandas as pd
                     # 确保数据是字符串类型
-                    column_data = df[column].astype(str)
-                    max_data_length = column_data.map(len).max()
+                    max_data_length = df[column].astype(str).map(len).max()
                     column_length = max(len(str(column)), max_data_length)
                 except:
                     column_length = len(str(column))
-            
-            # 确保最小列宽为15，最大不超过50
-            adjusted_width = max(min(column_length + 3, 50), 15)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        # 确保所有行都可见（解除隐藏）
-        worksheet.sheet_format.defaultRowHeight = 15
-        
-        # 设置单元格自动换行格式
-        for row in worksheet.iter_rows(min_row=1, max_row=worksheet.max_row, 
-                                    min_col=1, max_col=worksheet.max_column):
-            for cell in row:
-                cell.alignment = cell.alignment.copy(wrapText=auto_enter)
+            widths.append(max(min(column_length + 3, 50), 15))
+        return widths
 
 # 创建全局单例
 _update_file_utils_instance = None
@@ -0,0 +1,137 @@
+"""
+论文验证结果缓存
+以“论文内容哈希 + 配置指纹 + 验证代码版本”为键，持久化 validate_paper_fields 的全量验证结果
+（是否有效、错误信息、未通过字段，以及验证时被规范化改写的字段值），
+内容、配置与验证规则均未变化的论文可直接复用结果，跳过重复验证
+该脚本不应使用任何非基础第三方包，以供submit_gui调用
+"""
+import os
+import sys
+import json
+import hashlib
+from dataclasses import asdict
+from typing import Dict, List, Optional, Any, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
+
+from src.utils import ensure_directory
+
+# 验证规则所在的源文件（验证函数、验证计划及其使用的规范化辅助函数），任一文件变化时缓存整体失效
+VALIDATOR_SOURCES = (
+    os.path.join(os.path.dirname(__file__), 'database_model.py'),
+    os.path.join(os.path.dirname(__file__), 'validation_plan.py'),
+    os.path.join(os.path.dirname(__file__), '..', 'utils.py'),
+)
+_validator_version: Optional[str] = None
+
+
+def get_validator_version() -> str:
+    """验证代码版本：VALIDATOR_SOURCES 内容的哈希（进程内只计算一次）"""
+    global _validator_version
+    if _validator_version is None:
+        code_hash = hashlib.sha256()
+        for path in VALIDATOR_SOURCES:
+            try:
+                with open(path, 'rb') as f:
+                    code_hash.update(f.read())
+            except Exception:
+                code_hash.update(path.encode('utf-8'))
+        _validator_version = code_hash.hexdigest()
+    return _validator_version
+
+
+class ValidationCache:
+    """论文验证结果缓存"""
+    # 缓存条目上限，超出时按最近使用顺序淘汰最旧的条目
+    MAX_ENTRIES = 200000
+
+    def __init__(self, cache_path: str, config_instance):
+        self.cache_path = cache_path
+        self.config = config_instance
+        self.config_version = ""
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._dirty = False
+
+    def sync_config(self):
+        """加载缓存文件并核对配置指纹与验证代码版本；任一变化时清空所有条目"""
+        version = f"{self.config.get_config_version()}:{get_validator_version()}"
+        if not self._loaded:
+            self._loaded = True
+            self._load(version)
+        if version != self.config_version:
+            self.config_version = version
+            self._entries = {}
+            self._dirty = True
+
+    def _load(self, version: str):
+        """读取缓存文件，文件不存在、损坏或版本（配置指纹与验证代码版本）不一致时视为空缓存"""
+        try:
+            if not os.path.exists(self.cache_path):
+                return
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('config_version') != version:
+                return
+            self.config_version = version
+            self._entries = data.get('entries', {})
+        except Exception as e:
+            print(f"读取验证缓存失败，将重新验证: {e}")
+            self._entries = {}
+
+    def make_key(self, paper, check_required: bool, check_non_empty: bool) -> str:
+        """根据论文内容、验证选项与版本（配置指纹与验证代码版本）生成缓存键"""
+        payload = json.dumps(
+            [self.config_version, check_required, check_non_empty, asdict(paper)],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """获取缓存条目；命中时将其移到最近使用位置（仅影响淘汰顺序，不单独触发写盘）"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._entries[key] = entry
+        return entry
+
+    def put(self, key: str, before: Dict[str, Any], paper, result: Tuple[bool, List[str], List[str]]):
+        """
+        写入缓存条目
+        before 为验证前的论文字段字典，仅记录验证过程中被改写的字段
+        """
+        after = asdict(paper)
+        changed = {name: value for name, value in after.items() if before.get(name) != value}
+        valid, errors, invalid_vars = result
+        self._entries[key] = {
+            'valid': bool(valid),
+            'errors': list(errors),
+            'invalid_vars': list(invalid_vars),
+            'fields': changed,
+        }
+        self._dirty = True
+
+    def apply(self, entry: Dict[str, Any], paper) -> Tuple[bool, List[str], List[str]]:
+        """将缓存的规范化结果写回论文，并返回与 validate_paper_fields 相同格式的结果"""
+        for name, value in entry['fields'].items():
+            setattr(paper, name, value)
+        return entry['valid'], list(entry['errors']), list(entry['invalid_vars'])
+
+    def save(self) -> bool:
+        """有变化时原子写入缓存文件"""
+        if not self._dirty:
+            return True
+        try:
+            overflow = len(self._entries) - self.MAX_ENTRIES
+            if overflow > 0:
+                for key in list(self._entries)[:overflow]:
+                    del self._entries[key]
+            ensure_directory(os.path.dirname(self.cache_path))
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'config_version': self.config_version, 'entries': self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+            return True
+        except Exception as e:
+            print(f"写入验证缓存失败: {e}")
+            return False
@@ -0,0 +1,456 @@
+"""
+论文字段验证计划
+按配置版本将 tag/分类配置编译为验证计划：预先整理必填字段、分类变更规则与有效分类集合、
+变量名 -> order 映射，并为每个启用字段生成带预编译正则的检查函数，
+使 Paper.validate_paper_fields 无需在每次调用时重建这些结构
+该脚本不应使用任何非基础第三方包，以供submit_gui调用
+"""
+import os
+import sys
+import re
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
+
+from src.utils import (
+    validate_url, validate_doi, validate_authors, validate_pipeline_image,
+    validate_date, validate_invalid_fields, normalize_figure_path
+)
+
+# 多分类分隔符（英文 ; 或中文 ；）
+_CATEGORY_SEP_RE = re.compile(r'[;；]')
+# bool 字段允许的取值（小写）
+_BOOL_VALUES = frozenset(['true', 'false', 'yes', 'no', '1', '0', 'y', 'n'])
+
+# 会被 Paper 初始化或 validate 的特殊字段规范化改写的字段：其检查只能在构建 Paper 之后逐篇进行
+_NORMALIZED_FIELDS = frozenset(['doi', 'authors', 'pipeline_image', 'paper_file', 'date'])
+
+# 单字段检查函数：(value, errors) -> 是否未通过
+FieldCheck = Callable[[Any, List[str]], bool]
+# 单行的按列检查结果：(已按列检查的字段, 必填检查错误 {变量名: 错误列表}, 类型/分类/正则检查错误 {变量名: 错误列表})
+RowColumnErrors = Tuple[FrozenSet[str], Dict[str, List[str]], Dict[str, List[str]]]
+
+
+class ValidationPlan:
+    """编译后的论文字段验证计划"""
+
+    def __init__(self, config_instance):
+        self.config_version = config_instance.get_config_version()
+        settings = config_instance.settings
+
+        self.conflict_marker = settings['database'].get('conflict_marker')
+        self.figure_dir = settings['paths'].get('figure_dir', 'figures')
+        self.paper_dir = settings['paths'].get('paper_dir', 'assets/papers/')
+        try:
+            self.max_categories = int(settings['database'].get('max_categories_per_paper', 4))
+        except Exception:
+            self.max_categories = 4
+
+        # 分类变更规则：旧 unique_name -> 新 unique_name（多条规则匹配同一旧名时以第一条为准）
+        self.category_changes: Dict[str, str] = {}
+        for rule in config_instance.get_categories_change_list():
+            old_unique_name = rule.get('old_unique_name', '').strip()
+            new_unique_name = rule.get('new_unique_name', '').strip()
+            if old_unique_name and new_unique_name:
+                self.category_changes.setdefault(old_unique_name, new_unique_name)
+
+        # 分类查找（unique_name 优先，其次 name）直接使用配置加载器的索引
+        self.get_category = config_instance.get_category_by_name_or_unique_name
+        self.valid_categories = frozenset(cat['unique_name'] for cat in config_instance.get_active_categories())
+
+        active_tags = config_instance.get_active_tags()
+        self.required_fields: List[Tuple[str, str]] = [
+            (tag['variable'], tag.get('display_name', tag['variable']))
+            for tag in active_tags if tag.get('required', False)
+        ]
+        self.field_checks: List[Tuple[str, List[FieldCheck]]] = [
+            (tag['variable'], self._compile_field_checks(tag)) for tag in active_tags
+        ]
+        # 可在构建 Paper 之前按列检查的字段：变量名 -> (显示名, 类型检查种类 'bool'/'category'/None, 预编译正则)
+        self.column_rules: Dict[str, Tuple[str, Optional[str], Optional[Pattern]]] = {}
+        for tag in active_tags:
+            var_name = tag['variable']
+            tag_type = tag.get('type', 'string')
+            if var_name in _NORMALIZED_FIELDS or tag_type in ('int', 'float'):
+                continue
+            if tag_type == 'bool':
+                kind = 'bool'
+            elif str(tag_type).startswith('enum') and var_name == 'category':
+                kind = 'category'
+            else:
+                kind = None
+            self.column_rules[var_name] = (tag.get('display_name', var_name), kind, self._compile_pattern(tag))
+        self.var_to_order: Dict[str, str] = {}
+        for tag in active_tags:
+            var = tag.get('variable')
+            order = tag.get('order')
+            if var is not None and order is not None:
+                self.var_to_order[var] = str(order)
+
+    # ========== 编译 ==========
+
+    def _compile_field_checks(self, tag: Dict[str, Any]) -> List[FieldCheck]:
+        """为单个字段生成检查函数列表（类型检查在前，validation 正则检查在后）"""
+        var_name = tag['variable']
+        display_name = tag.get('display_name', var_name)
+        tag_type = tag.get('type', 'string')
+        checks: List[FieldCheck] = []
+
+        if tag_type == 'bool':
+            def check_bool(value, errors):
+                if str(value).lower() not in _BOOL_VALUES:
+                    errors.append(f"字段类型不匹配: {display_name} 应为布尔值")
+                    return True
+                return False
+            checks.append(check_bool)
+        elif str(tag_type).startswith('enum') and var_name == 'category':
+            checks.append(self._check_category)
+        elif tag_type in ('int', 'float'):
+            caster = int if tag_type == 'int' else float
+            type_label = '整数' if tag_type == 'int' else '浮点数'
+
+            def check_number(value, errors):
+                try:
+                    caster(value)
+                except ValueError:
+                    errors.append(f"字段类型不匹配: {display_name} 应为{type_label}")
+                    return True
+                return False
+            checks.append(check_number)
+
+        pattern = self._compile_pattern(tag)
+        if pattern is not None:
+            def check_pattern(value, errors):
+                if not pattern.match(str(value)):
+                    errors.append(f"字段格式无效: {display_name} 不符合验证规则")
+                    return True
+                return False
+            checks.append(check_pattern)
+
+        return checks
+
+    @staticmethod
+    def _compile_pattern(tag: Dict[str, Any]) -> Optional[Pattern]:
+        """预编译字段的 validation 正则；未配置或正则有问题时返回 None（跳过验证）"""
+        validation_pattern = tag.get('validation')
+        if not validation_pattern:
+            return None
+        try:
+            return re.compile(validation_pattern)
+        except re.error:
+            return None
+
+    def _check_category(self, value, errors) -> bool:
+        """多分类检查：重复项、是否为已启用分类、数量限制"""
+        invalid = False
+        val_str = str(value)
+        try:
+            parts = [p.strip() for p in _CATEGORY_SEP_RE.split(val_str) if p.strip()]
+        except Exception:
+            parts = [val_str.strip()]
+
+        # 检查重复（原始输入是否包含重复项）
+        if len(parts) != len(dict.fromkeys(parts)):
+            errors.append(f"分类包含重复项: {value}")
+            invalid = True
+
+        # 检查每一项是否合法
+        for p in parts:
+            if p not in self.valid_categories:
+                errors.append(f"分类无效: {p}，分类须为categories_config.py中已启用的分类")
+                invalid = True
+
+        # 检查数量不超过配置限制
+        if len(parts) > self.max_categories:
+            errors.append(f"分类数量超过限制: 最多允许 {self.max_categories} 个分类")
+            invalid = True
+        return invalid
+
+    # ========== 规范化 ==========
+
+    def normalize_category(self, raw_val: Any) -> str:
+        """规范化 category 字段，语义同 UpdateFileUtils.normalize_category_value"""
+        if raw_val is None:
+            return ""
+        s = str(raw_val).strip()
+        if not s:
+            return ""
+
+        parts = [p.strip() for p in _CATEGORY_SEP_RE.split(s) if p.strip()]
+        out = []
+        seen = set()
+        for raw_part in parts:
+            # 应用分类变更规则（针对 unique_name）
+            val = self.category_changes.get(raw_part, raw_part)
+
+            # 通过 name 或 unique_name 查询分类，优先 unique_name
+            category = self.get_category(val)
+            uname = category.get('unique_name', '').strip() if category else val
+
+            if not uname or uname in seen:
+                continue
+
+            seen.add(uname)
+            out.append(uname)
+            if len(out) >= self.max_categories:
+                break
+
+        return ";".join(out)
+
+    def normalize_category_column(self, series):
+        """
+        按列规范化 category（pandas Series），语义同 validate 中的逐篇规范化（失败时保留原值）
+        相同取值只规范化一次
+        """
+        normalized = {}
+        for raw in series.map(lambda v: str(v) if v else "").unique():
+            try:
+                normalized[raw] = self.normalize_category(raw)
+            except Exception:
+                pass
+        return series.map(lambda v: normalized.get(str(v) if v else "", v))
+
+    # ========== 按列检查 ==========
+
+    def _column_values(self, series):
+        """按列取验证用的值，语义同 validate 中的 field_value：字符串值忽略 conflict_marker 并去除首尾空白"""
+        if not self.conflict_marker:
+            return series
+        try:
+            stripped = series.str.replace(self.conflict_marker, '', regex=False).str.strip()
+        except AttributeError:
+            # 列中没有字符串值
+            return series
+        return stripped.where(stripped.notna(), series)
+
+    def check_frame(self, frame, check_required: bool = True, check_non_empty: bool = True) -> List[RowColumnErrors]:
+        """
+        在构建 Paper 之前按列执行 column_rules 字段的必填、类型、分类与正则检查
+        frame 为列名为变量名、已完成类型转换且 category 已规范化（normalize_category_column）的 DataFrame；
+        各项检查先在整列上求出未通过行的布尔掩码，仅对未通过的行生成错误信息
+        
+        返回:
+            与 frame 行顺序一致的 RowColumnErrors 列表，逐篇传给 validate 的 column_errors 参数
+        """
+        checked = frozenset(var for var in self.column_rules if var in frame.columns)
+        required_errors: Dict[int, Dict[str, List[str]]] = {}
+        field_errors: Dict[int, Dict[str, List[str]]] = {}
+
+        def flag(target, mask, var_name, message):
+            for pos in mask.to_numpy().nonzero()[0]:
+                target.setdefault(pos, {}).setdefault(var_name, []).append(message)
+
+        required_display = dict(self.required_fields)
+        for var_name in checked:
+            display_name, kind, pattern = self.column_rules[var_name]
+            values = self._column_values(frame[var_name].reset_index(drop=True))
+            text = values.map(str)
+            empty = ~values.astype(bool) | text.str.strip().eq("")
+
+            if check_required and var_name in required_display:
+                flag(required_errors, empty, var_name, f"必填字段为空: {required_display[var_name]} ({var_name})")
+
+            if not check_non_empty:
+                continue
+            if kind == 'bool':
+                flag(field_errors, ~empty & ~text.str.lower().isin(_BOOL_VALUES), var_name,
+                     f"字段类型不匹配: {display_name} 应为布尔值")
+            elif kind == 'category':
+                parts = text[~empty].str.split(_CATEGORY_SEP_RE).explode().str.strip()
+                parts = parts[parts.ne("")]
+                failed = set(parts.index[parts.reset_index().duplicated().to_numpy()])
+                failed.update(parts.index[~parts.isin(self.valid_categories)])
+                counts = parts.groupby(level=0).size()
+                failed.update(counts.index[counts > self.max_categories])
+                for pos in sorted(failed):
+                    self._check_category(values[pos], field_errors.setdefault(pos, {}).setdefault(var_name, []))
+            if pattern is not None:
+                flag(field_errors, ~empty & ~text.str.match(pattern), var_name,
+                     f"字段格式无效: {display_name} 不符合验证规则")
+
+        clean = (checked, {}, {})
+        return [
+            (checked, required_errors.get(pos, {}), field_errors.get(pos, {}))
+            if pos in required_errors or pos in field_errors else clean
+            for pos in range(len(frame))
+        ]
+
+    # ========== 验证 ==========
+
+    def validate(
+        self,
+        paper,
+        check_required: bool = True,
+        check_non_empty: bool = True,
+        variable: str = None,
+        no_normalize: bool = False,
+        column_errors: Optional[RowColumnErrors] = None
+    ) -> Tuple[bool, List[str], List[str]]:
+        """
+        执行验证，参数与返回值同 Paper.validate_paper_fields
+        column_errors 为 check_frame 给出的该论文所在行的结果：提供时 category 视为已在列上规范化，
+        已按列检查的字段直接采用其结果，其余字段照常逐篇检查
+        """
+        errors: List[str] = []
+        invalid_vars = set()
+        conflict_marker = self.conflict_marker
+        column_checked, column_required, column_fields = column_errors or (frozenset(), {}, {})
+
+        def should_check(var_name):
+            return variable is None or variable == var_name
+
+        # 规范化 category 字段（no_normalize=True 时只用于后续检查，不回写）
+        temp_category = getattr(paper, 'category', "")
+        if should_check('category') and column_errors is None:
+            try:
+                raw_cat = str(temp_category) if temp_category else ""
+                normalized_cat = self.normalize_category(raw_cat)
+                if not no_normalize:
+                    paper.category = normalized_cat
+                else:
+                    temp_category = normalized_cat
+            except Exception:
+                pass
+
+        # 1. 特殊字段验证
+        if should_check('invalid_fields') and paper.invalid_fields:
+            invalid_fields_valid, invalid_fields_error = validate_invalid_fields(paper.invalid_fields)
+            if not invalid_fields_valid:
+                errors.append(f"invalid_fields 字段格式无效: {invalid_fields_error}")
+                invalid_vars.add('invalid_fields')
+
+        if should_check('doi') and paper.doi:
+            doi_valid, cleaned_doi = validate_doi(paper.doi, check_format=True, conflict_marker=conflict_marker)
+            if not doi_valid and check_non_empty:
+                errors.append(f"DOI格式无效: {paper.doi}")
+                invalid_vars.add('doi')
+            if not no_normalize:
+                paper.doi = cleaned_doi
+
+        if should_check('authors') and paper.authors:
+            authors_valid, formatted_authors = validate_authors(paper.authors)
+            if not authors_valid and check_non_empty:
+                errors.append(f"作者格式无效")
+                invalid_vars.add('authors')
+            elif not no_normalize:
+                paper.authors = formatted_authors
+
+        if should_check('pipeline_image') and paper.pipeline_image:
+            pipeline_valid, normalized_path = validate_pipeline_image(paper.pipeline_image, self.figure_dir)
+            if not pipeline_valid and check_non_empty:
+                errors.append(f"Pipeline图片格式无效: {paper.pipeline_image}")
+                invalid_vars.add('pipeline_image')
+            elif pipeline_valid and not no_normalize:
+                paper.pipeline_image = normalized_path
+
+        if should_check('paper_file') and paper.paper_file:
+            if not no_normalize:
+                paper.paper_file = normalize_figure_path(paper.paper_file, self.paper_dir)
+
+        if should_check('paper_url'):
+            if paper.paper_url and not validate_url(paper.paper_url) and check_non_empty:
+                errors.append(f"论文链接格式无效: {paper.paper_url}")
+                invalid_vars.add('paper_url')
+
+        if should_check('project_url'):
+            if paper.project_url and not validate_url(paper.project_url) and check_non_empty:
+                errors.append(f"项目链接格式无效: {paper.project_url}")
+                invalid_vars.add('project_url')
+
+        if should_check('date') and paper.date:
+            date_valid, formatted_date = validate_date(paper.date)
+            if not date_valid and check_non_empty:
+                errors.append(f"日期格式无效: {paper.date} (应为 YYYY-MM-DD)")
+                invalid_vars.add('date')
+            elif not no_normalize:
+                paper.date = formatted_date
+
+        def field_value(var_name):
+            value = temp_category if var_name == 'category' and no_normalize else getattr(paper, var_name, "")
+            # 在验证前忽略 conflict_marker
+            try:
+                if isinstance(value, str) and conflict_marker:
+                    value = value.replace(conflict_marker, '').strip()
+            except Exception:
+                pass
+            return value
+
+        # 2. 必填字段检查
+        if check_required:
+            for var_name, display_name in self.required_fields:
+                if not should_check(var_name):
+                    continue
+                if var_name in column_checked:
+                    if var_name in column_required:
+                        errors.extend(column_required[var_name])
+                        invalid_vars.add(var_name)
+                    continue
+                value = field_value(var_name)
+                if not value or str(value).strip() == "":
+                    errors.append(f"必填字段为空: {display_name} ({var_name})")
+                    invalid_vars.add(var_name)
+
+        # 3. 非空字段检查（类型验证和validation字段验证）
+        if check_non_empty:
+            for var_name, checks in self.field_checks:
+                if not checks or not should_check(var_name):
+                    continue
+                if var_name in column_checked:
+                    if var_name in column_fields:
+                        errors.extend(column_fields[var_name])
+                        invalid_vars.add(var_name)
+                    continue
+                value = field_value(var_name)
+                # 跳过空值（除非是必填字段，已经在上面检查过了）
+                if not value or str(value).strip() == "":
+                    continue
+                for check in checks:
+                    if check(value, errors):
+                        invalid_vars.add(var_name)
+
+        # 处理 invalid_fields 字段更新（仅 no_normalize=False 时）
+        if not no_normalize:
+            self._update_invalid_fields(paper, invalid_vars, variable)
+
+        return (len(errors) == 0, errors, list(invalid_vars))
+
+    def _update_invalid_fields(self, paper, invalid_vars: set, variable: Optional[str]):
+        """根据验证结果更新 paper.invalid_fields（记录不规范字段的 order 列表）"""
+        var_to_order = self.var_to_order
+        if variable is None:
+            # 全量验证模式：重置 invalid_fields 为当前 invalid_vars 对应的 order
+            paper.invalid_fields = ",".join(var_to_order[v] for v in sorted(invalid_vars) if v in var_to_order)
+            return
+
+        # 单字段验证模式：更新当前字段的状态
+        target_order = var_to_order.get(variable)
+        if not target_order:
+            return
+        current_invalid_orders = set()
+        if paper.invalid_fields:
+            for p in str(paper.invalid_fields).split(','):
+                if p.strip():
+                    current_invalid_orders.add(p.strip())
+        if variable in invalid_vars:
+            current_invalid_orders.add(target_order)
+        else:
+            current_invalid_orders.discard(target_order)
+        # 保持排序以便一致性（按数值排序）
+        sorted_orders = sorted(current_invalid_orders, key=lambda x: int(x) if x.isdigit() else 0)
+        paper.invalid_fields = ",".join(sorted_orders)
+
+
+# 最近一次编译的验证计划：(配置实例, 验证计划)
+_plan_cache: Optional[Tuple[Any, ValidationPlan]] = None
+
+
+def get_validation_plan(config_instance) -> ValidationPlan:
+    """获取配置实例对应的验证计划，配置版本变化时重新编译"""
+    global _plan_cache
+    if _plan_cache is not None:
+        cached_config, plan = _plan_cache
+        if cached_config is config_instance and plan.config_version == config_instance.get_config_version():
+            return plan
+    plan = ValidationPlan(config_instance)
+    _plan_cache = (config_instance, plan)
+    return plan
@@ -0,0 +1,198 @@
+"""
+阶段级性能剖析
+为 update.py / convert.py 的 --profile 模式提供嵌套计时区间（span）：
+    with profile_span('load'):
+        ...
+    @profiled('add_papers')
+    def add_papers(...): ...
+同一调用路径（如 process_updates;file:a.json;validate）的多次调用合并统计：调用次数、总耗时、自身耗时（扣除子区间）、
+区间结束时的进程峰值常驻内存（RSS 为进程生命周期内的最高值，因此反映“截至该阶段结束”的峰值）
+未启用剖析时 span 为空操作，不影响正常运行
+报告为 JSON；同时输出 flamegraph.pl / speedscope 可直接读取的折叠栈文件（每行 "a;b;c 自身耗时微秒"）
+"""
+import os
+import sys
+import json
+import time
+import platform
+import threading
+import functools
+import contextlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../'))
+
+from src.utils import ensure_directory
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """当前进程的峰值常驻内存 (MB)，平台不支持时返回 None"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 单位为 KB，macOS 为字节
+        return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 2)
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return round(counters.PeakWorkingSetSize / (1024 * 1024), 2)
+    except Exception:
+        pass
+    return None
+
+
+class Profiler:
+    """嵌套计时区间的聚合统计"""
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        # 调用路径 -> {'calls', 'wall', 'child', 'peak_rss_mb'}；按首次出现顺序保存
+        self._stats: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        """计时一个区间；区间可嵌套，子线程中的区间从根开始记录"""
+        stack = self._stack()
+        stack.append(name)
+        path = tuple(stack)
+        with self._lock:
+            # 进入时登记，使报告中父区间排在子区间之前
+            self._stats.setdefault(path, {'calls': 0, 'wall': 0.0, 'child': 0.0, 'peak_rss_mb': None})
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            stack.pop()
+            peak_rss = get_peak_rss_mb()
+            with self._lock:
+                stat = self._stats[path]
+                stat['calls'] += 1
+                stat['wall'] += wall
+                if peak_rss is not None:
+                    stat['peak_rss_mb'] = max(stat['peak_rss_mb'] or 0.0, peak_rss)
+                if len(path) > 1:
+                    self._stats[path[:-1]]['child'] += wall
+
+    def report(self) -> Dict[str, Any]:
+        """生成报告字典"""
+        with self._lock:
+            spans = [
+                {
+                    'path': ";".join(path),
+                    'name': path[-1],
+                    'depth': len(path) - 1,
+                    'calls': stat['calls'],
+                    'wall_seconds': round(stat['wall'], 6),
+                    'self_seconds': round(max(0.0, stat['wall'] - stat['child']), 6),
+                    'peak_rss_mb': stat['peak_rss_mb'],
+                }
+                for path, stat in self._stats.items()
+            ]
+        return {
+            'name': self.name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'total_seconds': round(time.perf_counter() - self._start, 6),
+            'peak_rss_mb': get_peak_rss_mb(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'spans': spans,
+        }
+
+    def folded_lines(self) -> List[str]:
+        """折叠栈格式（flamegraph.pl / speedscope）：每行 "a;b;c 自身耗时微秒" """
+        return [f"{span['path']} {int(span['self_seconds'] * 1e6)}" for span in self.report()['spans']
+                if span['self_seconds'] > 0]
+
+    def write_report(self, path: str) -> str:
+        """写入 JSON 报告与同名 .folded 折叠栈文件，返回 JSON 报告路径"""
+        ensure_directory(os.path.dirname(os.path.abspath(path)))
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        with open(os.path.splitext(path)[0] + '.folded', 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.folded_lines()) + "\n")
+        return path
+
+    def print_summary(self):
+        """以缩进树形式打印各区间耗时"""
+        print("\n" + "=" * 50)
+        print(f"性能剖析 ({self.name})")
+        print("=" * 50)
+        for span in self.report()['spans']:
+            rss = f"  RSS峰值 {span['peak_rss_mb']:.1f} MB" if span['peak_rss_mb'] is not None else ""
+            print(f"{'  ' * span['depth']}{span['name']:<{max(1, 36 - 2 * span['depth'])}} "
+                  f"{span['wall_seconds']:9.3f} s  x{span['calls']}{rss}")
+
+
+_profiler: Optional[Profiler] = None
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def enable_profiling(name: str = "") -> Profiler:
+    """启用全局剖析并返回剖析器"""
+    global _profiler
+    _profiler = Profiler(name)
+    return _profiler
+
+
+def disable_profiling():
+    """停用全局剖析"""
+    global _profiler
+    _profiler = None
+
+
+def get_profiler() -> Optional[Profiler]:
+    """获取全局剖析器，未启用时返回 None"""
+    return _profiler
+
+
+def profile_span(name: str):
+    """全局剖析器的计时区间；未启用剖析时为空操作"""
+    if _profiler is None:
+        return _NULL_SPAN
+    return _profiler.span(name)
+
+
+def profiled(name: str) -> Callable:
+    """装饰器：将函数调用记为一个计时区间"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def default_report_path(script_name: str) -> str:
+    """默认报告路径：<cache_dir>/profile/<脚本名>_<时间>.json"""
+    from src.core.config_loader import get_config_instance
+    config = get_config_instance()
+    cache_dir = config.settings['paths'].get('cache_dir') or os.path.join(str(config.project_root), '.cache')
+    return os.path.join(cache_dir, 'profile', f"{script_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
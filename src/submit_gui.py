@@ -765,9 +765,10 @@ class PaperSubmissionGUI:
         if paper_ref.paper_file:
             abs_path = os.path.join(BASE_DIR, paper_ref.paper_file)
             gen_reader = AIGenerator()
-            paper_text = gen_reader.read_paper_file(abs_path)
+            paper_text = gen_reader.read_paper_file(abs_path, max_chars=3000)
             
-        gen = AIGenerator()
+        # 指定字段即强制重新生成，跳过响应缓存
+        gen = AIGenerator(bypass_cache=bool(target_field))
         fields_to_gen = [target_field] if target_field else None
         
         # 1. 仅生成内容，不直接覆盖 Paper 对象（避免并发冲突）
@@ -1183,7 +1184,7 @@ class PaperSubmissionGUI:
         paper = self.logic.papers[idx]
         paper_text = ""
         if paper.paper_file:
-             paper_text = AIGenerator().read_paper_file(os.path.join(BASE_DIR, paper.paper_file))
+             paper_text = AIGenerator().read_paper_file(os.path.join(BASE_DIR, paper.paper_file), max_chars=2000)
         gen = AIGenerator()
         cat, reasoning = gen.generate_category(paper, paper_text)
         
@@ -5,6 +5,7 @@
 import os
 import sys
 import json
+import argparse
 from pathlib import Path
 from typing import Dict, List, Tuple
 from dataclasses import asdict
@@ -18,6 +19,7 @@ from src.core.database_model import Paper, is_duplicate_paper
 from src.ai_generator import AIGenerator
 from src.utils import  get_current_timestamp,backup_file
 from src.core.update_file_utils import get_update_file_utils
+from src.profiler import profile_span, profiled, enable_profiling, default_report_path
 import pandas as pd
 
 
@@ -51,15 +53,18 @@ class UpdateProcessor:
         except Exception:
             self.is_remove_added_paper=bool(remove_val)
     
-    def process_updates(self, conflict_resolution: str = 'mark') -> Dict:
+    @profiled('process_updates')
+    def process_updates(self, conflict_resolution: str = 'mark', staged_ingest: bool = True) -> Dict:
         """
         处理更新文件 (循环处理所有配置的更新源文件)
         
         参数:
             conflict_resolution: 冲突解决策略 ('mark', 'skip', 'replace')
+            staged_ingest: 为True时先加载、验证所有更新文件，合并后只调用一次 add_papers（只读写一次核心数据库）；
+                           为False时逐个文件调用 add_papers
         
         返回:
-            处理结果字典
+            处理结果字典（file_results 为逐文件统计：读取/有效/添加/冲突论文数）
         """
         result = {
             'success': False,
@@ -67,7 +72,10 @@ class UpdateProcessor:
             'updated_papers': 0,
             'conflicts': [],
             'errors': [],
-            'ai_generated': 0
+            'ai_generated': 0,
+            'invalid_msg': [],
+            'near_duplicates': [],
+            'file_results': {}
         }
         conflict_resolution_strategy = self.settings['database'].get('conflict_resolution', conflict_resolution)
         
@@ -95,15 +103,64 @@ class UpdateProcessor:
 
         print(f"检测到 {len(valid_files)} 个更新文件，开始逐一处理...")
 
-        # 循环处理每个文件
+        # 阶段一：逐个文件加载、去重、预处理、验证与AI补全
+        staged = []
+        for file_path in valid_files:
+            with profile_span(f"file:{os.path.basename(file_path)}"):
+                valid_papers = self._stage_update_file(file_path, result)
+            if valid_papers:
+                staged.append((file_path, valid_papers))
+
+        # 阶段二：写入数据库（合并为一次提交，或逐文件提交）
         total_added_papers = []
         total_conflict_papers = []
         total_invalid_msg = []
+        batches = [staged] if staged_ingest else [[item] for item in staged]
+        for batch in batches:
+            if not batch:
+                continue
+            with profile_span('commit'):
+                added, conflicts, invalid_msg = self._commit_staged_papers(batch, conflict_resolution_strategy, result)
+            total_added_papers.extend(added)
+            total_conflict_papers.extend(conflicts)
+            total_invalid_msg.extend(invalid_msg)
 
-        for file_path in valid_files:
-            print(f"\n📝--- 处理文件: {file_path} ---")
-            
-            # 1. 加载论文
+        # 整理冲突信息
+        conflicts_list = []
+        for item in total_conflict_papers:
+            if isinstance(item, (list, tuple)) and len(item) == 2:
+                new_paper, existing_paper = item
+            else:
+                new_paper = item
+                existing_paper = None
+            conflicts_list.append({
+                'new': asdict(new_paper) if new_paper else None,
+                'existing': asdict(existing_paper) if existing_paper else None
+            })
+        result['conflicts'] = conflicts_list
+        # 整理验证失败信息
+        result['invalid_msg']=list(dict.fromkeys(total_invalid_msg))#去重
+
+        # 循环结束，整理最终结果
+        if result['new_papers'] > 0 or result['updated_papers'] > 0 or result['ai_generated'] > 0 or result['conflicts']:
+            result['success'] = True
+        elif not result['errors']:
+             # 没有错误，但也没添加或更改任何东西 (可能是文件为空)
+             pass
+        
+        return result
+    
+    
+    def _stage_update_file(self, file_path: str, result: Dict) -> List[Paper]:
+        """
+        暂存单个更新文件：加载、文件内去重、预处理（时间戳、贡献者、验证）、AI生成缺失内容并回写到该文件
+        返回通过验证、待写入数据库的论文列表
+        """
+        print(f"\n📝--- 处理文件: {file_path} ---")
+        file_result = result['file_results'].setdefault(file_path, {'loaded': 0, 'valid': 0, 'added': 0, 'conflicts': 0})
+        
+        # 1. 加载论文
+        with profile_span('load'):
             current_papers = []
             try:
                 if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
@@ -112,35 +169,38 @@ class UpdateProcessor:
                     current_papers = self.update_utils.load_papers_from_json(file_path)
                 else:
                     print(f"警告: 跳过不支持的文件类型: {file_path}")
-                    continue
+                    return []
             except Exception as e:
                 err = f"加载文件 {file_path} 失败: {e}"
                 result['errors'].append(err)
                 print(err)
-                continue
+                return []
 
-            if not current_papers:
-                print(f"⚠ 文件中没有论文数据")
-                continue
+        if not current_papers:
+            print(f"⚠ 文件中没有论文数据")
+            return []
 
-            print(f"读取到 {len(current_papers)} 篇论文")
+        file_result['loaded'] = len(current_papers)
+        print(f"读取到 {len(current_papers)} 篇论文")
 
-            # 2. 本地去重 (针对当前文件内的重复)
+        # 2. 本地去重 (针对当前文件内的重复)
+        with profile_span('dedup'):
             unique_papers = self._deduplicate_papers(current_papers)
             if len(unique_papers) < len(current_papers):
                 print(f"去重后剩余 {len(unique_papers)} 篇论文")
 
-            # 3. 数据预处理 (时间戳、贡献者、验证)
+        # 3. 数据预处理 (时间戳、贡献者、验证)
+        with profile_span('validate'):
             valid_papers = []
             for paper in unique_papers:
                 # 添加提交时间
                 if not paper.submission_time:
                     paper.submission_time = get_current_timestamp()
-                
+            
                 # 设置默认贡献者
                 if not paper.contributor:
                     paper.contributor = self.default_contributor
-                
+            
                 # 验证
                 errors = paper.is_valid()
                 if errors:
@@ -149,15 +209,19 @@ class UpdateProcessor:
                     print(f"警告: {error_msg}")
                 else:
                     valid_papers.append(paper)
-            
-            if not valid_papers:
-                continue
+        
+        if not valid_papers:
+            return []
 
-            # 4. AI 生成缺失内容并回写到 *当前文件*
+        # 4. AI 生成缺失内容并回写到 *当前文件*
+        with profile_span('ai_enrich'):
             if self.ai_generator.is_available():
                 print("使用AI生成缺失内容...")
                 try:
                     valid_papers, is_enhanced = self.ai_generator.batch_enhance_papers(valid_papers)
+                    # 请求失败（如持续限流）的论文逐篇计入错误，而不是当作“未生成”
+                    result['errors'].extend(f"[{os.path.basename(file_path)}] {err}"
+                                            for err in self.ai_generator.batch_errors)
                     if  is_enhanced:
                         # 回写到当前文件
                         try:
@@ -166,7 +230,7 @@ class UpdateProcessor:
                             err = f"回写AI内容到 {file_path} 失败: {e}"
                             print(err)
                             result['errors'].append(err)
-                        
+                    
                         # 统计
                         ai_count = 0
                         for p in valid_papers:
@@ -186,28 +250,59 @@ class UpdateProcessor:
                     result['errors'].append(err)
                     print(f"错误: {err}")
 
-            # 5. 添加到数据库
-            print(f"正在更新 {len(valid_papers)} 篇论文到数据库...")
-            try:
-                added, conflicts, invalid_msg = self.db_manager.add_papers(
-                    valid_papers, 
-                    conflict_resolution_strategy
-                )
-                total_added_papers.extend(added)
-                total_conflict_papers.extend(conflicts)
-                total_invalid_msg.extend(invalid_msg)
-                result['new_papers'] += len(added)
-            except Exception as e:
-                error_msg = f"数据库操作失败 ({file_path}): {e}"
-                result['errors'].append(error_msg)
-                print(f"错误: {error_msg}")
-                continue # 如果数据库写入失败，不进行后续的清理操作
+        file_result['valid'] = len(valid_papers)
+        return valid_papers
+
+    def _commit_staged_papers(self, staged: List[Tuple[str, List[Paper]]], conflict_resolution_strategy: str,
+                              result: Dict) -> Tuple[List[Paper], List[Paper], List[str]]:
+        """
+        将暂存的多个文件的论文合并后一次性写入数据库（一次加载、一次保存），
+        再按来源文件拆分结果，更新逐文件统计并清理各更新文件中已处理的论文
+        返回 (添加的论文, 冲突论文, 验证失败消息)
+        """
+        # 合并论文并记录来源文件
+        merged_papers = []
+        source_of = {}
+        for file_path, papers in staged:
+            for paper in papers:
+                source_of[id(paper)] = file_path
+                merged_papers.append(paper)
+        file_names = ", ".join(os.path.basename(file_path) for file_path, _ in staged)
+
+        # 5. 添加到数据库
+        print(f"\n正在更新 {len(merged_papers)} 篇论文到数据库（来源: {file_names}）...")
+        try:
+            added, conflicts, invalid_msg = self.db_manager.add_papers(
+                merged_papers, 
+                conflict_resolution_strategy
+            )
+            result['new_papers'] += len(added)
+            result['near_duplicates'].extend(self.db_manager.near_duplicate_msg)
+        except Exception as e:
+            error_msg = f"数据库操作失败 ({file_names}): {e}"
+            result['errors'].append(error_msg)
+            print(f"错误: {error_msg}")
+            return [], [], [] # 如果数据库写入失败，不进行后续的清理操作
+
+        # 按来源文件拆分结果
+        added_by_file = {file_path: [] for file_path, _ in staged}
+        for paper in added:
+            file_path = source_of.get(id(paper))
+            if file_path in added_by_file:
+                added_by_file[file_path].append(paper)
+        for paper in conflicts:
+            file_path = source_of.get(id(paper))
+            if file_path in result['file_results']:
+                result['file_results'][file_path]['conflicts'] += 1
+
+        for file_path, file_added in added_by_file.items():
+            result['file_results'][file_path]['added'] = len(file_added)
 
             # 6. 从 *当前文件* 移除已处理的论文
             if self.is_remove_added_paper==True:
                 try:
-                    self._remove_processed_papers(added, file_path)
-                    print(f"🗑️ 已从 {os.path.basename(file_path)} 移除 {len(added)} 篇已处理论文")
+                    self._remove_processed_papers(file_added, file_path)
+                    print(f"🗑️ 已从 {os.path.basename(file_path)} 移除 {len(file_added)} 篇已处理论文")
                     
                     # 如果是Excel，确保格式规范化 (修复表头样式)
                     if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
@@ -221,34 +316,8 @@ class UpdateProcessor:
                     result['errors'].append(err)
                     print(f"警告: {err}")
 
+        return added, conflicts, invalid_msg
 
-        
-        # 整理冲突信息
-        conflicts_list = []
-        for item in total_conflict_papers:
-            if isinstance(item, (list, tuple)) and len(item) == 2:
-                new_paper, existing_paper = item
-            else:
-                new_paper = item
-                existing_paper = None
-            conflicts_list.append({
-                'new': asdict(new_paper) if new_paper else None,
-                'existing': asdict(existing_paper) if existing_paper else None
-            })
-        result['conflicts'] = conflicts_list
-        # 整理验证失败信息
-        result['invalid_msg']=list(dict.fromkeys(total_invalid_msg))#去重
-
-        # 循环结束，整理最终结果
-        if result['new_papers'] > 0 or result['updated_papers'] > 0 or result['ai_generated'] > 0 or result['conflicts']:
-            result['success'] = True
-        elif not result['errors']:
-             # 没有错误，但也没添加或更改任何东西 (可能是文件为空)
-             pass
-        
-        return result
-    
-    
     def _deduplicate_papers(self, papers: List[Paper]) -> List[Paper]:
         """去重论文列表（基于所有非系统字段）"""
         unique_papers = []
@@ -288,10 +357,18 @@ class UpdateProcessor:
         
         if result['success']:
             print(f"✓ 成功添加 {result['new_papers']} 篇新论文")
+            for file_path, stats in result.get('file_results', {}).items():
+                print(f"  - {os.path.basename(file_path)}: 读取 {stats['loaded']} 篇，有效 {stats['valid']} 篇，"
+                      f"添加 {stats['added']} 篇，冲突 {stats['conflicts']} 篇")
             
             if result['ai_generated'] > 0:
                 print(f"✓ AI生成了 {result['ai_generated']} 篇论文的内容")
             
+            if result['near_duplicates']:
+                print(f"⚠ 发现 {len(result['near_duplicates'])} 篇疑似重复论文（标题与已有论文高度相似），已作为新论文添加，请人工确认")
+                for msg in result['near_duplicates']:
+                    print(f"  - {msg}")
+            
             if result['conflicts']:
                 print(f"⚠ 发现 {len(result['conflicts'])} 处冲突需要手动处理，已添加到数据库，请尽快处理并运行convert.py更新到readme")
                 for i, conflict in enumerate(result['conflicts'], 1):
@@ -312,8 +389,17 @@ class UpdateProcessor:
             for msg in result['invalid_msg']: 
                 print(f"  - {msg}")
     
-def main():
+def main(argv=None):
     """主函数"""
+    parser = argparse.ArgumentParser(description="将更新文件的内容更新到核心excel并重新生成README")
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='REPORT_PATH',
+                        help="输出各阶段耗时/调用次数/峰值内存的剖析报告（JSON + .folded 折叠栈），"
+                             "默认写入 cache_dir/profile/")
+    parser.add_argument('--export-excel', action='store_true',
+                        help="处理完成后将数据库重新导出为格式化的 core_excel（sqlite 存储引擎下 core_excel 为导出视图）")
+    args = parser.parse_args(argv)
+    profiler = enable_profiling('update') if args.profile is not None else None
+
     print("===！！！！注意：运行该脚本前请关闭核心excel文件，以免无法写入！！！！===\n！！！他只会默默处理完并尝试写入！！！\n！！！如若未关闭，请终止进程！！！")
     print("开始处理更新文件...")
     
@@ -324,14 +410,19 @@ def main():
     
     # 发送通知
     processor.print_result(result)
-    backup_file("figures","backups")
+    with profile_span('backup_figures'):
+        backup_file("figures","backups")
+    if args.export_excel:
+        with profile_span('export_excel'):
+            processor.db_manager.export_excel()
     # 如果更新成功，重新生成README
     if result['success']:  #and result['new_papers'] > 0
         print("\n重新生成README...")
         try:
             from src.convert import ReadmeGenerator
             generator = ReadmeGenerator()
-            success = generator.update_readme_file()
+            with profile_span('readme'):
+                success = generator.update_readme_file()
             
             if success:
                 print("✓ README更新成功")
@@ -343,6 +434,11 @@ def main():
         except Exception as e:
             print(f"⚠ 重新生成README时出错: {e}")
 
+    if profiler is not None:
+        profiler.print_summary()
+        report_path = profiler.write_report(args.profile or default_report_path('update'))
+        print(f"剖析报告已写入: {report_path}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
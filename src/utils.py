@@ -6,6 +6,7 @@ import shutil
 import os
 import re
 import json
+import hashlib
 from typing import List, Dict, Any, Optional,Tuple
 from datetime import datetime
 from pathlib import Path
@@ -352,6 +353,30 @@ def ensure_directory(path: str) -> bool:
 
 
 
+def compute_file_hash(filepath: str, algorithm: str = "sha256", chunk_size: int = 1024 * 1024) -> str:
+    """计算文件内容哈希（分块读取，避免大文件一次性载入内存）"""
+    h = hashlib.new(algorithm)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def get_file_signature(filepath: str, with_hash: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    获取文件签名，用于判断缓存是否失效
+    返回 {'mtime_ns', 'size'[, 'sha256']}，文件不存在时返回 None
+    """
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    signature = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+    if with_hash:
+        signature['sha256'] = compute_file_hash(filepath)
+    return signature
+
+
 def truncate_text(text: str, max_length: int, ellipsis: str = "...") -> str:
     """截断文本，保留最大长度"""
     if not text:
@@ -569,21 +594,32 @@ def figure_exists_in_repo(figure_path: str, project_root: str = None) -> bool:
     return os.path.isfile(full_path)
 
 
+def _get_backup_retention() -> Tuple[int, int]:
+    """读取 [backup] 保留策略 (keep_last, keep_daily)，缺失或无效时使用默认值 (20, 30)"""
+    try:
+        from src.core.config_loader import get_config_instance
+        backup_settings = get_config_instance().settings.get('backup', {})
+        return int(backup_settings.get('keep_last', 20)), int(backup_settings.get('keep_daily', 30))
+    except Exception:
+        return 20, 30
+
+
 def backup_file(filepath: str, backup_dir: str) -> Optional[str]:
     """
     统一备份文件/文件夹函数（兼容文件和文件夹）
     逻辑：
-    - 文件：原文件名(无后缀) + "__backup_" + timestamp + 后缀
-      例如：data.xlsx -> data__backup_20250101_120000.xlsx
-    - 文件夹：原文件夹名 + "__backup_" + timestamp
-      例如：figures -> figures__backup_20250101_120000
+    - 文件：存入 backup_dir/store 内容寻址备份存储（按内容去重、gzip 压缩，清单记录时间/源路径/哈希），
+      并按 [backup] 的 keep_last / keep_daily 保留策略清理旧快照，详见 src/backup_store.py
+    - 文件夹：存入 backup_dir/store/snapshots 增量快照（类似 rsync --link-dest），
+      未变化的文件硬链接到上一次快照，仅复制新增或修改的文件
+    恢复备份见 scripts/restore_backup.py
     
     参数:
         filepath: 源文件/文件夹路径
         backup_dir: 备份目录路径
     
     返回:
-        备份路径（文件/文件夹），失败则返回 None
+        备份路径（文件为压缩对象路径，文件夹为快照文件夹），失败则返回 None
     """
     # 检查源路径是否存在
     if not os.path.exists(filepath):
@@ -596,26 +632,18 @@ def backup_file(filepath: str, backup_dir: str) -> Optional[str]:
         
         # 解析源路径的基础名称（文件名/文件夹名）
         base_name = os.path.basename(filepath)
-        # 生成时间戳
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # 区分处理：文件 vs 文件夹
         if os.path.isfile(filepath):
-            # 处理文件：拆分后缀
-            name, ext = os.path.splitext(base_name)
-            backup_name = f"{name}__backup_{timestamp}{ext}"
-            backup_path = os.path.join(backup_dir, backup_name)
-            # 复制文件（保留元数据）
-            shutil.copy2(filepath, backup_path)
+            # 处理文件：存入内容寻址备份存储（内容未变化时不新增快照）
+            from src.backup_store import BackupStore
+            keep_last, keep_daily = _get_backup_retention()
+            backup_path = BackupStore(backup_dir, keep_last=keep_last, keep_daily=keep_daily).backup(filepath)
         elif os.path.isdir(filepath):
-            # 处理文件夹：无后缀，直接拼接
-            backup_name = f"{base_name}__backup_{timestamp}"
-            backup_path = os.path.join(backup_dir, backup_name)
-            # 递归复制文件夹（处理目标已存在的情况）
-            if os.path.exists(backup_path):
-                # 若备份文件夹已存在，追加随机后缀避免冲突（可选逻辑）
-                backup_path += f"_{os.urandom(4).hex()}"
-            shutil.copytree(filepath, backup_path)
+            # 处理文件夹：增量快照，未变化的文件硬链接到上一次快照（内容未变化时不新增快照）
+            from src.backup_store import BackupStore
+            keep_last, keep_daily = _get_backup_retention()
+            backup_path = BackupStore(backup_dir, keep_last=keep_last, keep_daily=keep_daily).snapshot_directory(filepath)
         else:
             print(f"❌ [备份失败] 既不是文件也不是文件夹: {filepath}")
             return None
@@ -0,0 +1,55 @@
+"""Shared pytest fixtures: isolated copies of the core database in a temporary directory"""
+import sys
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from src.core.database_manager import DatabaseManager
+
+
+class TempDatabaseFactory:
+    """在同一临时目录下创建相互隔离的 DatabaseManager，避免测试污染真实数据"""
+
+    def __init__(self, temp_dir: str):
+        self.temp_dir = temp_dir
+
+    def __call__(self, name: str = '', backend: str = 'excel', db: DatabaseManager = None) -> DatabaseManager:
+        """
+        复制核心数据库到 temp_dir/name 下，并将 db（默认新建）的数据库、缓存、备份与 SQLite 路径指向该目录
+
+        Args:
+            name: 子目录名，同一测试中创建多个数据库时用于区分
+            backend: 存储引擎（excel / sqlite）
+            db: 已有的 DatabaseManager（如 UpdateProcessor.db_manager）；为 None 时新建
+        """
+        db = db or DatabaseManager()
+        base_dir = os.path.join(self.temp_dir, name)
+        os.makedirs(base_dir, exist_ok=True)
+        temp_excel = os.path.join(base_dir, os.path.basename(db.core_excel_path))
+        shutil.copy2(db.core_excel_path, temp_excel)
+        db.core_excel_path = temp_excel
+        db.cache_dir = os.path.join(base_dir, '.cache')
+        db.backup_dir = os.path.join(base_dir, 'backups')
+        db.storage_backend = backend
+        db.core_sqlite_path = db.sqlite_storage.db_path = os.path.join(base_dir, 'papers.sqlite3')
+        return db
+
+
+@contextmanager
+def temp_db_factory():
+    """创建临时目录并返回 TempDatabaseFactory，退出时删除该目录（供脚本方式运行测试时使用）"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        yield TempDatabaseFactory(temp_dir)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def temp_db():
+    """临时数据库工厂：temp_db(name='', backend='excel', db=None) -> DatabaseManager"""
+    with temp_db_factory() as factory:
+        yield factory
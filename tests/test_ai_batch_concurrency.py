@@ -0,0 +1,67 @@
+"""Test concurrent AIGenerator.batch_enhance_papers and the per-profile rate limiter"""
+import sys
+import os
+import time
+import random
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_generator import AIGenerator, _TokenBucket, _get_rate_limiter
+from src.core.database_model import Paper
+
+
+def test_token_bucket_limits_rate():
+    """令牌用尽后应按补充速率放行"""
+    bucket = _TokenBucket(rate=20.0, capacity=2)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # 前 2 个立即放行，其余 4 个约需 4 / 20 = 0.2 秒
+    assert time.monotonic() - start >= 0.18
+
+
+def test_rate_limiter_shared_per_profile():
+    """同一 (provider, profile) 共享令牌桶，不同 Profile 互不影响"""
+    a = _get_rate_limiter('deepseek', 'profile_a', 60, 4)
+    assert _get_rate_limiter('deepseek', 'profile_a', 60, 4) is a
+    assert _get_rate_limiter('deepseek', 'profile_b', 60, 4) is not a
+    assert _get_rate_limiter('deepseek', 'profile_a', 120, 4) is not a
+
+
+def test_batch_enhance_keeps_input_order():
+    """并发处理的结果应按输入顺序合并"""
+    gen = AIGenerator()
+    gen.is_available = lambda: True
+    gen.max_concurrency = 4
+    active = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def fake_enhance(paper, paper_text="", fields_to_gen=None):
+        with lock:
+            active.append(paper.title)
+            peak[0] = max(peak[0], len(active))
+        time.sleep(random.uniform(0.001, 0.02))
+        with lock:
+            active.remove(paper.title)
+        if paper.title.endswith('3'):
+            raise RuntimeError("api down")
+        enhanced = Paper.from_dict({'title': paper.title, 'notes': f"enhanced {paper.title}"})
+        return enhanced, paper.title.endswith('5')
+
+    gen.enhance_paper_with_ai = fake_enhance
+    papers = [Paper.from_dict({'title': f"paper {i}"}) for i in range(12)]
+    enhanced, is_enhanced = gen.batch_enhance_papers(papers)
+
+    assert [p.title for p in enhanced] == [p.title for p in papers]
+    assert enhanced[3] is papers[3]  # 失败的论文保留原对象
+    assert enhanced[0].notes == "enhanced paper 0"
+    assert is_enhanced
+    assert 1 < peak[0] <= 4
+
+
+if __name__ == "__main__":
+    test_token_bucket_limits_rate()
+    test_rate_limiter_shared_per_profile()
+    test_batch_enhance_keeps_input_order()
+    print("AI 并发批处理测试通过")
@@ -0,0 +1,64 @@
+"""Test combined JSON generation of AI fields in AIGenerator.enhance_paper_with_ai"""
+import sys
+import os
+import json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_generator import AIGenerator
+from src.core.database_model import Paper
+
+
+def _make_generator(combined_reply):
+    """返回 (生成器, 请求记录)；合并请求返回 combined_reply，单字段请求返回固定文本"""
+    gen = AIGenerator()
+    gen.is_available = lambda: True
+    gen.combined_generation = True
+    prompts = []
+
+    def fake_call_api(prompt, max_tokens=200):
+        prompts.append(prompt)
+        return combined_reply if "Response Format: ONLY a JSON object" in prompt else "single field"
+
+    gen._call_api = fake_call_api
+    return gen, prompts
+
+
+def test_combined_generation_with_fallback():
+    """JSON 中有效的字段一次取得，缺失或为空的字段逐个回退生成"""
+    reply = "```json\n" + json.dumps({
+        'title_translation': '标题',
+        'analogy_summary': 'analogy [翻译] 类比',
+        'summary_motivation': 'motivation',
+        'summary_innovation': '',
+        'summary_method': 'method',
+        'summary_conclusion': 'conclusion',
+    }, ensure_ascii=False) + "\n```"
+    gen, prompts = _make_generator(reply)
+    paper = Paper.from_dict({'title': 'A paper', 'abstract': 'Abstract', 'summary_method': 'kept'})
+
+    enhanced, changed = gen.enhance_paper_with_ai(paper)
+
+    assert changed
+    assert len(prompts) == 3  # 1 次合并请求 + summary_innovation、summary_limitation 两次回退
+    assert '"summary_method"' not in prompts[0]  # 已有内容的字段不请求
+    assert enhanced.title_translation == f"{gen.ai_generate_mark} 标题"
+    assert enhanced.summary_motivation == f"{gen.ai_generate_mark} motivation"
+    assert enhanced.summary_innovation == f"{gen.ai_generate_mark} single field"
+    assert enhanced.summary_limitation == f"{gen.ai_generate_mark} single field"
+    assert enhanced.summary_method == 'kept'
+
+
+def test_invalid_json_falls_back_to_single_fields():
+    """回复无法解析为 JSON 时所有字段逐个生成"""
+    gen, prompts = _make_generator("Sorry, I cannot answer in JSON.")
+    paper = Paper.from_dict({'title': 'A paper', 'abstract': 'Abstract'})
+    enhanced, changed = gen.enhance_paper_with_ai(paper, fields_to_gen=['title_translation', 'analogy_summary'])
+    assert changed
+    assert len(prompts) == 3
+    assert enhanced.analogy_summary == f"{gen.ai_generate_mark} single field"
+
+
+if __name__ == "__main__":
+    test_combined_generation_with_fallback()
+    test_invalid_json_falls_back_to_single_fields()
+    print("AI 合并生成测试通过")
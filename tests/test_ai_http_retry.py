@@ -0,0 +1,108 @@
+"""Test pooled sessions and retry/backoff of AIGenerator._post_with_retry against a local HTTP server"""
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.database_model import Paper
+from src.ai_generator import AIGenerator, AIProviderError, _parse_retry_after
+
+
+def _start_server(statuses):
+    """依次返回 statuses 中的状态码（用尽后返回 200），记录每次请求"""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            requests_seen.append(json.loads(body))
+            status = statuses.pop(0) if statuses else 200
+            payload = json.dumps({'choices': [{'message': {'content': 'ok'}}]}).encode('utf-8')
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v1/chat/completions", requests_seen
+
+
+def _make_generator(max_retries):
+    gen = AIGenerator()
+    gen.max_retries = max_retries
+    gen.retry_backoff = 0.0
+    return gen
+
+
+def test_retries_transient_errors():
+    """429 与 5xx 会被重试，最终成功返回内容"""
+    server, url, seen = _start_server([429, 503])
+    try:
+        gen = _make_generator(max_retries=3)
+        content = gen._call_openai_style('sk-test', url, 'test-model', 'hello', 10)
+        assert content == 'ok'
+        assert len(seen) == 3
+    finally:
+        server.shutdown()
+
+
+def test_gives_up_after_max_retries():
+    """重试用尽后抛出 AIProviderError，不再无限重试，也不会当作“未生成”返回 None"""
+    server, url, seen = _start_server([500, 500, 500])
+    try:
+        gen = _make_generator(max_retries=1)
+        try:
+            gen._call_openai_style('sk-test', url, 'test-model', 'hello', 10)
+            assert False, "应当抛出 AIProviderError"
+        except AIProviderError as e:
+            assert "HTTP 500" in str(e)
+        assert len(seen) == 2
+    finally:
+        server.shutdown()
+
+
+def test_batch_reports_provider_errors_per_paper():
+    """批量增强时持续限流的论文逐篇记录错误并保留原内容，字段不会被静默留空"""
+    server, url, seen = _start_server([429] * 100)
+    try:
+        gen = _make_generator(max_retries=1)
+        gen.enabled = True
+        gen.combined_generation = True
+        gen.response_cache = None
+        gen.active_profile = dict(gen.active_profile or {}, provider='openai_compatible', api_url=url,
+                                  model='test-model', api_key_source='sk-test-key-for-retry')
+        gen.is_available = lambda: True
+        papers = [Paper(title=f"Rate limited paper {i}", abstract="abstract") for i in range(3)]
+        enhanced, is_enhanced = gen.batch_enhance_papers(papers)
+        assert not is_enhanced
+        assert enhanced == papers
+        assert len(gen.batch_errors) == 3
+        assert all("HTTP 429" in err for err in gen.batch_errors)
+    finally:
+        server.shutdown()
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after('5') == 5.0
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after('not a date') is None
+    assert _parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+
+if __name__ == "__main__":
+    test_retries_transient_errors()
+    test_gives_up_after_max_retries()
+    test_batch_reports_provider_errors_per_paper()
+    test_parse_retry_after()
+    print("AI 请求重试测试通过")
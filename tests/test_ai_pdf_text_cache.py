@@ -0,0 +1,71 @@
+"""Test the hash-keyed PDF text extraction cache of AIGenerator.read_paper_file"""
+import sys
+import os
+import shutil
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_generator import AIGenerator
+
+
+def _write_pdf(path, page_texts):
+    """写入每页一行文字的最小 PDF"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content_id} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>".encode('latin-1'))
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode('latin-1')
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_pdf_text_cache_and_lazy_extraction():
+    """提取结果按内容哈希缓存；只提取到足够字符为止，需要更多字符时再补充提取"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        gen = AIGenerator()
+        gen.settings = dict(gen.settings, paths=dict(gen.settings['paths'], paper_dir=temp_dir))
+        pdf_path = os.path.join(temp_dir, 'paper.pdf')
+        pages = [f"Page {i} " + "x" * 40 for i in range(12)]
+        _write_pdf(pdf_path, pages)
+
+        short = gen.read_paper_file(pdf_path, max_chars=60)
+        assert short.startswith("Page 0") and len(short) == 60
+        cache_path = gen._get_pdf_text_cache_path(pdf_path)
+        cached = gen._load_pdf_text_cache(cache_path)
+        assert cached['complete'] is False and "Page 3" not in cached['text']
+
+        # 缓存命中时不再解析 PDF：篡改缓存内容后应原样返回
+        gen._save_pdf_text_cache(cache_path, "cached text " * 10, False)
+        assert gen.read_paper_file(pdf_path, max_chars=60) == ("cached text " * 10)[:60]
+
+        # 需要的字符超出缓存时重新提取全部所选页面（前5页 + 后5页）
+        full = gen.read_paper_file(pdf_path)
+        assert "Page 4" in full and "Page 5" not in full and "Page 11" in full
+        assert gen._load_pdf_text_cache(cache_path)['complete'] is True
+
+        # 文件内容变化后缓存键随之变化
+        _write_pdf(pdf_path, ["Changed " + "y" * 40])
+        assert gen.read_paper_file(pdf_path).startswith("Changed")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_pdf_text_cache_and_lazy_extraction()
+    print("PDF 提取缓存测试通过")
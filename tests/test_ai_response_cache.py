@@ -0,0 +1,66 @@
+"""Test the persistent AI response cache used by AIGenerator._call_api"""
+import sys
+import os
+import time
+import shutil
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_generator import AIGenerator
+from src.ai_response_cache import AIResponseCache
+
+
+def test_ttl_and_size_eviction():
+    """过期条目不再命中；超出大小上限时淘汰最久未使用的条目"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        cache = AIResponseCache(os.path.join(temp_dir, 'ai.sqlite3'), ttl_days=1, max_mb=0)
+        cache.put('old', 'deepseek', 'm', 200, 'stale')
+        cache._connect().execute("UPDATE responses SET created = ?", (time.time() - 2 * 86400,))
+        assert cache.get('old') is None
+
+        cache = AIResponseCache(os.path.join(temp_dir, 'ai.sqlite3'), ttl_days=0, max_mb=0)
+        cache.max_bytes = 25
+        for key in ('a', 'b', 'c'):
+            cache.put(key, 'deepseek', 'm', 200, key * 10)
+            time.sleep(0.01)
+        assert cache.get('a') is None  # 30 字节 > 25，最旧的 a 被淘汰
+        assert cache.get('b') == 'b' * 10
+        assert cache.get('c') == 'c' * 10
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_call_api_reuses_cached_response():
+    """相同 provider/model/max_tokens/提示词只请求一次；bypass_cache 时重新请求并刷新缓存"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        calls = []
+
+        def make_generator(bypass_cache=False):
+            gen = AIGenerator(bypass_cache=bypass_cache)
+            gen.active_profile = dict(gen.active_profile or {}, provider='deepseek', model='test-model',
+                                      api_key_source='sk-test-0123456789abcdef')
+            gen.requests_per_minute = 0
+            gen.response_cache = AIResponseCache(os.path.join(temp_dir, 'ai.sqlite3'))
+            gen._call_openai_style = lambda key, url, model, prompt, max_tokens: calls.append(prompt) or f"answer {len(calls)}"
+            return gen
+
+        gen = make_generator()
+        assert gen._call_api("translate", max_tokens=200) == "answer 1"
+        assert gen._call_api("translate", max_tokens=200) == "answer 1"
+        assert gen._call_api("translate", max_tokens=300) == "answer 2"
+        assert len(calls) == 2
+
+        forced = make_generator(bypass_cache=True)
+        assert forced._call_api("translate", max_tokens=200) == "answer 3"
+        assert make_generator()._call_api("translate", max_tokens=200) == "answer 3"
+        assert len(calls) == 3
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_ttl_and_size_eviction()
+    test_call_api_reuses_cached_response()
+    print("AI 响应缓存测试通过")
@@ -0,0 +1,97 @@
+"""Test content-addressed backup store used by backup_file"""
+import sys
+import os
+import shutil
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backup_store import BackupStore
+from src.utils import backup_file
+
+
+def _write(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def test_dedup_and_restore():
+    """相同内容不新增快照；快照可恢复为原内容"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(temp_dir, 'data.xlsx')
+        backup_dir = os.path.join(temp_dir, 'backups')
+        _write(source, b'version 1' * 1000)
+
+        first = backup_file(source, backup_dir)
+        assert first and first.endswith('.gz')
+        assert backup_file(source, backup_dir) == first
+        store = BackupStore(backup_dir)
+        assert len(store.list_snapshots(source)) == 1
+
+        _write(source, b'version 2' * 1000)
+        backup_file(source, backup_dir)
+        snapshots = store.list_snapshots(source)
+        assert len(snapshots) == 2 and snapshots[0]['hash'] != snapshots[1]['hash']
+
+        restored = store.restore(snapshots[0]['id'], os.path.join(temp_dir, 'restored.xlsx'))
+        with open(restored, 'rb') as f:
+            assert f.read() == b'version 1' * 1000
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_retention_removes_unreferenced_objects():
+    """超出保留策略的快照被移除，其对象在不再被引用时删除"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(temp_dir, 'data.json')
+        store = BackupStore(os.path.join(temp_dir, 'backups'), keep_last=2, keep_daily=0)
+        objects = []
+        for i in range(4):
+            _write(source, f'content {i}'.encode())
+            objects.append(store.backup(source))
+
+        assert [s['hash'] for s in store.list_snapshots(source)] == \
+            [os.path.basename(p)[:-3] for p in objects[-2:]]
+        assert not os.path.exists(objects[0]) and not os.path.exists(objects[1])
+        assert os.path.exists(objects[2]) and os.path.exists(objects[3])
+        print("备份存储测试通过")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_directory_snapshot_hardlinks_and_restore():
+    """文件夹快照：未变化文件硬链接复用，内容不变不新增快照，可整体恢复"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        figures = os.path.join(temp_dir, 'figures')
+        os.makedirs(os.path.join(figures, 'sub'))
+        _write(os.path.join(figures, 'a.png'), b'a' * 100)
+        _write(os.path.join(figures, 'sub', 'b.png'), b'b' * 100)
+        backup_dir = os.path.join(temp_dir, 'backups')
+
+        first = backup_file(figures, backup_dir)
+        assert backup_file(figures, backup_dir) == first
+
+        _write(os.path.join(figures, 'c.png'), b'c' * 100)
+        second = backup_file(figures, backup_dir)
+        assert second != first
+        assert os.stat(os.path.join(second, 'a.png')).st_ino == os.stat(os.path.join(first, 'a.png')).st_ino
+        assert os.path.exists(os.path.join(second, 'c.png')) and not os.path.exists(os.path.join(first, 'c.png'))
+
+        store = BackupStore(backup_dir)
+        snapshots = store.list_snapshots(figures)
+        assert [s['files'] for s in snapshots] == [2, 3]
+
+        # 恢复第一次快照，覆盖当前文件夹
+        store.restore(snapshots[0]['id'])
+        assert sorted(os.listdir(figures)) == ['a.png', 'sub']
+        assert os.stat(os.path.join(figures, 'a.png')).st_ino != os.stat(os.path.join(first, 'a.png')).st_ino
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_dedup_and_restore()
+    test_retention_removes_unreferenced_objects()
+    test_directory_snapshot_hardlinks_and_restore()
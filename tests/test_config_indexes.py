@@ -0,0 +1,48 @@
+"""Test indexed lookups and cached views of ConfigLoader"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.config_loader import ConfigLoader
+
+
+def test_indexed_lookups_match_config():
+    """索引查询结果应与直接扫描配置一致"""
+    config = ConfigLoader()
+    for tag in config.tags_config.get('tags', []):
+        expected = next(t for t in config.tags_config['tags'] if t.get('variable') == tag.get('variable'))
+        assert config.get_tag_by_variable(tag.get('variable')) is expected
+    assert config.get_tag_by_variable('no_such_variable') is None
+
+    for category in config.categories_config.get('categories', []):
+        assert config.get_category_by_unique_name(category['unique_name'])['unique_name'] == category['unique_name']
+        assert config.get_category_by_name_or_unique_name(category['name']) is not None
+    assert config.get_category_field('no_such_category', 'name') == ''
+
+    # 一级/二级分类视图与启用分类列表一致
+    active = config.get_active_categories()
+    parents = config.get_primary_categories()
+    assert parents == [c for c in active if c.get('primary_category') is None]
+    for parent in parents:
+        children = config.get_child_categories(parent['unique_name'])
+        assert children == [c for c in active if c.get('primary_category') == parent['unique_name']]
+
+
+def test_cached_views_are_copies_and_reload_rebuilds():
+    """返回的列表为副本，修改不影响缓存；reload 后重建索引"""
+    config = ConfigLoader()
+    tags = config.get_active_tags()
+    tags.clear()
+    assert config.get_active_tags()
+
+    version = config.get_config_version()
+    config.reload()
+    assert config.get_config_version() == version
+    assert len(config.get_active_tags()) == len([t for t in config.tags_config['tags']
+                                                 if t.get('immutable', False) or t.get('enabled', False)])
+    print("配置索引测试通过")
+
+
+if __name__ == "__main__":
+    test_indexed_lookups_match_config()
+    test_cached_views_are_copies_and_reload_rebuilds()
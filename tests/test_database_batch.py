@@ -0,0 +1,41 @@
+"""Test batch update/delete API of DatabaseManager"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.database_model import Paper
+from conftest import temp_db_factory
+
+
+def test_apply_batch_single_save(temp_db):
+    """批量操作只保存一次，并逐项返回结果"""
+    db = temp_db()
+    papers = db.update_utils.excel_to_paper(db.load_database(), only_non_system=False, skip_invalid=False)
+    save_calls = []
+    original_save = db.save_database
+    db.save_database = lambda df, pw="": save_calls.append(1) or original_save(df, pw)
+
+    renamed = Paper(doi=papers[0].doi, title="Batch Renamed Title")
+    saved, results = db.apply_batch([
+        ('update', papers[0], {'title': renamed.title, 'notes': 'batch test'}),
+        ('update', renamed, {'notes': 'batch test 2'}),  # 同批次内按新标题可找到
+        ('delete', papers[1], None),
+        ('delete', Paper(doi="10.0000/not-exist", title="Not Exist"), None),
+        ('rename', papers[2], None),
+    ])
+    assert saved and len(save_calls) == 1
+    assert [r['success'] for r in results] == [True, True, True, False, False]
+
+    after = db.update_utils.excel_to_paper(db.load_database(), only_non_system=False, skip_invalid=False)
+    assert len(after) == len(papers) - 1
+    assert any(p.title == renamed.title and p.notes == 'batch test 2' for p in after)
+
+    # 全部未命中时不写入数据库
+    saved, results = db.delete_papers([Paper(doi="10.0000/not-exist", title="Not Exist")])
+    assert not saved and not results[0]['success'] and len(save_calls) == 1
+    print("批量操作测试通过")
+
+
+if __name__ == "__main__":
+    with temp_db_factory() as factory:
+        test_apply_batch_single_save(factory)
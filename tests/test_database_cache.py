@@ -0,0 +1,79 @@
+"""Test sidecar cache of DatabaseManager.load_database"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd
+import src.core.database_manager as database_manager
+from src.core.database_manager import DatabaseManager
+from conftest import temp_db_factory
+
+
+def test_sidecar_cache_hit_and_rebuild(temp_db):
+    """缓存命中后内容一致；xlsx 变化后缓存自动重建"""
+    db = temp_db()
+    df_first = db.load_database()
+    data_path, meta_path = db._get_sidecar_cache_paths()
+    assert os.path.exists(data_path) and os.path.exists(meta_path)
+
+    df_cached = db.load_database()
+    assert df_cached.equals(df_first)
+
+    # 仅修改 mtime（内容不变）仍命中缓存
+    os.utime(db.core_excel_path)
+    assert db.load_database().equals(df_first)
+
+    # 内容变化后重建缓存
+    papers = db.update_utils.excel_to_paper(df_first, only_non_system=False, skip_invalid=False)
+    df_new = db.update_utils.paper_to_excel(papers[1:], only_non_system=False, skip_invalid=False)
+    assert db.save_database(df_new)
+    assert len(db.load_database()) == len(df_first) - 1
+    print("侧车缓存测试通过")
+
+
+def test_sidecar_cache_invalidated_by_column_order(temp_db):
+    """tag_config 列顺序变化时缓存失效"""
+    db = temp_db()
+    db.load_database()
+    columns = db.update_utils._regenerate_columns_from_tags(db.config)
+    assert db._read_sidecar_cache(columns) is not None
+    assert db._read_sidecar_cache(list(reversed(columns))) is None
+
+
+def test_save_refreshes_sidecar_cache(temp_db):
+    """全量与增量保存后直接重建缓存：随后的加载不解析xlsx，且结果与重新解析一致"""
+    db = temp_db()
+    original_read_excel = database_manager.pd.read_excel
+    try:
+        papers = db.update_utils.excel_to_paper(db.load_database(), only_non_system=False, skip_invalid=False)
+        papers[0].notes = "2024"
+        papers[1].conference = "1.5"
+        df = db.update_utils.paper_to_excel(papers[1:], only_non_system=False, skip_invalid=False)
+        df = df.astype(object)
+        df.iloc[0, df.columns.get_loc('notes')] = 2024
+
+        for ratio in (-1, DatabaseManager.DELTA_SAVE_MAX_RATIO):
+            db.DELTA_SAVE_MAX_RATIO = ratio  # -1：强制全量重写；默认值：增量写入
+            assert db.save_database(df)
+            reads = []
+            database_manager.pd.read_excel = lambda *a, **k: reads.append(1) or original_read_excel(*a, **k)
+            try:
+                cached = db.load_database()
+            finally:
+                database_manager.pd.read_excel = original_read_excel
+            assert reads == []
+            expected = db._ensure_columns_exist(pd.read_excel(db.core_excel_path, engine='openpyxl'))
+            pd.testing.assert_frame_equal(cached, expected)
+            papers = db.update_utils.excel_to_paper(cached, only_non_system=False, skip_invalid=False)
+            papers[2].notes = "delta save"
+            df = db.update_utils.paper_to_excel(papers, only_non_system=False, skip_invalid=False)
+        print("保存后侧车缓存测试通过")
+    finally:
+        database_manager.pd.read_excel = original_read_excel
+
+
+if __name__ == "__main__":
+    for test in (test_sidecar_cache_hit_and_rebuild, test_sidecar_cache_invalidated_by_column_order,
+                 test_save_refreshes_sidecar_cache):
+        with temp_db_factory() as factory:
+            test(factory)
@@ -0,0 +1,47 @@
+"""Test delta writes of DatabaseManager.save_database"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from openpyxl import load_workbook
+from conftest import temp_db_factory
+
+
+def _make_saved_db(temp_db, name):
+    """创建临时数据库"""
+    db = temp_db(name)
+    # 先全量保存一次，使工作簿列结构与当前 tag_config 一致
+    papers = db.update_utils.excel_to_paper(db.load_database(), only_non_system=False, skip_invalid=False)
+    db.save_database(db.update_utils.paper_to_excel(papers, only_non_system=False, skip_invalid=False))
+    return db
+
+
+def _read_cells(path):
+    ws = load_workbook(path)['Papers']
+    return [[(c.value, c.fill.fill_type and c.fill.fgColor.rgb) for c in row] for row in ws.iter_rows()]
+
+
+def test_delta_save_matches_full_rewrite(temp_db):
+    """增量写入的结果应与全量重写一致"""
+    delta_db = _make_saved_db(temp_db, 'delta')
+    full_db = _make_saved_db(temp_db, 'full')
+    full_db.DELTA_SAVE_MAX_RATIO = -1  # 强制全量重写
+
+    delta_calls = []
+    original_delta = delta_db._save_database_delta
+    delta_db._save_database_delta = lambda df, pw="": delta_calls.append(original_delta(df, pw)) or delta_calls[-1]
+
+    for db in (delta_db, full_db):
+        papers = db.update_utils.excel_to_paper(db.load_database(), only_non_system=False, skip_invalid=False)
+        assert db.update_paper(papers[3], {'notes': 'delta save test'})
+        papers = db.update_utils.excel_to_paper(db.load_database(), only_non_system=False, skip_invalid=False)
+        assert db.delete_paper(papers[-1])
+
+    assert delta_calls == [True, True]
+    assert _read_cells(delta_db.core_excel_path) == _read_cells(full_db.core_excel_path)
+    print("增量写入测试通过")
+
+
+if __name__ == "__main__":
+    with temp_db_factory() as factory:
+        test_delta_save_matches_full_rewrite(factory)
@@ -0,0 +1,75 @@
+"""Test conditional-formatting based conflict/invalid highlighting of the core database"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from openpyxl import load_workbook
+from src.core.database_manager import DatabaseManager
+from conftest import temp_db_factory
+
+
+def _highlight_rules(path):
+    ws = load_workbook(path)['Papers']
+    rules = [(str(cf.sqref), rule.priority, rule.formula[0], rule.dxf.fill.fgColor.rgb)
+             for cf in ws.conditional_formatting for rule in cf.rules]
+    static_fills = {c.fill.fill_type for row in ws.iter_rows(min_row=2) for c in row}
+    return sorted(rules, key=lambda r: r[1]), static_fills
+
+
+def test_highlight_rules_full_and_delta_save(temp_db):
+    """全量写入与增量写入均以少量条件格式规则高亮，数据单元格不带逐单元格填充"""
+    db = temp_db()
+
+    df = db.update_utils.normalize_dataframe_columns(db.load_database(), db.config)
+    conflict_col = db.config.get_tag_field("conflict_marker", "table_name")
+    invalid_col = db.config.get_tag_field("invalid_fields", "table_name")
+    conflict_letter = chr(65 + df.columns.get_loc(conflict_col))
+    invalid_letter = chr(65 + df.columns.get_loc(invalid_col))
+    conflict_color, invalid_color = (fill.fgColor.rgb for fill in db._get_highlight_fills())
+
+    db.DELTA_SAVE_MAX_RATIO = -1  # 强制全量重写
+    df.loc[2, conflict_col] = True
+    assert db.save_database(df)
+    rules, static_fills = _highlight_rules(db.core_excel_path)
+    assert static_fills == {None}
+    assert len(rules) == 2
+    data_range = f"A2:{chr(64 + len(df.columns))}{db.HIGHLIGHT_MAX_ROW}"
+    (invalid_range, _, invalid_formula, invalid_rgb), (conflict_range, _, conflict_formula, conflict_rgb) = rules
+    assert invalid_range == conflict_range == data_range
+    assert f"${invalid_letter}2" in invalid_formula and "COLUMN()-1" in invalid_formula
+    assert f"${conflict_letter}2" in conflict_formula
+    assert (invalid_rgb, conflict_rgb) == (invalid_color, conflict_color)
+
+    # 增量写入后规则保持不变（不随行数增加）
+    db.DELTA_SAVE_MAX_RATIO = 0.5
+    delta_calls = []
+    original_delta = db._save_database_delta
+    db._save_database_delta = lambda df, pw="": delta_calls.append(original_delta(df, pw)) or delta_calls[-1]
+    df.loc[5, invalid_col] = '1,3'
+    assert db.save_database(df)
+    assert delta_calls == [True]
+    assert _highlight_rules(db.core_excel_path) == (rules, {None})
+    print("条件格式高亮测试通过")
+
+
+def test_render_rows_prefixes_conflict_doi():
+    """冲突行的 DOI 加冲突标记（已带标记或为空的不重复添加）"""
+    db = DatabaseManager()
+    db.conflict_marker = "[conflict]"
+    df = db.update_utils.normalize_dataframe_columns(db.load_database().head(4), db.config)
+    conflict_col = db.config.get_tag_field("conflict_marker", "table_name")
+    df[conflict_col] = [False, True, True, True]
+    df.loc[2, 'doi'] = "[conflict] 10.1/already"
+    df.loc[3, 'doi'] = ""
+    doi_idx = df.columns.get_loc('doi')
+    dois = [row[doi_idx] for row in db._render_excel_rows(df)]
+    assert dois[0] == df['doi'][0]
+    assert dois[1] == f"[conflict] {df['doi'][1]}"
+    assert dois[2:] == ["[conflict] 10.1/already", ""]
+    print("冲突 DOI 标记测试通过")
+
+
+if __name__ == "__main__":
+    with temp_db_factory() as factory:
+        test_highlight_rules_full_and_delta_save(factory)
+    test_render_rows_prefixes_conflict_doi()
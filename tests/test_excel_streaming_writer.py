@@ -0,0 +1,64 @@
+"""Test the streaming workbook writer against DataFrame.to_excel + apply_excel_formatting"""
+import sys
+import os
+import shutil
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd
+from openpyxl import load_workbook
+from src.core.database_manager import DatabaseManager
+
+
+def _read_sheet(path):
+    ws = load_workbook(path)['Papers']
+    cells = [[(c.value, c.number_format, c.font.b, c.font.color and c.font.color.rgb, c.fill.fill_type,
+               c.fill.fgColor.rgb, c.alignment.wrap_text) for c in row] for row in ws.iter_rows()]
+    widths = {k: v.width for k, v in ws.column_dimensions.items()}
+    return cells, widths, ws.protection.sheet
+
+
+def _write_reference(db, df, path):
+    """原有写法：内存中构建完整工作簿后逐单元格格式化（冲突行 DOI 带冲突标记）"""
+    rendered = pd.DataFrame(db._render_excel_rows(df), columns=df.columns)
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        rendered.to_excel(writer, index=False, sheet_name='Papers')
+        worksheet = writer.sheets['Papers']
+        db.update_utils.apply_excel_formatting(writer.book, worksheet, df)
+        db._set_sheet_password(worksheet, 'secret')
+
+
+def test_streaming_writer_matches_reference():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        db = DatabaseManager()
+        db.conflict_marker = "[conflict]"
+        df = db.update_utils.normalize_dataframe_columns(db.load_database(), db.config)
+        conflict_col = db.config.get_tag_field("conflict_marker", "table_name")
+        invalid_col = db.config.get_tag_field("invalid_fields", "table_name")
+        df.loc[2, conflict_col] = True
+        df.loc[5, invalid_col] = '1,3'
+        df.loc[7, conflict_col] = True
+        df.loc[7, invalid_col] = '0，4'
+
+        reference_path = os.path.join(temp_dir, 'reference.xlsx')
+        stream_path = os.path.join(temp_dir, 'stream.xlsx')
+        _write_reference(db, df, reference_path)
+        db._write_excel_file(df, stream_path, 'secret')
+        assert _read_sheet(stream_path) == _read_sheet(reference_path)
+        assert pd.read_excel(stream_path).equals(pd.read_excel(reference_path))
+        assert pd.read_excel(stream_path)['doi'][2].startswith("[conflict] ")
+
+        # 更新文件（无冲突着色）
+        with pd.ExcelWriter(reference_path, engine='openpyxl') as writer:
+            df.head(5).to_excel(writer, index=False, sheet_name='Papers')
+            db.update_utils.apply_excel_formatting(writer.book, writer.sheets['Papers'], df.head(5))
+        assert db.update_utils.write_excel_file(stream_path, df.head(5))
+        assert _read_sheet(stream_path) == _read_sheet(reference_path)
+        print("流式写入测试通过")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_streaming_writer_matches_reference()
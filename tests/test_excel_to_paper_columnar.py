@@ -0,0 +1,104 @@
+"""Test column-wise conversion of UpdateFileUtils.excel_to_paper"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pandas as pd
+import src.core.validation_plan as validation_plan
+from src.core.update_file_utils import get_update_file_utils
+from src.core.database_manager import DatabaseManager
+from src.core.database_model import Paper
+from src.core.validation_plan import get_validation_plan
+
+
+def test_frame_conversion_matches_row_conversion():
+    """按列转换结果（值与类型）应与逐行 _excel_row_to_paper_data 一致"""
+    utils = get_update_file_utils()
+    tags = utils.config.get_active_tags()
+    column = {tag['variable']: tag['table_name'] for tag in tags}
+    frames = [
+        DatabaseManager().load_database(),
+        pd.DataFrame({
+            column['doi']: [np.nan, ' 10.1000/x ', 3],
+            column['title']: [1.5, np.nan, ' t '],
+            column['show_in_readme']: [1, np.nan, 'yes'],
+            # 混合 int/str 的 object 列（Excel 中数字与文本混填）
+            column['date']: pd.Series([2024, '2024-05-01', np.nan], dtype=object),
+            column['conference']: pd.Series(['ACL', 2023, ' EMNLP '], dtype=object),
+        }),
+    ]
+    for df in frames:
+        expected = [utils._excel_row_to_paper_data(row, tags) for _, row in df.iterrows()]
+        actual = utils._excel_frame_to_paper_data(df, tags)
+        assert actual == expected
+        assert [[type(v) for v in d.values()] for d in actual] == [[type(v) for v in d.values()] for d in expected]
+
+    # 混合类型列的数字不能丢失，应与逐行 excel_to_paper 的结果一致
+    mixed = frames[1]
+    papers = utils.excel_to_paper(mixed, only_non_system=False, skip_invalid=False)
+    assert [(p.date, p.conference) for p in papers] == [('2024', 'ACL'), ('2024-05-01', '2023'), ('', 'EMNLP')]
+    print("按列转换测试通过")
+
+
+def test_column_checks_match_paper_validation():
+    """按列检查（必填、布尔类型、分类、正则）与逐篇 validate_paper_fields 的结果及规范化结果一致"""
+    utils = get_update_file_utils()
+    tags = utils.config.get_active_tags()
+    column = {tag['variable']: tag['table_name'] for tag in tags}
+    plan = get_validation_plan(utils.config)
+    df = DatabaseManager().load_database().head(6).reset_index(drop=True)
+    df[column['title']] = pd.Series(['', 't', ' ', '[💥冲突]', 'x', 'y'], dtype=object)
+    df[column['show_in_readme']] = pd.Series(['maybe', 'true', '', 'x', 'no', '1'], dtype=object)
+    df[column['category']] = pd.Series(['bogus;bogus', 'a;b;c;d;e;f', '', 'x [💥冲突]', None, df[column['category']][0]],
+                                       dtype=object)
+    df[column['paper_url']] = pd.Series(['ftp://x', '', 'http://ok', ' [💥冲突] ', 'https://a', 'nope'], dtype=object)
+
+    for check_required in (False, True):
+        expected_papers = [Paper.from_dict(d) for d in utils._excel_frame_to_paper_data(df, tags)]
+        expected = [p.validate_paper_fields(utils.config, check_required=check_required, check_non_empty=True)
+                    for p in expected_papers]
+
+        frame = utils._excel_frame_to_columns(df, tags)
+        frame = frame.assign(category=plan.normalize_category_column(frame['category']))
+        frame_errors = plan.check_frame(frame, check_required=check_required, check_non_empty=True)
+        papers = [Paper.from_dict(d) for d in frame.to_dict('records')]
+        actual = [p.validate_paper_fields(utils.config, check_required=check_required, check_non_empty=True,
+                                          column_errors=errors)
+                  for p, errors in zip(papers, frame_errors)]
+
+        assert [(v, e, sorted(i)) for v, e, i in actual] == [(v, e, sorted(i)) for v, e, i in expected]
+        assert papers == expected_papers
+        assert not any(valid for valid, _, _ in actual)
+
+
+def test_excel_to_paper_drops_rows_whose_validation_raises():
+    """验证过程抛出异常的行与逐行转换时一样被丢弃；仅验证未通过的行按 skip_invalid 保留"""
+    utils = get_update_file_utils()
+    column = {tag['variable']: tag['table_name'] for tag in utils.config.get_active_tags()}
+    df = DatabaseManager().load_database().head(3).reset_index(drop=True)
+    df.loc[1, column['doi']] = '10.1000/raise'
+    df.loc[2, column['paper_url']] = 'not a url'
+    titles = df[column['title']].tolist()
+
+    original = validation_plan.validate_doi
+
+    def raising_validate_doi(doi, *args, **kwargs):
+        if 'raise' in doi:
+            raise RuntimeError("boom")
+        return original(doi, *args, **kwargs)
+
+    validation_plan.validate_doi = raising_validate_doi
+    try:
+        kept = utils.excel_to_paper(df, only_non_system=False, skip_invalid=False)
+        skipped = utils.excel_to_paper(df, only_non_system=False, skip_invalid=True)
+    finally:
+        validation_plan.validate_doi = original
+    assert [p.title for p in kept] == [titles[0], titles[2]]
+    assert [p.title for p in skipped] == [titles[0]]
+
+
+if __name__ == "__main__":
+    test_frame_conversion_matches_row_conversion()
+    test_column_checks_match_paper_validation()
+    test_excel_to_paper_drops_rows_whose_validation_raises()
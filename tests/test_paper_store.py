@@ -0,0 +1,53 @@
+"""Test PaperStore identity index and conflict groups"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.database_model import Paper, is_same_identity
+from src.core.paper_store import PaperStore
+
+
+def test_match_same_as_is_same_identity():
+    """索引查找结果应与 is_same_identity 线性扫描一致"""
+    papers = [
+        Paper(doi="10.1000/a", title="Paper A"),
+        Paper(doi="https://doi.org/10.1000/B", title="Paper B"),
+        Paper(doi="", title="paper a "),
+        Paper(doi="10.1000/c", title=""),
+    ]
+    store = PaperStore(papers)
+    probes = [
+        Paper(doi="10.1000/b", title="Unrelated"),
+        Paper(doi="", title="PAPER A"),
+        Paper(doi="doi:10.1000/c", title="x"),
+        Paper(doi="", title=""),
+    ]
+    for probe in probes:
+        expected = [i for i, p in enumerate(papers) if is_same_identity(p, probe)]
+        assert store.match(probe) == expected, probe.title
+
+
+def test_conflict_groups():
+    """冲突组的添加、查找与移除"""
+    main = Paper(doi="10.1000/a", title="Paper A")
+    other = Paper(doi="10.1000/b", title="Paper B")
+    store = PaperStore([main, other])
+
+    conflict = Paper(doi="10.1000/a", title="Paper A (v2)", conflict_marker=True)
+    main_id = store.match(conflict, mains_only=True)[0]
+    conflict_id = store.add(conflict, main_id=main_id)
+
+    assert store.is_main(main_id) and not store.is_main(conflict_id)
+    assert store.match(conflict, mains_only=True) == [main_id]
+    assert store.groups()[0] == (main, [conflict])
+
+    # 移除主论文时其冲突论文一并移除
+    store.remove(main_id)
+    assert store.papers() == [other]
+    assert store.match(conflict) == []
+    print("PaperStore 测试通过")
+
+
+if __name__ == "__main__":
+    test_match_same_as_is_same_identity()
+    test_conflict_groups()
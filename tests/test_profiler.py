@@ -0,0 +1,68 @@
+"""
+性能剖析测试：嵌套区间按调用路径合并统计、自身耗时扣除子区间、折叠栈输出、未启用时为空操作
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.profiler import (Profiler, disable_profiling, enable_profiling, get_profiler,
+                          profile_span, profiled)
+
+
+def test_nested_spans_aggregate_by_path():
+    profiler = Profiler("test")
+    for _ in range(3):
+        with profiler.span('file'):
+            with profiler.span('load'):
+                pass
+            with profiler.span('validate'):
+                pass
+    with profiler.span('commit'):
+        pass
+
+    spans = {span['path']: span for span in profiler.report()['spans']}
+    assert list(spans) == ['file', 'file;load', 'file;validate', 'commit']
+    assert spans['file']['calls'] == 3
+    assert spans['file;load']['calls'] == 3
+    assert spans['file;load']['depth'] == 1
+    child_wall = spans['file;load']['wall_seconds'] + spans['file;validate']['wall_seconds']
+    assert spans['file']['self_seconds'] <= spans['file']['wall_seconds'] - child_wall + 1e-5
+    print("嵌套区间聚合测试通过")
+
+
+def test_global_profiling_and_report_files():
+    @profiled('work')
+    def work():
+        with profile_span('inner'):
+            return 42
+
+    # 未启用时为空操作
+    disable_profiling()
+    assert work() == 42
+    assert get_profiler() is None
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        profiler = enable_profiling("test")
+        assert work() == 42
+        path = profiler.write_report(os.path.join(temp_dir, 'profile', 'report.json'))
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        assert [span['path'] for span in report['spans']] == ['work', 'work;inner']
+        with open(os.path.join(temp_dir, 'profile', 'report.folded'), 'r', encoding='utf-8') as f:
+            for line in f.read().splitlines():
+                stack, micros = line.rsplit(' ', 1)
+                assert stack in ('work', 'work;inner') and int(micros) > 0
+        print("全局剖析与报告文件测试通过")
+    finally:
+        disable_profiling()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_nested_spans_aggregate_by_path()
+    test_global_profiling_and_report_files()
@@ -0,0 +1,54 @@
+"""Test that parallel per-category README rendering is byte-identical to the serial path"""
+import sys, os, shutil, tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.convert import ReadmeGenerator
+
+
+def _generator(workers, min_rows):
+    rg = ReadmeGenerator()
+    rg.render_workers = workers
+    rg.parallel_render_min_rows = min_rows
+    return rg
+
+
+def test_parallel_tables_match_serial():
+    serial = _generator(1, 2000)
+    parallel = _generator(2, 1)
+    pool_calls = []
+    original_pool = parallel._render_rows_in_pool
+    parallel._render_rows_in_pool = lambda jobs, workers: pool_calls.append(len(jobs)) or original_pool(jobs, workers)
+
+    context = serial._build_render_context()
+    assert parallel.generate_readme_tables(context) == serial.generate_readme_tables(context)
+    assert len(pool_calls) == 1
+    print("并行渲染与串行渲染一致")
+
+
+def test_parallel_render_with_row_cache():
+    """行缓存命中的行不进入进程池，README 结果与串行一致"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        contents = []
+        for workers, min_rows in [(1, 2000), (2, 1), (2, 1)]:
+            rg = _generator(workers, min_rows)
+            rg.row_cache_path = os.path.join(temp_dir, f'readme_rows_{workers}.json')
+            readme_path = os.path.join(temp_dir, 'README.md')
+            shutil.copy(os.path.join(str(rg.config.project_root), 'README.md'), readme_path)
+            pooled = []
+            original_pool = rg._render_rows_in_pool
+            rg._render_rows_in_pool = lambda jobs, w: pooled.extend(p for job in jobs for p in job) or original_pool(jobs, w)
+            assert rg.update_readme_file(readme_path)
+            with open(readme_path, 'r', encoding='utf-8') as f:
+                contents.append((f.read(), len(pooled)))
+        (serial, _), (first, first_pooled), (second, second_pooled) = contents
+        assert serial == first == second
+        # 第二次并行渲染时只有不缓存的（缺图）行需要重新渲染
+        assert second_pooled < first_pooled
+        print("并行渲染与行缓存共存测试通过")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_parallel_tables_match_serial()
+    test_parallel_render_with_row_cache()
@@ -0,0 +1,106 @@
+"""Test that a README build loads the database only once"""
+import sys, os, shutil, tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.convert import ReadmeGenerator
+import hashlib
+import src.convert
+import src.utils
+
+
+def test_update_readme_loads_database_once():
+    rg = ReadmeGenerator()
+    load_calls = []
+    original_load = rg.db_manager.load_database
+    rg.db_manager.load_database = lambda: load_calls.append(1) or original_load()
+    contexts = []
+    original_build = rg._build_render_context
+    rg._build_render_context = lambda: contexts.append(original_build()) or contexts[-1]
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        readme_path = os.path.join(temp_dir, 'README.md')
+        shutil.copy(os.path.join(str(rg.config.project_root), 'README.md'), readme_path)
+        assert rg.update_readme_file(readme_path)
+        assert len(load_calls) == 1
+        # 渲染结束后不保留上下文，下一次渲染重新读取数据库
+        assert rg._render_context is None
+
+        # 预计算的一级分类计数应等于其自身及子分类论文去重后的数量
+        context = rg._render_context = contexts[0]
+        for parent in context['parents']:
+            keys = {p.get_key() for p in context['papers_by_category'].get(parent['unique_name'], [])}
+            for child in context['children_map'].get(parent['unique_name'], []):
+                keys |= {p.get_key() for p in context['papers_by_category'].get(child['unique_name'], [])}
+            assert rg._get_category_paper_count_and_anchor(parent['unique_name'])[0] == len(keys)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_render_context_follows_database_changes():
+    """同一生成器在数据库变化后再次渲染时，分类计数与 Quick Links 反映最新数据"""
+    rg = ReadmeGenerator()
+    first_links = rg._generate_quick_links()
+    first_tables = rg.generate_readme_tables()
+    assert rg._render_context is None
+
+    original_build = rg._build_render_context
+    def build():
+        context = original_build()
+        for unique_name, (count, anchor) in context['category_stats'].items():
+            context['category_stats'][unique_name] = (count + 1000, anchor)
+        return context
+    rg._build_render_context = build
+    assert rg._generate_quick_links() != first_links
+    tables = rg.generate_readme_tables()
+    assert tables != first_tables
+    parent = rg._build_render_context()['parents'][0]
+    count = rg._build_render_context()['category_stats'][parent['unique_name']][0]
+    assert f"({count} papers)" in tables
+
+
+def test_row_fragment_cache_rerenders_only_dirty_rows():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        readme_path = os.path.join(temp_dir, 'README.md')
+        shutil.copy(os.path.join(str(ReadmeGenerator().config.project_root), 'README.md'), readme_path)
+
+        def run(mutate=None):
+            rg = ReadmeGenerator()
+            rg.row_cache_path = os.path.join(temp_dir, 'readme_rows.json')
+            rendered = []
+            original_render = rg._generate_paper_row
+            rg._generate_paper_row = lambda paper: rendered.append(paper.title) or original_render(paper)
+            if mutate:
+                original_build = rg._build_render_context
+                def build():
+                    context = original_build()
+                    mutate(context)
+                    return context
+                rg._build_render_context = build
+            assert rg.update_readme_file(readme_path)
+            with open(readme_path, 'r', encoding='utf-8') as f:
+                return rendered, f.read()
+
+        first_rendered, first_content = run()
+        second_rendered, second_content = run()
+        assert first_content == second_content
+        # 第二次渲染只需重新渲染缺图（不缓存）的行
+        assert len(second_rendered) < len(first_rendered)
+
+        def change_one(context):
+            papers = [p for ps in context['papers_by_category'].values() for p in ps]
+            papers[0].notes = "fragment cache test"
+        third_rendered, third_content = run(change_one)
+        assert "fragment cache test" in third_content
+        assert len(third_rendered) <= len(second_rendered) + 4  # 一篇论文最多出现在4个分类中
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_row_cache_salt_covers_render_helpers():
+    """行缓存的代码版本同时覆盖 convert.py 与 src/utils.py 中的渲染辅助函数"""
+    code_hash = hashlib.sha256()
+    for path in (src.convert.__file__, src.utils.__file__):
+        with open(path, 'rb') as f:
+            code_hash.update(f.read())
+    assert ReadmeGenerator()._get_row_cache_salt()[0] == code_hash.hexdigest()
@@ -0,0 +1,117 @@
+"""Test the SQLite storage backend of DatabaseManager"""
+import sys
+import os
+import sqlite3
+from dataclasses import asdict
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from openpyxl import load_workbook
+from src.core.database_model import Paper
+from src.core.sqlite_storage import TABLE_NAME, build_table_schema
+from conftest import temp_db_factory
+
+
+def _papers(db):
+    return db.update_utils.excel_to_paper(db.load_database(), only_non_system=False, skip_invalid=False)
+
+
+def test_sqlite_backend_matches_excel_backend(temp_db):
+    """首次加载时从 core_excel 导入；增删改后的论文与 excel 引擎一致，且不改写 core_excel"""
+    excel_db = temp_db('excel', backend='excel')
+    sqlite_db = temp_db('sqlite', backend='sqlite')
+    excel_mtime = os.path.getmtime(sqlite_db.core_excel_path)
+
+    assert [asdict(p) for p in _papers(sqlite_db)] == [asdict(p) for p in _papers(excel_db)]
+    assert os.path.exists(sqlite_db.core_sqlite_path)
+
+    for db in (excel_db, sqlite_db):
+        papers = _papers(db)
+        assert db.update_paper(papers[3], {'notes': 'sqlite backend test'})
+        assert db.delete_paper(_papers(db)[-1])
+    assert [asdict(p) for p in _papers(sqlite_db)] == [asdict(p) for p in _papers(excel_db)]
+    assert os.path.getmtime(sqlite_db.core_excel_path) == excel_mtime
+
+    with sqlite3.connect(sqlite_db.core_sqlite_path) as conn:
+        indexes = {row[1] for row in conn.execute(f"PRAGMA index_list({TABLE_NAME})")}
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE_NAME})")}
+    assert {'doi', 'title', 'category', 'submission_time', 'show_in_readme'} <= columns
+    assert {f'idx_{TABLE_NAME}_{name}' for name in ('doi', 'title', 'category', 'submission_time')} <= indexes
+
+    # 导出视图与 excel 引擎全量保存的表格一致
+    export_path = os.path.join(temp_db.temp_dir, 'export.xlsx')
+    assert sqlite_db.export_excel(export_path, password="")
+    excel_db.DELTA_SAVE_MAX_RATIO = -1  # 强制全量重写
+    excel_db.save_database(excel_db.load_database())
+    rows = lambda path: [[c.value for c in row] for row in load_workbook(path)['Papers'].iter_rows()]
+    assert rows(export_path) == rows(excel_db.core_excel_path)
+    print("SQLite 存储引擎测试通过")
+
+
+def test_sqlite_save_is_transactional(temp_db):
+    """写入失败时回滚，数据库保持原有内容"""
+    db = temp_db('sqlite', backend='sqlite')
+    before = [asdict(p) for p in _papers(db)]
+    df = db.update_utils.normalize_dataframe_columns(db.load_database(), db.config)
+    df['notes'] = df['notes'].astype(object)
+    df.at[df.index[0], 'notes'] = "written before the failing row"
+    df.at[df.index[1], 'notes'] = object()  # SQLite 不支持的值，写入第二行时失败
+    try:
+        db.sqlite_storage.save(df)
+        assert False, "应当抛出 sqlite3.Error"
+    except sqlite3.Error:
+        pass
+    assert [asdict(p) for p in _papers(db)] == before
+    print("SQLite 事务回滚测试通过")
+
+
+def test_sqlite_saves_only_changed_rows(temp_db):
+    """增删改只写入变化的行（按 paper_key 插入/更新/删除），论文顺序与 excel 引擎一致"""
+    excel_db = temp_db('excel', backend='excel')
+    sqlite_db = temp_db('sqlite', backend='sqlite')
+    _papers(sqlite_db)
+    changes = []
+    apply_changes = sqlite_db.sqlite_storage.apply_changes
+    sqlite_db.sqlite_storage.apply_changes = lambda c: changes.append((len(c[1]), len(c[2]))) or apply_changes(c)
+
+    template = _papers(excel_db)[0]
+    new_paper = Paper.from_dict(dict(template.__dict__, doi="10.1234/sqlite.row.test",
+                                     title="SQLite Row Level Write Test", submission_time="2000-01-01 00:00:00"))
+    for db in (excel_db, sqlite_db):
+        assert db.update_paper(_papers(db)[3], {'notes': 'row level update'})
+        assert db.delete_paper(_papers(db)[-1])
+        added, _, _ = db.add_papers([Paper.from_dict(asdict(new_paper))])
+        assert len(added) == 1
+    assert changes == [(1, 0), (0, 1), (1, 0)]
+    assert [asdict(p) for p in _papers(sqlite_db)] == [asdict(p) for p in _papers(excel_db)]
+
+    # 内容未变化时不写入
+    assert not sqlite_db.sqlite_storage.save(sqlite_db.update_utils.normalize_dataframe_columns(
+        sqlite_db.load_database(), sqlite_db.config))
+    print("SQLite 按行写入测试通过")
+
+
+def test_sqlite_migrates_legacy_table(temp_db):
+    """早期以 row_order 为主键的表在首次打开时迁移到 paper_key 主键，数据与顺序不变"""
+    db = temp_db('sqlite', backend='sqlite')
+    expected = [asdict(p) for p in _papers(db)]
+    schema = build_table_schema(db.config)
+    variables = [variable for variable, _, _ in schema]
+    with sqlite3.connect(db.core_sqlite_path) as conn:
+        rows = conn.execute(f"SELECT {', '.join(variables)} FROM {TABLE_NAME} ORDER BY row_order").fetchall()
+        conn.execute(f"DROP TABLE {TABLE_NAME}")
+        conn.execute(f"CREATE TABLE {TABLE_NAME} (row_order INTEGER PRIMARY KEY, "
+                     f"{', '.join(f'{v} {t}' for v, _, t in schema)})")
+        conn.executemany(f"INSERT INTO {TABLE_NAME} VALUES ({', '.join('?' * (len(variables) + 1))})",
+                         [(i,) + row for i, row in enumerate(rows)])
+    assert [asdict(p) for p in _papers(db)] == expected
+    with sqlite3.connect(db.core_sqlite_path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {TABLE_NAME}
+    print("SQLite 旧表迁移测试通过")
+
+
+if __name__ == "__main__":
+    for test in (test_sqlite_backend_matches_excel_backend, test_sqlite_save_is_transactional,
+                 test_sqlite_saves_only_changed_rows, test_sqlite_migrates_legacy_table):
+        with temp_db_factory() as factory:
+            test(factory)
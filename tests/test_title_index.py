@@ -0,0 +1,74 @@
+"""Test near-duplicate title detection (TitleIndex) and its use in DatabaseManager.add_papers"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.database_model import Paper
+from src.core.title_index import TitleIndex, normalize_title
+from conftest import temp_db_factory
+
+
+def test_normalize_title():
+    assert normalize_title("LLM-based X: a Survey") == "llm based x a survey"
+    assert normalize_title("LLM based X — A Survey") == "llm based x a survey"
+    assert normalize_title("Ｆｕｌｌｗｉｄｔｈ  Title_1") == "fullwidth title 1"
+
+
+def test_find_similar():
+    """仅标点/大小写不同或少量词差异的标题被找出，无关标题不会被找出"""
+    index = TitleIndex(threshold=0.8)
+    index.add(0, "LLM-based Agents for Social Simulation: A Survey")
+    index.add(1, "Detecting Misinformation on Social Media with Graph Neural Networks")
+    index.add(2, "A Survey of Large Language Models")
+    for i in range(3, 2000):
+        index.add(i, f"Unrelated paper number {i} about topic {i % 17}")
+
+    assert index.find_similar("LLM based agents for social simulation — a survey") == [(0, 1.0)]
+    matches = index.find_similar("Detecting Misinformation on Social Media using Graph Neural Networks")
+    assert [key for key, _ in matches] == [1] and 0.8 <= matches[0][1] < 1.0
+    assert index.find_similar("A Survey of Multimodal Models for Video") == []
+    assert index.find_similar("LLM-based Agents for Social Simulation: A Survey", exclude=0) == []
+
+    index.remove(0)
+    assert index.find_similar("LLM based agents for social simulation — a survey") == []
+
+
+def test_add_papers_flags_near_duplicates(temp_db):
+    """add_papers 对身份未精确匹配但标题高度相似的新论文给出疑似重复提示，并仍作为新论文添加"""
+    db = temp_db()
+
+    existing = db.update_utils.excel_to_paper(db.load_database(), only_non_system=False, skip_invalid=False)[0]
+    variant = Paper.from_dict(dict(existing.__dict__, doi="", title=existing.title.upper().replace(' ', ' - ') + "!"))
+    unrelated = Paper.from_dict(dict(existing.__dict__, doi="", title="Completely Unrelated Title For Near Duplicate Test"))
+
+    added, conflicts, _ = db.add_papers([variant, unrelated])
+    assert len(added) == 2 and not conflicts
+    assert len(db.near_duplicate_msg) == 1
+    assert existing.title[:20] in db.near_duplicate_msg[0]
+
+
+def test_add_papers_replace_updates_title_index(temp_db):
+    """replace 策略替换论文后，同批次后续的近似重复检测针对新标题而非被替换的旧标题"""
+    db = temp_db()
+
+    existing = next(p for p in db.update_utils.excel_to_paper(db.load_database(), only_non_system=False,
+                                                              skip_invalid=False) if p.doi)
+    new_title = "Replacement Title For Near Duplicate Index Sync Test"
+    replacement = Paper.from_dict(dict(existing.__dict__, title=new_title, notes="replaced"))
+    near_new = Paper.from_dict(dict(existing.__dict__, doi="", title=new_title.upper() + "!"))
+    near_old = Paper.from_dict(dict(existing.__dict__, doi="", title=existing.title.upper() + "!"))
+
+    added, conflicts, _ = db.add_papers([replacement, near_new, near_old], conflict_resolution='replace')
+    assert len(added) == 3 and not conflicts
+    assert len(db.near_duplicate_msg) == 1
+    assert new_title[:20] in db.near_duplicate_msg[0]
+
+
+if __name__ == "__main__":
+    test_normalize_title()
+    test_find_similar()
+    with temp_db_factory() as factory:
+        test_add_papers_flags_near_duplicates(factory)
+    with temp_db_factory() as factory:
+        test_add_papers_replace_updates_title_index(factory)
+    print("近似重复标题检测测试通过")
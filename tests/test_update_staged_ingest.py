@@ -0,0 +1,67 @@
+"""Test staged multi-file ingest of UpdateProcessor.process_updates"""
+import sys
+import os
+import json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.update import UpdateProcessor
+from conftest import temp_db_factory
+
+
+def _paper(i):
+    return {
+        'doi': f'10.9999/staged.{i}',
+        'title': f'Staged Ingest Test Paper {i}',
+        'date': '2024-01-01',
+        'category': 'Sentiment Analysis',
+        'paper_url': f'https://example.com/{i}',
+        'abstract': 'abstract',
+    }
+
+
+def _make_processor(temp_db, update_files):
+    processor = UpdateProcessor()
+    temp_db(db=processor.db_manager)
+    processor.update_excel_path = processor.update_json_path = None
+    processor.my_update_excel_path = processor.my_update_json_path = None
+    processor.extra_update_files = update_files
+    processor.ai_generator.is_available = lambda: False
+    processor.is_remove_added_paper = True
+    return processor
+
+
+def test_staged_ingest_single_save_and_per_file_results(temp_db):
+    """多个更新文件合并后只保存一次数据库，逐文件统计与清理保持不变"""
+    files = []
+    for name, ids in (('a.json', [1, 2]), ('b.json', [3])):
+        path = os.path.join(temp_db.temp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'papers': [_paper(i) for i in ids]}, f)
+        files.append(path)
+
+    processor = _make_processor(temp_db, files)
+    original_backup_dir = processor.update_utils.backup_dir
+    processor.update_utils.backup_dir = processor.db_manager.backup_dir
+    saves = []
+    original_save = processor.db_manager.save_database
+    processor.db_manager.save_database = lambda df, pw="": saves.append(1) or original_save(df, pw)
+
+    try:
+        result = processor.process_updates()
+    finally:
+        processor.update_utils.backup_dir = original_backup_dir
+    assert len(saves) == 1
+    assert result['new_papers'] == 3
+    assert result['file_results'][files[0]]['added'] == 2
+    assert result['file_results'][files[1]]['added'] == 1
+
+    # 各文件中已添加的论文被移除
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f)['papers'] == []
+    print("合并写入测试通过")
+
+
+if __name__ == "__main__":
+    with temp_db_factory() as factory:
+        test_staged_ingest_single_save_and_per_file_results(factory)
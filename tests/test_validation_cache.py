@@ -0,0 +1,72 @@
+"""Test persistent validation result cache"""
+import sys
+import os
+import shutil
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dataclasses import asdict
+from src.core.database_manager import DatabaseManager
+from src.core.database_model import Paper, validate_papers_fields
+import src.core.validation_cache as validation_cache
+from src.core.validation_cache import ValidationCache
+
+
+def test_cached_results_match_fresh_validation():
+    """命中缓存时的结果与规范化后的论文应与直接验证一致，且不再调用 validate_paper_fields"""
+    db = DatabaseManager()
+    utils = db.update_utils
+    df = db.load_database()
+    temp_dir = tempfile.mkdtemp()
+    try:
+        cache_path = os.path.join(temp_dir, 'validation_cache.json')
+        expected_papers = utils._excel_frame_to_paper_data(df, utils.config.get_active_tags())
+        fresh = [Paper.from_dict(d) for d in expected_papers]
+        expected = validate_papers_fields(fresh, db.config, check_required=True)
+
+        # 冷缓存：写入缓存文件
+        cold = [Paper.from_dict(d) for d in expected_papers]
+        assert validate_papers_fields(cold, db.config, check_required=True,
+                                      cache=ValidationCache(cache_path, db.config)) == expected
+        assert os.path.exists(cache_path)
+
+        # 热缓存（新实例从文件加载）：不调用验证函数
+        calls = []
+        original = Paper.validate_paper_fields
+        Paper.validate_paper_fields = lambda self, *a, **k: calls.append(1) or original(self, *a, **k)
+        try:
+            warm = [Paper.from_dict(d) for d in expected_papers]
+            results = validate_papers_fields(warm, db.config, check_required=True,
+                                             cache=ValidationCache(cache_path, db.config))
+        finally:
+            Paper.validate_paper_fields = original
+        assert calls == []
+        assert [(v, e, sorted(i)) for v, e, i in results] == [(v, e, sorted(i)) for v, e, i in expected]
+        assert [asdict(p) for p in warm] == [asdict(p) for p in fresh]
+
+        # 验证选项不同则不命中
+        other = [Paper.from_dict(d) for d in expected_papers[:1]]
+        cache = ValidationCache(cache_path, db.config)
+        cache.sync_config()
+        assert cache.get(cache.make_key(other[0], False, True)) is None
+
+        # 验证代码版本变化（验证规则被修改）时缓存整体失效，重新验证
+        original_version = validation_cache.get_validator_version()
+        validation_cache._validator_version = "changed-validator"
+        calls = []
+        Paper.validate_paper_fields = lambda self, *a, **k: calls.append(1) or original(self, *a, **k)
+        try:
+            again = [Paper.from_dict(d) for d in expected_papers]
+            assert validate_papers_fields(again, db.config, check_required=True,
+                                          cache=ValidationCache(cache_path, db.config)) == expected
+        finally:
+            Paper.validate_paper_fields = original
+            validation_cache._validator_version = original_version
+        assert len(calls) == len(expected_papers)
+        print("验证缓存测试通过")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_cached_results_match_fresh_validation()
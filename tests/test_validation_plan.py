@@ -0,0 +1,52 @@
+"""Test compiled validation plan used by Paper.validate_paper_fields"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.config_loader import get_config_instance
+from src.core.database_model import Paper
+from src.core.validation_plan import get_validation_plan
+
+
+def test_plan_reused_until_config_changes():
+    """配置版本不变时复用同一验证计划，版本变化后重新编译"""
+    config = get_config_instance()
+    plan = get_validation_plan(config)
+    assert get_validation_plan(config) is plan
+
+    config._config_version = "changed-for-test"
+    try:
+        assert get_validation_plan(config) is not plan
+    finally:
+        config._config_version = None
+    assert get_validation_plan(config).config_version == plan.config_version
+
+
+def test_plan_validation_results():
+    """分类规范化（含变更规则）、正则验证与单字段模式的 invalid_fields 更新"""
+    config = get_config_instance()
+    order_of = {t['variable']: str(t['order']) for t in config.get_active_tags()}
+
+    paper = Paper(title="Plan Test", category="Social Content Generation;Sentiment Analysis；Sentiment Analysis",
+                  paper_url="ftp://example.com")
+    valid, errors, invalid_vars = paper.validate_paper_fields(config, check_required=False)
+    assert paper.category == "Comment Generation;Sentiment Analysis"
+    assert not valid and invalid_vars == ['paper_url']
+    assert len(errors) == 2 and errors[0] == "论文链接格式无效: ftp://example.com"
+    assert paper.invalid_fields == order_of['paper_url']
+
+    # 单字段验证通过后，从 invalid_fields 中移除该字段
+    paper.paper_url = "https://example.com"
+    valid, _, _ = paper.validate_paper_fields(config, check_required=False, variable='paper_url')
+    assert valid and paper.invalid_fields == ""
+
+    # no_normalize 模式不修改论文
+    paper.category = "Bogus Category"
+    valid, _, invalid_vars = paper.validate_paper_fields(config, check_required=False, variable='category', no_normalize=True)
+    assert not valid and invalid_vars == ['category'] and paper.category == "Bogus Category"
+    print("验证计划测试通过")
+
+
+if __name__ == "__main__":
+    test_plan_reused_until_config_changes()
+    test_plan_validation_results()